@@ -0,0 +1,98 @@
+"""typed forecast dates and retention indexes
+
+Brings databases created by older versions of the app (tables are created with
+`Base.metadata.create_all`, which never alters existing tables) up to the current
+models: `forecast_points.date` becomes a DATE and the composite / retention indexes
+are created. Every step checks the live schema first, so it is safe on a database
+that `create_all` already created at this version.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("forecast_points", "ix_forecast_points_ticker_date", ["ticker", "date"]),
+    ("forecast_points", "ix_forecast_points_date", ["date"]),
+    ("models", "ix_models_ticker", ["ticker"]),
+    ("logs", "ix_logs_timestamp_id", ["timestamp", "id"]),
+    ("logs", "ix_logs_ticker_timestamp_id", ["ticker", "timestamp", "id"]),
+    ("logs", "ix_logs_event_timestamp_id", ["event", "timestamp", "id"]),
+    ("pipeline_runs", "ix_pipeline_runs_updated_at", ["updated_at"]),
+]
+# single-column log indexes covered by the composite ones above
+SUPERSEDED = [
+    ("logs", "ix_logs_timestamp", ["timestamp"]),
+    ("logs", "ix_logs_ticker", ["ticker"]),
+]
+
+
+def _tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _indexes(table: str) -> set:
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _date_column_type():
+    columns = sa.inspect(op.get_bind()).get_columns("forecast_points")
+    return next(c["type"] for c in columns if c["name"] == "date")
+
+
+def upgrade() -> None:
+    tables = _tables()
+
+    if "forecast_points" in tables and not isinstance(_date_column_type(), sa.Date):
+        if op.get_bind().dialect.name == "postgresql":
+            op.execute("ALTER TABLE forecast_points ALTER COLUMN date TYPE DATE USING left(date, 10)::date")
+        else:
+            # Rebuild with the column reflected as DATE: a batch alter_column would copy the
+            # values through CAST(date AS DATE), which SQLite turns into the year number.
+            op.execute("UPDATE forecast_points SET date = substr(date, 1, 10)")
+            with op.batch_alter_table(
+                "forecast_points", recreate="always", reflect_args=[sa.Column("date", sa.Date(), nullable=False)]
+            ):
+                pass
+
+    for table, name, columns in INDEXES:
+        if table in tables and name not in _indexes(table):
+            op.create_index(name, table, columns)
+
+    for table, name, _ in SUPERSEDED:
+        if table in tables and name in _indexes(table):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    tables = _tables()
+
+    for table, name, columns in SUPERSEDED:
+        if table in tables and name not in _indexes(table):
+            op.create_index(name, table, columns)
+
+    for table, name, _ in INDEXES:
+        # the composite read indexes stay: the models declare them
+        if name in ("ix_forecast_points_date", "ix_pipeline_runs_updated_at") and name in _indexes(table):
+            op.drop_index(name, table_name=table)
+
+    if "forecast_points" in tables and isinstance(_date_column_type(), sa.Date):
+        if op.get_bind().dialect.name == "postgresql":
+            op.execute("ALTER TABLE forecast_points ALTER COLUMN date TYPE VARCHAR(20) USING to_char(date, 'YYYY-MM-DD')")
+        else:
+            with op.batch_alter_table(
+                "forecast_points", recreate="always", reflect_args=[sa.Column("date", sa.String(20), nullable=False)]
+            ):
+                pass
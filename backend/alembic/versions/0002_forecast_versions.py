@@ -0,0 +1,107 @@
+"""forecast versions
+
+Adds `forecast_versions`, the `version_id` of forecast points and candidate models,
+and each ticker's `current_forecast_version_id`. Rows written before versions
+existed are moved into one "legacy" version per ticker, which becomes current.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED = ("forecast_points", "models")
+
+
+def _columns(table: str) -> set:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table: str) -> set:
+    return {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    # the app's create_all may already have created the new table (but never the new columns)
+    if "forecast_versions" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "forecast_versions",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("ticker", sa.String(10), sa.ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False),
+            sa.Column("source", sa.String(20)),
+            sa.Column("model", sa.String(50)),
+            sa.Column("trained_at", sa.DateTime()),
+            sa.Column("n_points", sa.Integer()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+    if "ix_forecast_versions_ticker" not in _indexes("forecast_versions"):
+        op.create_index("ix_forecast_versions_ticker", "forecast_versions", ["ticker"])
+
+    if "current_forecast_version_id" not in _columns("tickers"):
+        op.add_column("tickers", sa.Column("current_forecast_version_id", sa.Integer(), nullable=True))
+
+    for table in VERSIONED:
+        if "version_id" not in _columns(table):
+            with op.batch_alter_table(table) as batch:
+                batch.add_column(sa.Column("version_id", sa.Integer(), nullable=True))
+                batch.create_foreign_key(
+                    f"fk_{table}_version_id", "forecast_versions", ["version_id"], ["id"], ondelete="CASCADE"
+                )
+    if "ix_forecast_points_version_date" not in _indexes("forecast_points"):
+        op.create_index("ix_forecast_points_version_date", "forecast_points", ["version_id", "date"])
+    if "ix_models_version_id" not in _indexes("models"):
+        op.create_index("ix_models_version_id", "models", ["version_id"])
+
+    # backfill: unversioned rows become each ticker's "legacy" version
+    op.execute("""
+        INSERT INTO forecast_versions (ticker, source, model, trained_at, n_points, created_at)
+        SELECT t.ticker, 'legacy', t.current_model, t.last_trained_at,
+               (SELECT count(*) FROM forecast_points p WHERE p.ticker = t.ticker AND p.version_id IS NULL),
+               CURRENT_TIMESTAMP
+        FROM tickers t
+        WHERE t.current_forecast_version_id IS NULL
+          AND (EXISTS (SELECT 1 FROM forecast_points p WHERE p.ticker = t.ticker AND p.version_id IS NULL)
+               OR EXISTS (SELECT 1 FROM models m WHERE m.ticker = t.ticker AND m.version_id IS NULL))
+    """)
+    op.execute("""
+        UPDATE tickers SET current_forecast_version_id = (
+            SELECT max(v.id) FROM forecast_versions v WHERE v.ticker = tickers.ticker AND v.source = 'legacy'
+        )
+        WHERE current_forecast_version_id IS NULL
+    """)
+    for table in VERSIONED:
+        op.execute(f"""
+            UPDATE {table} SET version_id = (
+                SELECT t.current_forecast_version_id FROM tickers t WHERE t.ticker = {table}.ticker
+            )
+            WHERE version_id IS NULL
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_models_version_id", table_name="models")
+    op.drop_index("ix_forecast_points_version_date", table_name="forecast_points")
+    # only the current version's rows stay, as the unversioned data of the older schema
+    for table in VERSIONED:
+        op.execute(f"""
+            DELETE FROM {table} WHERE version_id IS NOT NULL AND version_id <> (
+                SELECT coalesce(t.current_forecast_version_id, -1) FROM tickers t WHERE t.ticker = {table}.ticker
+            )
+        """)
+        # dropping the column drops its foreign key too (whatever name create_all gave it)
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("version_id")
+    op.drop_column("tickers", "current_forecast_version_id")
+    op.drop_index("ix_forecast_versions_ticker", table_name="forecast_versions")
+    op.drop_table("forecast_versions")
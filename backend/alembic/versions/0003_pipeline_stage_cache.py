@@ -0,0 +1,32 @@
+"""pipeline stage cache
+
+Adds `pipeline_runs.stage_cache`: per stage of a script-mode run, whether it was
+a cache hit, ran or failed.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("pipeline_runs")}
+    if "stage_cache" not in columns:
+        op.add_column("pipeline_runs", sa.Column("stage_cache", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("pipeline_runs") as batch:
+        batch.drop_column("stage_cache")
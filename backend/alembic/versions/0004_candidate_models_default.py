@@ -0,0 +1,46 @@
+"""candidate models default
+
+Rewrites `settings.candidate_models` still holding the old seeded default
+(LSTM, GRU, Transformer, XGBoost: only LSTM of those is trainable) to the new
+default, so existing installs keep training ARIMA and Prophet. Lists a user
+has edited are left alone.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEGACY_DEFAULT = ["LSTM", "GRU", "Transformer", "XGBoost"]
+NEW_DEFAULT = ["ARIMA", "Prophet", "LSTM"]
+
+settings = sa.table("settings", sa.column("id", sa.Integer), sa.column("candidate_models", sa.JSON))
+
+
+def _rewrite(old: list, new: list) -> None:
+    bind = op.get_bind()
+    for row_id, models in bind.execute(sa.select(settings.c.id, settings.c.candidate_models)).all():
+        if isinstance(models, str):
+            models = json.loads(models)
+        if models == old:
+            bind.execute(settings.update().where(settings.c.id == row_id).values(candidate_models=new))
+
+
+def upgrade() -> None:
+    _rewrite(LEGACY_DEFAULT, NEW_DEFAULT)
+
+
+def downgrade() -> None:
+    _rewrite(NEW_DEFAULT, LEGACY_DEFAULT)
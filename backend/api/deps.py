@@ -0,0 +1,16 @@
+from typing import List
+from fastapi import HTTPException, Query
+
+MAX_BATCH_TICKERS = 500
+
+
+def ticker_list(
+    tickers: str = Query(..., description="Comma-separated tickers, e.g. AAPL,MSFT")
+) -> List[str]:
+    """Parses a `tickers=` batch parameter (upper-cased, de-duplicated, order kept)."""
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers.split(",") if t.strip()))
+    if not symbols:
+        raise HTTPException(status_code=400, detail="tickers is required")
+    if len(symbols) > MAX_BATCH_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_TICKERS} tickers per request")
+    return symbols
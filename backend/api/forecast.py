@@ -1,31 +1,95 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+import logging
+
+from fastapi import APIRouter, HTTPException, Path, Query, Depends, Request
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas import ForecastResponse
-from database import get_forecast, get_ticker
+from schemas import ForecastResponse, BatchForecastResponse, LiveForecastResponse
+from database import get_forecast, get_forecasts, get_ticker
 from db_config import get_db
+from cache import cached, cached_many, forecast_key
+from api.deps import ticker_list
+from encoding import FORMATS, encode_forecast, encode_forecast_batch, encoded_response, negotiate_format
+from model_registry import model_registry
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+FORMAT_QUERY = Query(
+    None,
+    alias="format",
+    pattern=f"^({'|'.join(FORMATS)})$",
+    description="json (rows, default), columnar (one list per field), msgpack or arrow; "
+                "may also be chosen with the Accept header",
+)
+
+@router.get("/forecast", response_model=BatchForecastResponse)
+async def get_forecast_batch(
+    request: Request,
+    tickers: List[str] = Depends(ticker_list),
+    horizon: int = Query(30, ge=1, le=90, description="Forecast horizon in days"),
+    fmt: Optional[str] = FORMAT_QUERY,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get forecast data for many tickers in one request (one query for all cache misses)"""
+    async def load(missing: List[str]):
+        return await get_forecasts(db, missing, horizon)
+
+    found = await cached_many({t: forecast_key(t, horizon) for t in tickers}, load)
+    fmt = negotiate_format(fmt, request.headers.get("accept", ""))
+    body = encode_forecast_batch(
+        [found[t] for t in tickers if t in found],
+        [t for t in tickers if t not in found],
+        horizon,
+        fmt,
+    )
+    return encoded_response(request, body, fmt)
 
 @router.get("/forecast/{ticker}", response_model=ForecastResponse)
 async def get_ticker_forecast(
+    request: Request,
     ticker: str,
     horizon: int = Query(30, ge=1, le=90, description="Forecast horizon in days"),
+    fmt: Optional[str] = FORMAT_QUERY,
     db: AsyncSession = Depends(get_db)
 ):
     """Get forecast data for a ticker"""
+    async def load():
+        ticker_obj = await get_ticker(db, ticker)
+        if not ticker_obj:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Ticker {ticker} not found"
+            )
+
+        forecast_data = await get_forecast(db, ticker, horizon)
+        if not forecast_data:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No forecast data available for {ticker}"
+            )
+        return forecast_data
+
+    forecast_data = await cached(forecast_key(ticker, horizon), load)
+    fmt = negotiate_format(fmt, request.headers.get("accept", ""))
+    return encoded_response(request, encode_forecast(forecast_data, fmt), fmt)
+
+@router.get("/forecast/{ticker}/live", response_model=LiveForecastResponse)
+async def get_live_forecast(
+    ticker: str = Path(..., pattern=r"^[A-Za-z0-9][A-Za-z0-9.\-]{0,9}$"),
+    days: int = Query(30, ge=1, le=365, description="Business days to forecast past the last observation"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Forecast computed now from the ticker's deployed model and current processed data (no retraining)"""
     ticker_obj = await get_ticker(db, ticker)
     if not ticker_obj:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Ticker {ticker} not found"
-        )
-    
-    forecast_data = await get_forecast(db, ticker, horizon)
-    if not forecast_data:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No forecast data available for {ticker}"
-        )
-    
-    return forecast_data
+        raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found")
+    # a deploy or a newly published fit changes this, and with it the model the registry serves
+    version = (ticker_obj.current_forecast_version_id, ticker_obj.last_trained_at)
+    try:
+        return await model_registry.forecast(ticker, days, ticker_obj.current_model, version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.exception("Live forecast failed", extra={"ticker": ticker, "days": days})
+        raise HTTPException(status_code=503, detail=f"Forecast for {ticker} failed: {e}")
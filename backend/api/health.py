@@ -1,6 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from datetime import datetime
+from typing import List
 from schemas import HealthResponse
+from cache import cache_stats, get_cache
+from instrumentation import PROMETHEUS_CONTENT_TYPE, metric_lines, register_collector, render_metrics
+from log_writer import log_writer
+from model_registry import model_registry
+from retention import retention_job
 
 router = APIRouter()
 
@@ -12,3 +18,44 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "version": "0.1.0"
     }
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Response cache backend, size and hit/miss counters (this process)"""
+    return cache_stats()
+
+@router.get("/registry/stats")
+async def get_registry_stats():
+    """Deployed models loaded for on-demand forecasts, with LRU and coalescing counters (this process)"""
+    return model_registry.stats()
+
+@router.get("/retention")
+async def get_retention_status():
+    """Retention policy and the result of the last maintenance pass (this process)"""
+    return retention_job.status()
+
+
+def _service_metrics() -> List[str]:
+    cache = get_cache().stats
+    logs = log_writer.stats()
+    registry = model_registry.stats()
+    return [
+        *metric_lines("response_cache_hits_total", "Response cache hits.", cache.hits, "counter"),
+        *metric_lines("response_cache_misses_total", "Response cache misses.", cache.misses, "counter"),
+        *metric_lines("log_writer_buffered", "Log rows waiting for the next flush.", logs["buffered"]),
+        *metric_lines("log_writer_written_total", "Log rows written.", logs["written"], "counter"),
+        *metric_lines("log_writer_dropped_total", "Log rows dropped because the buffer was full.", logs["dropped"], "counter"),
+        *metric_lines("log_writer_rejected_total", "Log rows the database rejected (dropped).", logs["rejected"], "counter"),
+        *metric_lines("model_registry_models", "Deployed models loaded in memory.", registry["models"]),
+        *metric_lines("model_registry_bytes", "Size of the loaded models' artifacts.", registry["bytes"]),
+        *metric_lines("model_registry_loads_total", "Model loads (first use or a new deployment).", registry["loads"], "counter"),
+        *metric_lines("model_registry_coalesced_total", "Requests that joined an in-flight load or forecast.", registry["coalesced"], "counter"),
+    ]
+
+
+register_collector(_service_metrics)
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics():
+    """Request, SQL query and service metrics in Prometheus text format (this process)"""
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,30 +1,65 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends
+from datetime import datetime, timezone
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas import LogEntry
-from database import get_logs
+from schemas import LogEntry, LogPage
+from database import query_logs, InvalidCursorError
 from db_config import get_db
 
 router = APIRouter()
 
+def _log_entry(log) -> dict:
+    return {
+        "id": log.id,
+        "timestamp": log.timestamp.isoformat() + "Z",
+        "ticker": log.ticker,
+        "event": log.event,
+        "status": log.status,
+        "message": log.message,
+        "details": log.details
+    }
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # timestamps are stored as naive UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 @router.get("/logs", response_model=List[LogEntry])
 async def get_system_logs(
     ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
+    event: Optional[str] = Query(None, description="Filter by event name"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    since: Optional[datetime] = Query(None, description="Only logs at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Only logs before this time (UTC)"),
     limit: int = Query(200, ge=1, le=1000, description="Maximum number of logs to return"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get system logs with optional filtering"""
-    logs = await get_logs(db, ticker, limit)
-    return [
-        {
-            "id": log.id,
-            "timestamp": log.timestamp.isoformat() + "Z",
-            "ticker": log.ticker,
-            "event": log.event,
-            "status": log.status,
-            "message": log.message,
-            "details": log.details
-        }
-        for log in logs
-    ]
+    """Get system logs with optional filtering (newest first)"""
+    logs, _ = await query_logs(
+        db, ticker=ticker, event=event, status=status,
+        since=_naive_utc(since), until=_naive_utc(until), limit=limit
+    )
+    return [_log_entry(log) for log in logs]
+
+@router.get("/logs/page", response_model=LogPage)
+async def get_system_logs_page(
+    ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
+    event: Optional[str] = Query(None, description="Filter by event name"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    since: Optional[datetime] = Query(None, description="Only logs at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Only logs before this time (UTC)"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+    limit: int = Query(200, ge=1, le=1000, description="Page size"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Keyset-paginated logs (newest first); any page depth costs the same"""
+    try:
+        logs, next_cursor = await query_logs(
+            db, ticker=ticker, event=event, status=status,
+            since=_naive_utc(since), until=_naive_utc(until), cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": [_log_entry(log) for log in logs], "next_cursor": next_cursor}
@@ -2,42 +2,60 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas import ModelMetrics, DeployModelRequest, DeployModelResponse
-from database import get_models, deploy_model, get_ticker, add_log
+from schemas import ModelMetrics, BatchModelsResponse, DeployModelRequest, DeployModelResponse
+from database import get_models, get_models_for_tickers, deploy_model, get_ticker, add_log
 from db_config import get_db
+from cache import cached, cached_many, models_key
+from api.deps import ticker_list
 
 router = APIRouter()
 
+def _model_metrics(m) -> dict:
+    return {
+        "model": m.model,
+        "mae": m.mae,
+        "rmse": m.rmse,
+        "mape": m.mape,
+        "r2": m.r2,
+        "last_trained_at": m.last_trained_at.isoformat() + "Z",
+        "status": m.status,
+        "recommended": m.recommended
+    }
+
+@router.get("/models", response_model=BatchModelsResponse)
+async def get_candidate_models_batch(tickers: List[str] = Depends(ticker_list), db: AsyncSession = Depends(get_db)):
+    """Get candidate models for many tickers in one request (one query for all cache misses)"""
+    async def load(missing: List[str]):
+        grouped = await get_models_for_tickers(db, missing)
+        return {t: [_model_metrics(m) for m in models] for t, models in grouped.items()}
+
+    found = await cached_many({t: models_key(t) for t in tickers}, load)
+    return {
+        "models": {t: found[t] for t in tickers if t in found},
+        "not_found": [t for t in tickers if t not in found],
+    }
+
 @router.get("/models/{ticker}", response_model=List[ModelMetrics])
 async def get_candidate_models(ticker: str, db: AsyncSession = Depends(get_db)):
     """Get candidate models and their metrics for a ticker"""
-    ticker_obj = await get_ticker(db, ticker)
-    if not ticker_obj:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Ticker {ticker} not found"
-        )
-    
-    models = await get_models(db, ticker)
-    if not models:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No models available for {ticker}"
-        )
-    
-    return [
-        {
-            "model": m.model,
-            "mae": m.mae,
-            "rmse": m.rmse,
-            "mape": m.mape,
-            "r2": m.r2,
-            "last_trained_at": m.last_trained_at.isoformat() + "Z",
-            "status": m.status,
-            "recommended": m.recommended
-        }
-        for m in models
-    ]
+    async def load():
+        ticker_obj = await get_ticker(db, ticker)
+        if not ticker_obj:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Ticker {ticker} not found"
+            )
+
+        models = await get_models(db, ticker)
+        if not models:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No models available for {ticker}"
+            )
+
+        return [_model_metrics(m) for m in models]
+
+    return await cached(models_key(ticker), load)
 
 @router.post("/models/{ticker}/deploy", response_model=DeployModelResponse)
 async def deploy_ticker_model(ticker: str, request: DeployModelRequest, db: AsyncSession = Depends(get_db)):
@@ -1,24 +1,78 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+import json
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas import RetryPipelineResponse
-from database import get_ticker, add_log
-from database import get_latest_pipeline_run, create_pipeline_run  # NEW
+from schemas import RetryPipelineResponse, BatchPipelineRequest, BatchPipelineResponse
+from database import get_ticker, get_tickers_by_symbols, add_log
+from database import get_latest_pipeline_run
 from db_config import get_db
-from pipeline_runner import run_ticker_pipeline_sync  # NEW
+from events import broker, pipeline_event
 
 router = APIRouter()
 
+SSE_HEARTBEAT_S = 15.0
+
+
+def _sse(event: dict) -> str:
+    return f"id: {event.get('id', 0)}\nevent: pipeline\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/pipeline/events")
+async def stream_pipeline_events(
+    tickers: Optional[str] = Query(None, description="Comma-separated tickers (all tickers when omitted)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Server-Sent Events stream of pipeline run stage/progress updates"""
+    symbols = [t.strip().upper() for t in (tickers or "").split(",") if t.strip()]
+    # subscribe before the snapshot so no update falls in between
+    sub = broker.subscribe(symbols or None)
+
+    snapshot = []
+    try:
+        for symbol in symbols:
+            run = await get_latest_pipeline_run(db, symbol)
+            if run is not None:
+                snapshot.append(pipeline_event(run))
+    except Exception:
+        broker.unsubscribe(sub)
+        raise
+
+    async def stream():
+        try:
+            for event in snapshot:
+                yield _sse(event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=SSE_HEARTBEAT_S)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield _sse(event)
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/pipeline/{ticker}/status")
 async def get_pipeline_status(ticker: str, db: AsyncSession = Depends(get_db)):
     t = await get_ticker(db, ticker)
     if not t:
         raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found")
 
+    from pipeline_runner import get_scheduler  # imported on first use, not at startup
+
+    queue = get_scheduler().status(ticker)
     run = await get_latest_pipeline_run(db, ticker)
     if not run:
-        return {"ticker": ticker, "status": "idle", "stage": "none", "progress": 0.0, "message": "No runs yet"}
+        return {"ticker": ticker, "status": "idle", "stage": "none", "progress": 0.0, "message": "No runs yet", "queue": queue}
 
     return {
         "ticker": ticker,
@@ -28,17 +82,34 @@ async def get_pipeline_status(ticker: str, db: AsyncSession = Depends(get_db)):
         "progress": run.progress,
         "message": run.message,
         "error": run.error,
+        "stage_cache": run.stage_cache,
         "updated_at": run.updated_at.isoformat() + "Z",
+        "queue": queue,
     }
 
 @router.post("/pipeline/{ticker}/retry", response_model=RetryPipelineResponse, status_code=202)
-async def retry_ticker_pipeline(ticker: str, background: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+async def retry_ticker_pipeline(ticker: str, db: AsyncSession = Depends(get_db)):
     ticker_obj = await get_ticker(db, ticker)
     if not ticker_obj:
         raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found")
 
+    from pipeline_runner import enqueue_pipeline_run, QueueFullError  # imported on first use, not at startup
+
+    try:
+        run, coalesced = await enqueue_pipeline_run(db, ticker)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    if coalesced:
+        return {
+            "ticker": ticker,
+            "accepted": True,
+            "queued_at": run.started_at.isoformat() + "Z",
+            "run_id": run.id,
+            "coalesced": True,
+        }
+
     queued_at = datetime.utcnow().isoformat() + "Z"
-    run = await create_pipeline_run(db, ticker)
 
     await add_log(db, {
         "ticker": ticker,
@@ -48,6 +119,41 @@ async def retry_ticker_pipeline(ticker: str, background: BackgroundTasks, db: As
         "details": {"queued_at": queued_at, "run_id": run.id}
     })
 
-    background.add_task(run_ticker_pipeline_sync, ticker, run.id)
+    return {"ticker": ticker, "accepted": True, "queued_at": queued_at, "run_id": run.id, "coalesced": False}
+
+@router.post("/pipeline/batch", response_model=BatchPipelineResponse, status_code=202)
+async def run_pipeline_batch(request: BatchPipelineRequest, db: AsyncSession = Depends(get_db)):
+    """Queue one batch run that retrains all given tickers in a single worker process"""
+    tickers = list(dict.fromkeys(t.strip().upper() for t in request.tickers if t and t.strip()))
+    if not tickers:
+        raise HTTPException(status_code=400, detail="tickers is required")
+
+    known = {t.ticker for t in await get_tickers_by_symbols(db, tickers)}
+    missing = [t for t in tickers if t not in known]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tickers not found: {', '.join(missing)}")
+
+    from pipeline_runner import enqueue_pipeline_batch, QueueFullError  # imported on first use, not at startup
+
+    try:
+        results = await enqueue_pipeline_batch(db, tickers)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    queued_at = datetime.utcnow().isoformat() + "Z"
+    runs = [{"ticker": run.ticker, "run_id": run.id, "coalesced": coalesced} for run, coalesced in results]
+    batch_size = sum(1 for r in runs if not r["coalesced"])
+
+    for r in runs:
+        if r["coalesced"]:
+            continue
+        await add_log(db, {
+            "ticker": r["ticker"],
+            "event": "pipeline_batch_requested",
+            "status": "success",
+            "message": f"Pipeline batch run queued for {r['ticker']} ({batch_size} tickers)",
+            "details": {"queued_at": queued_at, "run_id": r["run_id"], "batch_size": batch_size}
+        })
+
+    return {"accepted": True, "queued_at": queued_at, "batch_size": batch_size, "runs": runs}
 
-    return {"ticker": ticker, "accepted": True, "queued_at": queued_at}
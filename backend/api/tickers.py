@@ -1,36 +1,46 @@
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from schemas import TickerCreate, TickerResponse, TickerDetail
-from database import get_all_tickers, get_ticker, add_ticker, delete_ticker, create_pipeline_run
+from schemas import TickerCreate, TickerCreateResponse, TickerResponse, TickerDetail
+from database import get_all_tickers, get_ticker, add_ticker, delete_ticker, add_log
 from db_config import get_db
-from pipeline_runner import run_ticker_pipeline_sync
+from cache import cached, TICKERS_KEY
 
 router = APIRouter()
 
 @router.get("/tickers", response_model=List[TickerResponse])
-async def list_tickers(db: AsyncSession = Depends(get_db)):
-    """Get all tickers"""
-    tickers = await get_all_tickers(db)
-    return [
-        {
-            "ticker": t.ticker,
-            "name": t.name,
-            "exchange": t.exchange,
-            "status": t.status,
-            "current_model": t.current_model,
-            "last_trained_at": t.last_trained_at.isoformat() + "Z" if t.last_trained_at else None,
-            "drift_score": t.drift_score,
-            "accuracy": t.accuracy,
-            "updated_at": t.updated_at.isoformat() + "Z"
-        }
-        for t in tickers
-    ]
+async def list_tickers(
+    tickers: Optional[str] = Query(None, description="Comma-separated tickers to return (all when omitted)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all tickers, or only the listed ones"""
+    async def load():
+        tickers = await get_all_tickers(db)
+        return [
+            {
+                "ticker": t.ticker,
+                "name": t.name,
+                "exchange": t.exchange,
+                "status": t.status,
+                "current_model": t.current_model,
+                "last_trained_at": t.last_trained_at.isoformat() + "Z" if t.last_trained_at else None,
+                "drift_score": t.drift_score,
+                "accuracy": t.accuracy,
+                "updated_at": t.updated_at.isoformat() + "Z"
+            }
+            for t in tickers
+        ]
+
+    rows = await cached(TICKERS_KEY, load)
+    if tickers:
+        wanted = {t.strip().upper() for t in tickers.split(",") if t.strip()}
+        rows = [row for row in rows if row["ticker"] in wanted]
+    return rows
 
-@router.post("/tickers", response_model=TickerResponse, status_code=status.HTTP_201_CREATED)
-async def create_ticker(ticker_data: TickerCreate, background: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+@router.post("/tickers", response_model=TickerCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_ticker(ticker_data: TickerCreate, db: AsyncSession = Depends(get_db)):
     """Add a new ticker to monitor and start notebooks pipeline"""
     ticker_symbol = (ticker_data.ticker or "").strip().upper()
     if not ticker_symbol:
@@ -42,6 +52,15 @@ async def create_ticker(ticker_data: TickerCreate, background: BackgroundTasks,
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Ticker {ticker_symbol} already exists"
         )
+
+    # pipeline_runner is imported on first use, not at startup
+    from pipeline_runner import enqueue_pipeline_run, get_scheduler, QueueFullError
+
+    if get_scheduler().is_full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Pipeline queue is full, try again later"
+        )
     
     new_ticker_data = {
         "ticker": ticker_symbol,
@@ -56,9 +75,21 @@ async def create_ticker(ticker_data: TickerCreate, background: BackgroundTasks,
     }
     
     ticker = await add_ticker(db, new_ticker_data)
-    
-    run = await create_pipeline_run(db, ticker.ticker)
-    background.add_task(run_ticker_pipeline_sync, ticker.ticker, run.id)
+
+    # the ticker is committed either way: a queue that filled up since the check above
+    # leaves it without a run, to be started with POST /pipeline/{ticker}/retry
+    try:
+        run, _ = await enqueue_pipeline_run(db, ticker.ticker)
+        pipeline, run_id = "queued", run.id
+    except QueueFullError as e:
+        pipeline, run_id = "not_queued", None
+        await add_log(db, {
+            "ticker": ticker.ticker,
+            "event": "pipeline_not_queued",
+            "status": "warning",
+            "message": f"Ticker {ticker.ticker} added but its pipeline was not queued: {e}",
+            "details": {},
+        })
 
     return {
         "ticker": ticker.ticker,
@@ -69,7 +100,9 @@ async def create_ticker(ticker_data: TickerCreate, background: BackgroundTasks,
         "last_trained_at": ticker.last_trained_at.isoformat() + "Z" if ticker.last_trained_at else None,
         "drift_score": ticker.drift_score,
         "accuracy": ticker.accuracy,
-        "updated_at": ticker.updated_at.isoformat() + "Z"
+        "updated_at": ticker.updated_at.isoformat() + "Z",
+        "pipeline": pipeline,
+        "run_id": run_id,
     }
 
 @router.get("/tickers/{ticker}", response_model=TickerDetail)
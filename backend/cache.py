@@ -0,0 +1,254 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import settings as app_settings
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+class MemoryCache:
+    """In-process response cache bounded by TTL and entry count (LRU eviction)."""
+
+    name = "memory"
+
+    def __init__(self, *, ttl_s: float, max_entries: int):
+        self.ttl_s = ttl_s
+        self.max_entries = max(1, max_entries)
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+            self.stats.invalidations += 1
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCache:
+    """
+    Response cache in Redis (shared by all API and pipeline worker processes).
+
+    `client` is anything with the redis-py `get` / `set(ex=...)` / `delete` /
+    `scan_iter` interface (e.g. `redis.Redis` or `fakeredis.FakeRedis`). Values
+    are stored as JSON; Redis errors count as misses so the API keeps serving
+    from the database.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, *, ttl_s: float, prefix: str = "api-cache:"):
+        self.client = client
+        self.ttl_s = ttl_s
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception:
+            self.stats.errors += 1
+            raw = None
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.client.set(self.prefix + key, json.dumps(value), ex=max(1, int(self.ttl_s)))
+        except Exception:
+            self.stats.errors += 1
+
+    def invalidate(self, prefix: str) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception:
+            self.stats.errors += 1
+        self.stats.invalidations += 1
+
+    def size(self) -> int:
+        try:
+            return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*"))
+        except Exception:
+            return 0
+
+
+class NullCache:
+    name = "none"
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def invalidate(self, prefix: str) -> None:
+        pass
+
+    def size(self) -> int:
+        return 0
+
+
+def _redis_client(url: str):
+    # Lazy import: redis is only needed when RESPONSE_CACHE_BACKEND=redis
+    try:
+        import redis  # type: ignore
+    except ModuleNotFoundError as e:
+        raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the `redis` package (pip install redis).") from e
+    return redis.Redis.from_url(url)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend = app_settings.RESPONSE_CACHE_BACKEND.strip().lower()
+            ttl_s = app_settings.RESPONSE_CACHE_TTL_S
+            if backend == "redis":
+                _cache = RedisCache(_redis_client(app_settings.REDIS_URL), ttl_s=ttl_s)
+            elif backend == "memory" and ttl_s > 0:
+                _cache = MemoryCache(ttl_s=ttl_s, max_entries=app_settings.RESPONSE_CACHE_MAX_ENTRIES)
+            else:
+                _cache = NullCache()
+        return _cache
+
+
+def set_cache(cache) -> None:
+    """Swaps the process-wide cache (e.g. a `RedisCache` around a local fake client)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+async def cached(key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Returns the cached payload for `key`, or awaits `loader()` and caches its result."""
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        value = await loader()
+        cache.set(key, value)
+    return value
+
+
+async def cached_many(
+    keys: Dict[str, str],
+    loader: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """
+    Batch version of `cached`: `keys` maps item -> cache key. Items that miss are
+    loaded with a single `loader(missing_items)` call; items it doesn't return are
+    left out of the result (and not cached).
+    """
+    cache = get_cache()
+    found: Dict[str, Any] = {}
+    missing: List[str] = []
+    for item, key in keys.items():
+        value = cache.get(key)
+        if value is None:
+            missing.append(item)
+        else:
+            found[item] = value
+
+    if missing:
+        loaded = await loader(missing)
+        for item in missing:
+            if item in loaded:
+                cache.set(keys[item], loaded[item])
+                found[item] = loaded[item]
+    return found
+
+
+# Cache keys of the dashboard read endpoints
+TICKERS_KEY = "tickers"
+SETTINGS_KEY = "settings"
+
+
+def forecast_key(ticker: str, horizon: int) -> str:
+    return f"forecast:{ticker}:{horizon}"
+
+
+def models_key(ticker: str) -> str:
+    return f"models:{ticker}:all"
+
+
+def invalidate_ticker(ticker: str) -> None:
+    """Drops everything cached for `ticker`, plus the ticker list it appears in."""
+    cache = get_cache()
+    cache.invalidate(TICKERS_KEY)
+    cache.invalidate(f"forecast:{ticker}:")
+    cache.invalidate(f"models:{ticker}:")
+
+
+def invalidate_settings() -> None:
+    get_cache().invalidate(SETTINGS_KEY)
+
+
+def invalidate_all() -> None:
+    get_cache().invalidate("")
+
+
+def cache_stats() -> dict:
+    cache = get_cache()
+    return {
+        "backend": cache.name,
+        "entries": cache.size(),
+        "ttl_s": app_settings.RESPONSE_CACHE_TTL_S,
+        **cache.stats.as_dict(),
+    }
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Tuple
 import os
 from dotenv import load_dotenv
 
@@ -11,10 +11,109 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
+
+    # "dev": create missing tables and seed sample data on startup.
+    # "production": the schema comes from `alembic upgrade head`, no seeding (fast replica boot).
+    STARTUP_MODE: str = "dev"
+
+    # Pipeline job queue: worker processes and how many runs may wait behind them
+    PIPELINE_MAX_PARALLEL: int = 2
+    PIPELINE_MAX_QUEUE: int = 100
+
+    # "script": pipeline stages run as `forecasting` functions inside the worker process (no Jupyter kernel);
+    # "notebook": notebooks 01/02 are executed through nbclient, keeping cell outputs
+    PIPELINE_MODE: str = "script"
+
+    # Script mode runs each ticker as a stage DAG (forecasting/dag.py): a stage whose input
+    # fingerprint and outputs match its last manifest is skipped. The price download is
+    # re-fetched once per refresh window (seconds).
+    PIPELINE_STAGE_CACHE: bool = True
+    PIPELINE_INGEST_REFRESH_S: int = 6 * 3600
+
+    # Script mode fits the candidate models (the `candidate_models` setting) at the same time, one worker
+    # process per model. Each fit has its own wall-clock, memory (RSS of the worker and its children) and
+    # CPU (processes, used by the ARIMA grid search) budget; a fit past its deadline is killed and recorded as
+    # "timeout". CANDIDATE_BUDGETS overrides them per model as "MODEL=seconds/MB/cpus", e.g.
+    # "LSTM=1800/4096,ARIMA=300//2". CANDIDATE_PARALLEL=false fits them in turn in-process.
+    CANDIDATE_PARALLEL: bool = True
+    CANDIDATE_TIMEOUT_S: float = 900.0
+    CANDIDATE_MEMORY_MB: int = 2048
+    CANDIDATE_CPUS: int = 1
+    CANDIDATE_BUDGETS: str = ""
+
+    # "incremental": script-mode retrains warm-start each candidate from its previous fit, with a full refit
+    # every `retrain_frequency` (settings) or when the warm winner validates `drift_threshold` worse than the
+    # last full refit's; "full": every retrain fits from scratch
+    RETRAIN_MODE: str = "incremental"
+
+    # Notebook kernel pool used by notebook-mode pipeline runs (0 disables pooling).
+    # Each pipeline worker process runs one job at a time, so one kernel is enough.
+    NOTEBOOK_KERNEL_POOL_SIZE: int = 1
+    NOTEBOOK_KERNEL_MAX_RUNS: int = 20
+    NOTEBOOK_KERNEL_PRELOAD: str = "numpy,pandas,matplotlib.pyplot,seaborn,yfinance,statsmodels.api,prophet,tensorflow"
+
+    # Response cache for the dashboard read endpoints: "memory", "redis" or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_TTL_S: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Buffered log ingestion: rows are bulk-inserted per batch / interval
+    LOG_FLUSH_BATCH: int = 500
+    LOG_FLUSH_INTERVAL_S: float = 1.0
+    LOG_BUFFER_MAX: int = 50000
+
+    # Retention: a background job prunes old rows in batches of RETENTION_BATCH_SIZE (0 days = keep forever)
+    RETENTION_ENABLED: bool = True
+    RETENTION_INTERVAL_S: float = 3600.0
+    RETENTION_BATCH_SIZE: int = 5000
+    FORECAST_RETENTION_DAYS: int = 730
+    FORECAST_DOWNSAMPLE_AFTER_DAYS: int = 180   # older points are thinned to the last point per ticker and week
+    LOG_RETENTION_DAYS: int = 90
+    LOG_ERROR_RETENTION_DAYS: int = 365         # error logs are kept longer than the rest
+    PIPELINE_RUN_RETENTION_DAYS: int = 30       # finished runs only
+    FORECAST_VERSIONS_KEEP: int = 5             # per ticker, including the current one
+
+    # Application logging (stdout, written by a background thread): level and "text" or "json"
+    APP_LOG_LEVEL: str = "INFO"
+    APP_LOG_FORMAT: str = "text"
+    # Request instrumentation (GET /api/metrics). A sampled fraction of requests is logged;
+    # requests slower than SLOW_REQUEST_MS or running REQUEST_QUERY_WARN+ SQL statements always are (0 disables).
+    REQUEST_LOG_SAMPLE_RATE: float = 0.0
+    SLOW_REQUEST_MS: float = 1000.0
+    REQUEST_QUERY_WARN: int = 25
+
+    # On-demand forecasts from deployed models: loaded models are kept in an LRU bounded by
+    # the size of their model.pkl files; loads and forecasts run on a small thread pool
+    MODEL_REGISTRY_MAX_MB: float = 512.0
+    MODEL_INFERENCE_WORKERS: int = 2
+
+    # Forecast responses at least this large are gzip/brotli-compressed when the client accepts it
+    RESPONSE_COMPRESS_MIN_BYTES: int = 1024
     
+    @property
+    def is_production(self) -> bool:
+        return self.STARTUP_MODE.strip().lower() == "production"
+
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+
+    @property
+    def notebook_kernel_preload_list(self) -> List[str]:
+        return [m.strip() for m in self.NOTEBOOK_KERNEL_PRELOAD.split(",") if m.strip()]
+
+    def candidate_budget(self, model: str) -> Tuple[float, int, int]:
+        """(timeout_s, memory_mb, cpus) for one candidate model's fit."""
+        timeout_s, memory_mb, cpus = self.CANDIDATE_TIMEOUT_S, self.CANDIDATE_MEMORY_MB, self.CANDIDATE_CPUS
+        for entry in self.CANDIDATE_BUDGETS.split(","):
+            name, _, budget = entry.partition("=")
+            if name.strip().lower() == model.lower() and budget.strip():
+                seconds, mb, n = (budget.split("/") + ["", ""])[:3]
+                timeout_s = float(seconds) if seconds.strip() else timeout_s
+                memory_mb = int(mb) if mb.strip() else memory_mb
+                cpus = int(n) if n.strip() else cpus
+        return timeout_s, memory_mb, max(1, cpus)
     
     class Config:
         env_file = ".env"
@@ -1,31 +1,37 @@
+import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
-from sqlalchemy import select, delete
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, delete, insert, update, exists, func, and_, tuple_
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 import random
 from pathlib import Path
 import json
+import base64
 
-from models import Ticker, Model, ForecastPoint, Log, Settings as SettingsModel
+from models import Ticker, Model, ForecastPoint, ForecastVersion, Log, Settings as SettingsModel
 from models import PipelineRun  # NEW
+from cache import invalidate_settings, invalidate_ticker
+from events import publish_pipeline_run
+from log_writer import log_row, log_writer
+
+logger = logging.getLogger(__name__)
 
 async def init_db(session: AsyncSession):
     """Initialize database with sample data"""
     
     try:
-        print("  → Checking for existing data...")
-        # Check if data already exists
-        result = await session.execute(select(Ticker))
-        existing_tickers = result.scalars().all()
+        # Check if data already exists (EXISTS: no need to load the tickers)
+        has_tickers = await session.scalar(select(exists().select_from(Ticker)))
         
-        if existing_tickers:
-            print(f"  → Found {len(existing_tickers)} existing tickers, skipping initialization")
+        if has_tickers:
+            logger.info("Existing tickers found, sample data skipped")
             return  # Data already exists
         
-        print("  → No existing data found, initializing...")
+        logger.info("No existing data found, seeding sample data")
         
         # Sample tickers
-        print("  → Creating sample tickers...")
+        logger.debug("Creating sample tickers...")
         sample_tickers = [
             Ticker(
                 ticker="AAPL",
@@ -66,14 +72,30 @@ async def init_db(session: AsyncSession):
             session.add(ticker)
         
         await session.commit()
-        print(f"  → Added {len(sample_tickers)} tickers")
+        logger.debug(f"Added {len(sample_tickers)} tickers")
+
+        # Sample data is served as each ticker's current forecast version
+        seed_versions = {}
+        for ticker in sample_tickers:
+            version = ForecastVersion(
+                ticker=ticker.ticker,
+                source="seed",
+                model=ticker.current_model,
+                trained_at=ticker.last_trained_at,
+                n_points=60
+            )
+            session.add(version)
+            await session.flush()
+            ticker.current_forecast_version_id = version.id
+            seed_versions[ticker.ticker] = version.id
         
         # Sample models for each ticker
-        print("  → Creating sample models...")
+        logger.debug("Creating sample models...")
         for ticker_symbol in ["AAPL", "GOOGL", "TSLA"]:
             models = [
                 Model(
                     ticker=ticker_symbol,
+                    version_id=seed_versions[ticker_symbol],
                     model="LSTM",
                     mae=round(random.uniform(1.2, 2.5), 2),
                     rmse=round(random.uniform(1.8, 3.0), 2),
@@ -85,6 +107,7 @@ async def init_db(session: AsyncSession):
                 ),
                 Model(
                     ticker=ticker_symbol,
+                    version_id=seed_versions[ticker_symbol],
                     model="Transformer",
                     mae=round(random.uniform(1.0, 2.0), 2),
                     rmse=round(random.uniform(1.5, 2.5), 2),
@@ -96,6 +119,7 @@ async def init_db(session: AsyncSession):
                 ),
                 Model(
                     ticker=ticker_symbol,
+                    version_id=seed_versions[ticker_symbol],
                     model="XGBoost",
                     mae=round(random.uniform(1.3, 2.3), 2),
                     rmse=round(random.uniform(1.9, 2.8), 2),
@@ -110,19 +134,20 @@ async def init_db(session: AsyncSession):
                 session.add(model)
         
         await session.commit()
-        print("  → Added models for all tickers")
+        logger.debug("Added models for all tickers")
         
         # Sample forecast data
-        print("  → Creating sample forecast data...")
+        logger.debug("Creating sample forecast data...")
         for ticker_symbol in ["AAPL", "GOOGL", "TSLA"]:
             base_price = random.uniform(100, 300)
             for i in range(60):
-                date = (datetime.utcnow() - timedelta(days=60-i)).date().isoformat()
+                date = (datetime.utcnow() - timedelta(days=60-i)).date()
                 actual = base_price + random.uniform(-5, 5) + (i * 0.1)
                 predicted = actual + random.uniform(-2, 2)
                 
                 forecast_point = ForecastPoint(
                     ticker=ticker_symbol,
+                    version_id=seed_versions[ticker_symbol],
                     date=date,
                     actual=round(actual, 2) if i < 30 else None,
                     predicted=round(predicted, 2),
@@ -132,10 +157,10 @@ async def init_db(session: AsyncSession):
                 session.add(forecast_point)
         
         await session.commit()
-        print("  → Added forecast data")
+        logger.debug("Added forecast data")
         
         # Sample logs
-        print("  → Creating sample logs...")
+        logger.debug("Creating sample logs...")
         events = ["training_started", "training_completed", "drift_detected", "model_deployed", "prediction_generated"]
         statuses = ["success", "warning", "error"]
         
@@ -159,10 +184,10 @@ async def init_db(session: AsyncSession):
             session.add(log)
         
         await session.commit()
-        print("  → Added sample logs")
+        logger.debug("Added sample logs")
         
         # Default settings
-        print("  → Creating default settings...")
+        logger.debug("Creating default settings...")
         settings_result = await session.execute(select(SettingsModel).where(SettingsModel.id == 1))
         existing_settings = settings_result.scalar_one_or_none()
         
@@ -173,17 +198,17 @@ async def init_db(session: AsyncSession):
                 drift_threshold=0.2,
                 enable_auto_deploy=True,
                 slack_webhook_url="",
-                candidate_models=["LSTM", "GRU", "Transformer", "XGBoost"],
+                candidate_models=["ARIMA", "Prophet", "LSTM"],
                 exchanges_enabled=["NYSE", "NASDAQ"]
             )
             session.add(settings)
             await session.commit()
-            print("  → Default settings created")
+            logger.debug("Default settings created")
         else:
-            print("  → Settings already exist")
+            logger.debug("Settings already exist")
             
     except Exception as e:
-        print(f"  ❌ Error during initialization: {e}")
+        logger.error("Sample data initialization failed", extra={"error": str(e)})
         raise
 
 # CRUD operations
@@ -191,6 +216,10 @@ async def get_ticker(session: AsyncSession, ticker: str) -> Optional[Ticker]:
     result = await session.execute(select(Ticker).where(Ticker.ticker == ticker))
     return result.scalar_one_or_none()
 
+async def get_tickers_by_symbols(session: AsyncSession, tickers: List[str]) -> List[Ticker]:
+    result = await session.execute(select(Ticker).where(Ticker.ticker.in_(tickers)))
+    return result.scalars().all()
+
 async def get_all_tickers(session: AsyncSession) -> List[Ticker]:
     result = await session.execute(select(Ticker))
     return result.scalars().all()
@@ -200,17 +229,36 @@ async def add_ticker(session: AsyncSession, ticker_data: dict) -> Ticker:
     session.add(ticker)
     await session.commit()
     await session.refresh(ticker)
+    invalidate_ticker(ticker.ticker)
     return ticker
 
 async def delete_ticker(session: AsyncSession, ticker: str) -> bool:
     result = await session.execute(delete(Ticker).where(Ticker.ticker == ticker))
     await session.commit()
+    invalidate_ticker(ticker)
     return result.rowcount > 0
 
+def _current_version_join(model):
+    # rows of the ticker's current forecast version only
+    return and_(Ticker.ticker == model.ticker, Ticker.current_forecast_version_id == model.version_id)
+
 async def get_models(session: AsyncSession, ticker: str) -> List[Model]:
-    result = await session.execute(select(Model).where(Model.ticker == ticker))
+    result = await session.execute(
+        select(Model).join(Ticker, _current_version_join(Model)).where(Model.ticker == ticker).order_by(Model.id)
+    )
     return result.scalars().all()
 
+async def get_models_for_tickers(session: AsyncSession, tickers: List[str]) -> Dict[str, List[Model]]:
+    """Candidate models of many tickers in one query, grouped by ticker."""
+    result = await session.execute(
+        select(Model).join(Ticker, _current_version_join(Model))
+        .where(Model.ticker.in_(tickers)).order_by(Model.ticker, Model.id)
+    )
+    grouped: Dict[str, List[Model]] = {}
+    for m in result.scalars():
+        grouped.setdefault(m.ticker, []).append(m)
+    return grouped
+
 async def deploy_model(session: AsyncSession, ticker: str, model_name: str) -> Optional[dict]:
     ticker_obj = await get_ticker(session, ticker)
     if ticker_obj:
@@ -218,6 +266,7 @@ async def deploy_model(session: AsyncSession, ticker: str, model_name: str) -> O
         ticker_obj.current_model = model_name
         ticker_obj.updated_at = datetime.utcnow()
         await session.commit()
+        invalidate_ticker(ticker)
         
         return {
             "ticker": ticker,
@@ -227,24 +276,16 @@ async def deploy_model(session: AsyncSession, ticker: str, model_name: str) -> O
         }
     return None
 
-async def get_forecast(session: AsyncSession, ticker: str, horizon: int = 30) -> Optional[dict]:
-    result = await session.execute(
-        select(ForecastPoint)
-        .where(ForecastPoint.ticker == ticker)
-        .order_by(ForecastPoint.date)
-        .limit(horizon if horizon != 30 else 60)
-    )
-    points = result.scalars().all()
-    
-    if not points:
-        return None
-    
+def _forecast_limit(horizon: int) -> int:
+    return horizon if horizon != 30 else 60
+
+def _forecast_payload(ticker: str, horizon: int, points: List[ForecastPoint]) -> dict:
     return {
         "ticker": ticker,
         "horizon": horizon,
         "points": [
             {
-                "date": p.date,
+                "date": p.date.isoformat(),
                 "actual": p.actual,
                 "predicted": p.predicted,
                 "lower": p.lower,
@@ -254,20 +295,112 @@ async def get_forecast(session: AsyncSession, ticker: str, horizon: int = 30) ->
         ]
     }
 
-async def get_logs(session: AsyncSession, ticker: Optional[str] = None, limit: int = 200) -> List[Log]:
-    query = select(Log).order_by(Log.timestamp.desc()).limit(limit)
+async def get_forecast(session: AsyncSession, ticker: str, horizon: int = 30) -> Optional[dict]:
+    """The latest points (by date) of the ticker's current forecast version, oldest first."""
+    result = await session.execute(
+        select(ForecastPoint)
+        .join(Ticker, _current_version_join(ForecastPoint))
+        .where(ForecastPoint.ticker == ticker)
+        .order_by(ForecastPoint.date.desc())
+        .limit(_forecast_limit(horizon))
+    )
+    points = list(reversed(result.scalars().all()))
     
+    if not points:
+        return None
+    
+    return _forecast_payload(ticker, horizon, points)
+
+async def get_forecasts(session: AsyncSession, tickers: List[str], horizon: int = 30) -> Dict[str, dict]:
+    """
+    Forecasts of many tickers in one query: the same points per ticker as
+    `get_forecast`, via a row_number window. Tickers without points are absent.
+    """
+    ranked = (
+        select(
+            ForecastPoint,
+            func.row_number().over(partition_by=ForecastPoint.ticker, order_by=ForecastPoint.date.desc()).label("rn"),
+        )
+        .join(Ticker, _current_version_join(ForecastPoint))
+        .where(ForecastPoint.ticker.in_(tickers))
+        .subquery()
+    )
+    point = aliased(ForecastPoint, ranked)
+    result = await session.execute(
+        select(point).where(ranked.c.rn <= _forecast_limit(horizon)).order_by(point.ticker, point.date)
+    )
+
+    grouped: Dict[str, List[ForecastPoint]] = {}
+    for p in result.scalars():
+        grouped.setdefault(p.ticker, []).append(p)
+    return {ticker: _forecast_payload(ticker, horizon, points) for ticker, points in grouped.items()}
+
+async def get_logs(session: AsyncSession, ticker: Optional[str] = None, limit: int = 200) -> List[Log]:
+    logs, _ = await query_logs(session, ticker=ticker, limit=limit)
+    return logs
+
+class InvalidCursorError(ValueError):
+    pass
+
+def encode_log_cursor(log: Log) -> str:
+    raw = json.dumps([log.timestamp.isoformat(), log.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_log_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, log_id = json.loads(raw)
+        return datetime.fromisoformat(ts), str(log_id)
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+def log_query(
+    *,
+    ticker: Optional[str] = None,
+    event: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 200,
+):
+    """Newest-first log page after `cursor`, as a keyset (timestamp, id) range scan."""
+    query = select(Log)
     if ticker:
         query = query.where(Log.ticker == ticker)
-    
-    result = await session.execute(query)
-    return result.scalars().all()
+    if event:
+        query = query.where(Log.event == event)
+    if status:
+        query = query.where(Log.status == status)
+    if since is not None:
+        query = query.where(Log.timestamp >= since)
+    if until is not None:
+        query = query.where(Log.timestamp < until)
+    if cursor:
+        ts, log_id = decode_log_cursor(cursor)
+        query = query.where(tuple_(Log.timestamp, Log.id) < tuple_(ts, log_id))
+    return query.order_by(Log.timestamp.desc(), Log.id.desc()).limit(limit)
+
+async def query_logs(session: AsyncSession, *, limit: int = 200, **filters) -> Tuple[List[Log], Optional[str]]:
+    """
+    Returns `(logs, next_cursor)`; `next_cursor` is None on the last page.
+    Filters: ticker, event, status, since, until (half-open time range), cursor.
+    """
+    # one extra row tells whether another page exists
+    result = await session.execute(log_query(limit=limit + 1, **filters))
+    logs = result.scalars().all()
+    next_cursor = encode_log_cursor(logs[limit - 1]) if len(logs) > limit else None
+    return logs[:limit], next_cursor
 
 async def add_log(session: AsyncSession, log_data: dict) -> Log:
-    log_data["id"] = f"log_{datetime.utcnow().timestamp()}"
-    log_data["timestamp"] = datetime.utcnow()
-    
-    log = Log(**log_data)
+    """
+    Queues the log row on the buffered writer (bulk-inserted on its next flush).
+    Without a running writer (scripts, one-off jobs) the row is inserted right away.
+    """
+    if log_writer.running:
+        return Log(**log_writer.log(log_data))
+
+    log = Log(**log_row(log_data))
     session.add(log)
     await session.commit()
     await session.refresh(log)
@@ -275,19 +408,13 @@ async def add_log(session: AsyncSession, log_data: dict) -> Log:
 
 async def get_settings(session: AsyncSession) -> Optional[SettingsModel]:
     result = await session.execute(select(SettingsModel).where(SettingsModel.id == 1))
-    settings = result.scalar_one_or_none()
-    print(f"🔍 Database query for settings (id=1): {settings is not None}")
-    if settings:
-        print(f"   → candidate_models: {settings.candidate_models}")
-        print(f"   → exchanges_enabled: {settings.exchanges_enabled}")
-    return settings
+    return result.scalar_one_or_none()
 
 async def update_settings(session: AsyncSession, new_settings: dict) -> SettingsModel:
-    print(f"💾 Updating settings in database with: {new_settings}")
     settings = await get_settings(session)
     
     if not settings:
-        print("⚠️ No existing settings found, creating new record...")
+        logger.warning("No existing settings found, creating the record")
         settings = SettingsModel(id=1)
         session.add(settings)
         # Set default values first
@@ -295,23 +422,20 @@ async def update_settings(session: AsyncSession, new_settings: dict) -> Settings
         settings.drift_threshold = 0.2
         settings.enable_auto_deploy = True
         settings.slack_webhook_url = ""
-        settings.candidate_models = ["LSTM", "GRU", "Transformer", "XGBoost"]
+        settings.candidate_models = ["ARIMA", "Prophet", "LSTM"]
         settings.exchanges_enabled = ["NYSE", "NASDAQ"]
     
     # Update fields
     for key, value in new_settings.items():
         if hasattr(settings, key) and value is not None:
-            print(f"   → Setting {key} = {value}")
             setattr(settings, key, value)
     
     settings.updated_at = datetime.utcnow()
     
     await session.commit()
     await session.refresh(settings)
-    
-    print(f"✅ Settings committed to database")
-    print(f"   → candidate_models: {settings.candidate_models}")
-    print(f"   → exchanges_enabled: {settings.exchanges_enabled}")
+    invalidate_settings()
+    logger.debug("Settings committed", extra={"settings": new_settings})
     
     return settings
 
@@ -320,8 +444,13 @@ async def create_pipeline_run(session: AsyncSession, ticker: str) -> PipelineRun
     session.add(run)
     await session.commit()
     await session.refresh(run)
+    publish_pipeline_run(run)
     return run
 
+async def get_pipeline_run(session: AsyncSession, run_id: int) -> Optional[PipelineRun]:
+    result = await session.execute(select(PipelineRun).where(PipelineRun.id == run_id))
+    return result.scalar_one_or_none()
+
 async def get_latest_pipeline_run(session: AsyncSession, ticker: str) -> Optional[PipelineRun]:
     result = await session.execute(
         select(PipelineRun).where(PipelineRun.ticker == ticker).order_by(PipelineRun.id.desc()).limit(1)
@@ -337,6 +466,7 @@ async def update_pipeline_run(
     progress: Optional[float] = None,
     message: Optional[str] = None,
     error: Optional[str] = None,
+    stage_cache: Optional[dict] = None,
 ) -> Optional[PipelineRun]:
     result = await session.execute(select(PipelineRun).where(PipelineRun.id == run_id))
     run = result.scalar_one_or_none()
@@ -353,18 +483,108 @@ async def update_pipeline_run(
         run.message = message
     if error is not None:
         run.error = error
+    if stage_cache is not None:
+        run.stage_cache = dict(stage_cache)
 
     run.updated_at = datetime.utcnow()
     await session.commit()
     await session.refresh(run)
+    publish_pipeline_run(run)
     return run
 
-async def finalize_ticker_from_metadata(session: AsyncSession, ticker: str) -> None:
+MODEL_METRICS = ("mae", "rmse", "mape", "r2")
+BULK_INSERT_ROWS = 2000
+
+def _parse_utc(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.rstrip("Z")) if value else None
+    except ValueError:
+        return None
+
+def candidate_model_rows(experiment_log: dict, trained_at: datetime) -> List[dict]:
+    """`models` rows for the candidates of an experiment log that trained successfully."""
+    best = (experiment_log.get("best") or {}).get("model")
+    rows = []
+    for r in experiment_log.get("results", []):
+        if r.get("status") != "ok" or any(r.get(k) is None for k in MODEL_METRICS):
+            continue
+        rows.append({
+            "model": r["model"],
+            **{k: float(r[k]) for k in MODEL_METRICS},
+            "last_trained_at": trained_at,
+            "status": "success",
+            "recommended": r["model"] == best,
+        })
+    return rows
+
+async def publish_forecast_version(
+    session: AsyncSession,
+    ticker: str,
+    *,
+    points: List[dict],
+    models: List[dict],
+    model_name: Optional[str],
+    trained_at: datetime,
+    source: str = "pipeline",
+    drift_score: Optional[float] = None,
+) -> int:
+    """
+    Writes a new forecast version (one bulk INSERT for its points, one for its
+    candidate models) and makes it the ticker's current version in the same
+    transaction, so readers see either the previous version or all of the new one.
+    """
+    version = ForecastVersion(
+        ticker=ticker, source=source, model=model_name, trained_at=trained_at, n_points=len(points)
+    )
+    session.add(version)
+    await session.flush()
+
+    point_rows = [
+        {
+            "ticker": ticker,
+            "version_id": version.id,
+            "date": datetime.fromisoformat(p["date"]).date(),
+            "actual": p.get("actual"),
+            "predicted": p["predicted"],
+            "lower": p.get("lower"),
+            "upper": p.get("upper"),
+            "created_at": version.created_at,
+        }
+        for p in points
+    ]
+    # multi-row INSERTs, chunked only to stay under the drivers' bind-parameter limits
+    for i in range(0, len(point_rows), BULK_INSERT_ROWS):
+        await session.execute(insert(ForecastPoint).values(point_rows[i:i + BULK_INSERT_ROWS]))
+    if models:
+        await session.execute(insert(Model).values([{"ticker": ticker, "version_id": version.id, **m} for m in models]))
+
+    values = {
+        "current_forecast_version_id": version.id,
+        "last_trained_at": trained_at,
+        "status": "healthy",
+        "updated_at": datetime.utcnow(),
+    }
+    if model_name:
+        values["current_model"] = model_name
+    if drift_score is not None:
+        values["drift_score"] = drift_score
+    await session.execute(update(Ticker).where(Ticker.ticker == ticker).values(**values))
+    await session.commit()
+    invalidate_ticker(ticker)
+    return version.id
+
+async def finalize_ticker_from_metadata(session: AsyncSession, ticker: str, root: Optional[Path] = None) -> Optional[int]:
     """
-    Best-effort: reads models/latest/{TICKER}/metadata.json and updates ticker fields.
+    Best-effort: reads models/latest/{TICKER}/metadata.json. When the run left its
+    forecast (forecast.json) and experiment log, publishes them as the ticker's new
+    current forecast version; otherwise only updates the ticker fields.
+    Returns the id of the published version, if any.
     """
-    repo_root = Path(__file__).resolve().parents[1]
-    meta_path = repo_root / "models" / "latest" / ticker / "metadata.json"
+    repo_root = Path(root) if root else Path(__file__).resolve().parents[1]
+    latest_dir = repo_root / "models" / "latest" / ticker
+    meta_path = latest_dir / "metadata.json"
+    log_path = repo_root / "data" / "logs" / f"{ticker}_experiments.json"
+    meta = {}
     model_type = None
     trained_at = None
 
@@ -375,11 +595,30 @@ async def finalize_ticker_from_metadata(session: AsyncSession, ticker: str) -> N
 
     t = await get_ticker(session, ticker)
     if not t:
-        return
+        return None
+
+    forecast_file = meta.get("forecast_file")
+    if forecast_file and (latest_dir / forecast_file).exists() and log_path.exists():
+        forecast = json.loads((latest_dir / forecast_file).read_text(encoding="utf-8"))
+        experiment_log = json.loads(log_path.read_text(encoding="utf-8"))
+        trained = _parse_utc(trained_at) or datetime.utcnow()
+        return await publish_forecast_version(
+            session,
+            ticker,
+            points=forecast.get("points", []),
+            models=candidate_model_rows(experiment_log, trained),
+            model_name=model_type,
+            trained_at=trained,
+            drift_score=meta.get("drift_score"),
+        )
 
     if model_type:
         t.current_model = model_type
+    if meta.get("drift_score") is not None:
+        t.drift_score = meta["drift_score"]
     t.last_trained_at = datetime.utcnow()
     t.status = "healthy"
     t.updated_at = datetime.utcnow()
     await session.commit()
+    invalidate_ticker(ticker)
+    return None
@@ -5,15 +5,20 @@ from config import settings
 # Base class for models
 Base = declarative_base()
 
+# Pool sizing only applies to server databases (SQLite uses its own pool classes)
+pool_kwargs = {} if settings.DATABASE_URL.startswith("sqlite") else {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+}
+
 # Create async engine with better timeout settings
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,  # Set to True for SQL debugging
     future=True,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30
+    **pool_kwargs
 )
 
 # Create async session factory
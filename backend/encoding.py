@@ -0,0 +1,151 @@
+import gzip
+import json
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+from config import settings as app_settings
+from schemas import BatchForecastResponse, ForecastResponse
+
+POINT_FIELDS = ("date", "actual", "predicted", "lower", "upper")
+
+# format -> media type of the response body
+MEDIA_TYPES = {
+    "json": "application/json",
+    "columnar": "application/json",
+    "msgpack": "application/msgpack",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+# Accept header values that select a format when no `format=` query parameter is given
+ACCEPT_FORMATS = {
+    "application/vnd.forecast.columnar+json": "columnar",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.apache.arrow.stream": "arrow",
+}
+FORMATS = tuple(MEDIA_TYPES)
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def negotiate_format(fmt: Optional[str], accept: str = "") -> str:
+    """`format=` wins; otherwise the first Accept media type we know; otherwise row JSON."""
+    if fmt:
+        return fmt
+    for part in accept.split(","):
+        media = part.split(";")[0].strip().lower()
+        if media in ACCEPT_FORMATS:
+            return ACCEPT_FORMATS[media]
+    return "json"
+
+
+def columnar_forecast(payload: dict) -> dict:
+    """`{"ticker", "horizon", "points": [{...}]}` -> one list per point field."""
+    points = payload["points"]
+    return {
+        "ticker": payload["ticker"],
+        "horizon": payload["horizon"],
+        **{field: [p[field] for p in points] for field in POINT_FIELDS},
+    }
+
+
+def _json_bytes(data) -> bytes:
+    return json.dumps(data, separators=(",", ":"), allow_nan=False).encode()
+
+
+def _msgpack_bytes(data) -> bytes:
+    # Lazy import: msgpack is only needed for format=msgpack
+    try:
+        import msgpack  # type: ignore
+    except ImportError:
+        raise HTTPException(status_code=406, detail="format=msgpack requires the `msgpack` package on the server")
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def _arrow_bytes(forecasts: Iterable[dict], metadata: dict) -> bytes:
+    """One Arrow IPC stream, one row per point with a `ticker` column (dates as date32)."""
+    try:
+        import pyarrow as pa  # type: ignore
+    except ImportError:
+        raise HTTPException(status_code=406, detail="format=arrow requires the `pyarrow` package on the server")
+
+    columns = {"ticker": []}
+    columns.update({field: [] for field in POINT_FIELDS})
+    for forecast in forecasts:
+        columns["ticker"].extend([forecast["ticker"]] * len(forecast["points"]))
+        for field in POINT_FIELDS:
+            columns[field].extend(p[field] for p in forecast["points"])
+
+    table = pa.table({
+        "ticker": pa.array(columns["ticker"], pa.string()).dictionary_encode(),
+        "date": pa.array(columns["date"], pa.string()).cast(pa.date32()),
+        **{field: pa.array(columns[field], pa.float64()) for field in POINT_FIELDS[1:]},
+    }).replace_schema_metadata({k: json.dumps(v) for k, v in metadata.items()})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_forecast(payload: dict, fmt: str) -> bytes:
+    """Body of `GET /api/forecast/{ticker}` in the given format."""
+    if fmt == "json":
+        return ForecastResponse.model_validate(payload).model_dump_json().encode()
+    if fmt == "columnar":
+        return _json_bytes(columnar_forecast(payload))
+    if fmt == "msgpack":
+        return _msgpack_bytes(columnar_forecast(payload))
+    return _arrow_bytes([payload], {"horizon": payload["horizon"]})
+
+
+def encode_forecast_batch(forecasts: List[dict], not_found: List[str], horizon: int, fmt: str) -> bytes:
+    """Body of `GET /api/forecast?tickers=` in the given format."""
+    if fmt == "json":
+        return BatchForecastResponse(forecasts=forecasts, not_found=not_found).model_dump_json().encode()
+    if fmt in ("columnar", "msgpack"):
+        data = {"forecasts": [columnar_forecast(f) for f in forecasts], "not_found": not_found}
+        return _json_bytes(data) if fmt == "columnar" else _msgpack_bytes(data)
+    return _arrow_bytes(forecasts, {"horizon": horizon, "not_found": not_found})
+
+
+def _brotli():
+    try:
+        import brotli  # type: ignore
+        return brotli
+    except ImportError:
+        return None
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    encodings = []
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        if params.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        encodings.append(name.strip().lower())
+    return encodings
+
+
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """Brotli (when installed) or gzip, if the client accepts it and the body is worth it."""
+    if len(body) < app_settings.RESPONSE_COMPRESS_MIN_BYTES:
+        return body, None
+    encodings = accepted_encodings(accept_encoding)
+    brotli = _brotli() if "br" in encodings else None
+    if brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY), "br"
+    if "gzip" in encodings:
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), "gzip"
+    return body, None
+
+
+def encoded_response(request: Request, body: bytes, fmt: str) -> Response:
+    body, encoding = compress(body, request.headers.get("accept-encoding", ""))
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,127 @@
+import asyncio
+import itertools
+import threading
+from typing import Iterable, List, Optional, Set
+
+from models import PipelineRun
+
+
+def pipeline_event(run: PipelineRun) -> dict:
+    return {
+        "run_id": run.id,
+        "ticker": run.ticker,
+        "status": run.status,
+        "stage": run.stage,
+        "progress": run.progress,
+        "message": run.message,
+        "error": run.error,
+        "stage_cache": run.stage_cache,
+        "updated_at": run.updated_at.isoformat() + "Z" if run.updated_at else None,
+    }
+
+
+class Subscription:
+    def __init__(self, tickers: Optional[Set[str]], loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.tickers = tickers
+        self.loop = loop
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def wants(self, event: dict) -> bool:
+        return self.tickers is None or event.get("ticker") in self.tickers
+
+    def offer(self, event: dict) -> None:
+        # runs on the subscriber's loop; a slow client loses its oldest events, not the newest
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventBroker:
+    """
+    In-process fan-out of pipeline run updates to streaming subscribers.
+
+    `publish` may be called from any thread; each subscriber only receives the
+    tickers it subscribed to (all tickers when it passed none).
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self.max_queue = max_queue
+        self._subs: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, tickers: Optional[Iterable[str]] = None) -> Subscription:
+        sub = Subscription(set(tickers) if tickers else None, asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def publish(self, event: dict) -> None:
+        event = {"id": next(self._ids), **event}
+        with self._lock:
+            subs = [s for s in self._subs if s.wants(event)]
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # subscriber's loop is closed
+                self.unsubscribe(sub)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+
+broker = EventBroker()
+
+# Set in pipeline worker processes: their updates are forwarded to the API process
+_forward_queue = None
+
+
+def set_forward_queue(queue) -> None:
+    global _forward_queue
+    _forward_queue = queue
+
+
+def publish_pipeline_run(run: PipelineRun) -> None:
+    event = pipeline_event(run)
+    if _forward_queue is not None:
+        try:
+            _forward_queue.put_nowait(event)
+        except Exception:
+            pass
+        return
+    broker.publish(event)
+
+
+class EventRelay:
+    """Republishes events that pipeline worker processes put on `queue` (runs in a daemon thread)."""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self._thread = threading.Thread(target=self._run, name="pipeline-event-relay", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                event = self.queue.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            broker.publish(event)
+
+    def stop(self) -> None:
+        try:
+            self.queue.put(None)
+        except Exception:
+            pass
+        self._thread.join(timeout=5)
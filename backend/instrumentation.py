@@ -0,0 +1,326 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from config import settings as app_settings
+
+logger = logging.getLogger("instrumentation")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+INF_LABEL = 'le="+Inf"'
+
+
+# --- Logging -----------------------------------------------------------------
+
+# attributes every LogRecord has; anything else came in through `extra=` and is logged as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    return {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg and the `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class KeyValueFormatter(logging.Formatter):
+    """`ts LEVEL logger: msg key=value ...` for humans."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> None:
+    """
+    Routes the root logger through a queue: the event loop only enqueues records,
+    a background thread formats and writes them to stdout.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if (fmt or app_settings.APP_LOG_FORMAT) == "json" else KeyValueFormatter())
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [_QueueHandler(records)]
+    root.setLevel((level or app_settings.APP_LOG_LEVEL).upper())
+
+    _listener = logging.handlers.QueueListener(records, stream)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Writes out queued records and stops the writer thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # keep the record as is (fields, exc_info) for the formatter in the writer thread;
+        # only the message is rendered here, while its args are still safe to read
+        record = logging.makeLogRecord(vars(record))
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+
+# --- Metrics -----------------------------------------------------------------
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labels, labels)} {_num(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(s)) for labels, s in self._series.items())
+        for labels, s in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets, s):
+                cumulative += n
+                le = 'le="%s"' % _num(bound)
+                lines.append(f"{self.name}_bucket{_label_str(self.labels, labels, le)} {cumulative}")
+            cumulative += s[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{_label_str(self.labels, labels, INF_LABEL)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, labels)} {_num(s[-1])}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, labels)} {cumulative}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request (N+1 patterns show up here).",
+    ("method", "route"), QUERY_COUNT_BUCKETS,
+)
+QUERY_DURATION = Histogram("db_query_duration_seconds", "SQL statement latency.", ("operation", "table"))
+QUERY_ERRORS = Counter("db_query_errors_total", "SQL statements that raised.", ("operation", "table"))
+
+METRICS = [REQUEST_DURATION, REQUEST_QUERIES, QUERY_DURATION, QUERY_ERRORS]
+# extra "name value" sources read at scrape time (cache, log writer, ...)
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def register_collector(collect: Callable[[], List[str]]) -> None:
+    _collectors.append(collect)
+
+
+def metric_lines(name: str, help: str, value: float, kind: str = "gauge") -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {_num(value)}"]
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for collect in _collectors:
+        try:
+            lines.extend(collect())
+        except Exception as e:
+            logger.warning("Metrics collector failed", extra={"collector": getattr(collect, "__name__", "?"), "error": str(e)})
+    return "\n".join(lines) + "\n"
+
+
+# --- Request and query hooks -------------------------------------------------
+
+class RequestStats:
+    __slots__ = ("queries", "query_s")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_s = 0.0
+
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+_STATEMENT_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+"?(\w+)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def statement_labels(statement: str) -> Tuple[str, str]:
+    """(operation, first table) of a SQL statement, e.g. ("select", "forecast_points")."""
+    words = statement.lstrip().split(None, 1)
+    operation = words[0].lower() if words else "other"
+    table = _STATEMENT_TABLE.search(statement)
+    return operation, table.group(1).lower() if table else "-"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    QUERY_DURATION.observe(elapsed, *statement_labels(statement))
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_s += elapsed
+
+
+def _handle_error(exception_context):
+    if exception_context.statement:
+        QUERY_ERRORS.inc(*statement_labels(exception_context.statement))
+
+
+def instrument_engine(engine) -> None:
+    """Times every statement the engine runs and counts it against the current request."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class InstrumentationMiddleware:
+    """
+    Records latency and SQL statement count per route template. A sample of requests
+    (REQUEST_LOG_SAMPLE_RATE) is logged; slow or query-heavy requests always are.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_stats.reset(token)
+            self._record(scope, status, time.perf_counter() - started, stats)
+
+    @staticmethod
+    def _record(scope, status: int, elapsed: float, stats: RequestStats) -> None:
+        # the route template (/api/forecast/{ticker}) keeps the label set bounded
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        method = scope["method"]
+        REQUEST_DURATION.observe(elapsed, method, route, str(status))
+        REQUEST_QUERIES.observe(stats.queries, method, route)
+
+        s = app_settings
+        slow = 0 < s.SLOW_REQUEST_MS <= elapsed * 1000
+        chatty = 0 < s.REQUEST_QUERY_WARN <= stats.queries
+        if slow or chatty or (s.REQUEST_LOG_SAMPLE_RATE > 0 and random.random() < s.REQUEST_LOG_SAMPLE_RATE):
+            logger.log(
+                logging.WARNING if slow or chatty else logging.INFO,
+                "request",
+                extra={
+                    "method": method,
+                    "route": route,
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "queries": stats.queries,
+                    "query_ms": round(stats.query_s * 1000, 2),
+                },
+            )
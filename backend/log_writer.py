@@ -0,0 +1,181 @@
+import uuid
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import insert
+
+from config import settings as app_settings
+from db_config import AsyncSessionLocal
+from models import Log
+
+logger = logging.getLogger(__name__)
+
+
+def new_log_id() -> str:
+    return f"log_{uuid.uuid4().hex}"
+
+
+def log_row(log_data: dict) -> dict:
+    """Complete row for the `logs` table (id and timestamp are assigned here, at event time)."""
+    return {
+        "id": log_data.get("id") or new_log_id(),
+        "timestamp": log_data.get("timestamp") or datetime.utcnow(),
+        "ticker": log_data["ticker"],
+        "event": log_data["event"],
+        "status": log_data["status"],
+        "message": log_data["message"],
+        "details": log_data.get("details") or {},
+    }
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Connection-level failures, worth retrying the same rows later. Anything else the
+    database raises (a constraint, a missing table, ...) fails the same way on every
+    retry, OperationalError included.
+    """
+    if isinstance(error, (sa_exc.InterfaceError, sa_exc.DisconnectionError, sa_exc.TimeoutError)):
+        return True
+    if isinstance(error, sa_exc.DBAPIError):
+        if error.connection_invalidated:
+            return True
+        error = error.orig  # a driver error wrapping a socket failure
+    return isinstance(error, (ConnectionError, OSError, asyncio.TimeoutError))
+
+
+class LogWriter:
+    """
+    Buffers log rows in memory and writes them with one multi-row INSERT per batch,
+    every `flush_interval_s` or as soon as `batch_size` rows are waiting.
+
+    Rows are visible to log queries after the next flush. When the database is
+    unavailable rows stay buffered (up to `max_buffer`, oldest dropped first). A batch
+    the database rejects for its content (NOT NULL, foreign key, ...) is split in
+    halves until the offending rows are isolated; those are dropped and counted in
+    `rejected`, the rest are written.
+    """
+
+    def __init__(self, *, batch_size: int = 500, flush_interval_s: float = 1.0, max_buffer: int = 50_000):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_s
+        self.max_buffer = max(self.batch_size, max_buffer)
+
+        self._buffer: Deque[dict] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self.written = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.failed_flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    def log(self, log_data: dict) -> dict:
+        row = log_row(log_data)
+        self._buffer.append(row)
+        while len(self._buffer) > self.max_buffer:
+            self._buffer.popleft()
+            self.dropped += 1
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return row
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Writes everything buffered so far; returns the number of rows written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch: List[dict] = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                batch_written, unwritten = await self._write(batch)
+                written += batch_written
+                self.written += batch_written
+                if unwritten:
+                    # keep the rows for the next attempt
+                    self._buffer.extendleft(reversed(unwritten))
+                    break
+        return written
+
+    async def _write(self, batch: List[dict]):
+        """
+        Inserts `batch`, bisecting it on non-transient errors. Returns the number of
+        rows written and the rows left to retry after a transient (connection) error.
+        """
+        written = 0
+        chunks = [batch]  # stack, next chunk last
+        while chunks:
+            chunk = chunks.pop()
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(Log).values(chunk))
+                    await session.commit()
+            except Exception as e:
+                if is_transient(e):
+                    self.failed_flushes += 1
+                    unwritten = chunk + [row for rest in reversed(chunks) for row in rest]
+                    logger.warning("Log flush failed, rows kept", extra={"rows": len(unwritten), "error": str(e)})
+                    return written, unwritten
+                if len(chunk) == 1:
+                    self.rejected += 1
+                    logger.warning(
+                        "Log row rejected, dropped",
+                        extra={"log_id": chunk[0]["id"], "log_event": chunk[0]["event"], "error": str(e)},
+                    )
+                    continue
+                mid = len(chunk) // 2
+                chunks.extend([chunk[mid:], chunk[:mid]])
+                continue
+            written += len(chunk)
+        return written, []
+
+    async def stop(self) -> None:
+        """Stops the background flusher and writes what is left in the buffer."""
+        task, self._task = self._task, None
+        if task is not None:
+            # let an in-flight batch finish instead of cancelling it mid-insert
+            self._stopping = True
+            self._wakeup.set()
+            await task
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+log_writer = LogWriter(
+    batch_size=app_settings.LOG_FLUSH_BATCH,
+    flush_interval_s=app_settings.LOG_FLUSH_INTERVAL_S,
+    max_buffer=app_settings.LOG_BUFFER_MAX,
+)
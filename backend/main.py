@@ -2,48 +2,53 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from datetime import datetime
+import logging
 import sys
-import traceback
 
 from api import health, tickers, forecast, models, logs, settings, pipeline
 from db_config import engine, Base, AsyncSessionLocal
 from database import init_db
 from config import settings as app_settings
+from log_writer import log_writer
+from retention import retention_job
+from model_registry import model_registry
+from instrumentation import InstrumentationMiddleware, configure_logging, instrument_engine, shutdown_logging
+
+configure_logging()
+instrument_engine(engine)
+logger = logging.getLogger("main")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Create tables and initialize database
-    print("🚀 Starting application...")
+    logger.info("Starting application", extra={"startup_mode": app_settings.STARTUP_MODE})
     try:
-        print("📊 Connecting to database...")
-        print(f"Database URL: {app_settings.DATABASE_URL[:50]}...")
-        
-        async with engine.begin() as conn:
-            print("✅ Database connection established")
-            print("📝 Creating tables...")
-            await conn.run_sync(Base.metadata.create_all)
-            print("✅ Tables created successfully")
-        
-        print("🔄 Initializing sample data...")
-        async with AsyncSessionLocal() as session:
-            await init_db(session)
-        
-        print("✅ Database initialized successfully!")
-        print("🎉 Application startup complete!")
+        if app_settings.is_production:
+            # no DB round trips at boot: the schema comes from `alembic upgrade head`
+            # and connections are opened by the first request
+            logger.info("Production startup: schema managed by Alembic, sample data skipped")
+        else:
+            async with engine.begin() as conn:
+                logger.info("Database connection established, creating tables")
+                await conn.run_sync(Base.metadata.create_all)
+            
+            async with AsyncSessionLocal() as session:
+                await init_db(session)
+            
+            logger.info("Database initialized")
+
+        log_writer.start()
+        if app_settings.RETENTION_ENABLED:
+            # replicas booting in production don't all start with a retention pass
+            retention_job.start(delay_s=retention_job.interval_s if app_settings.is_production else 0.0)
+        logger.info("Application startup complete")
         
     except Exception as e:
-        print(f"\n❌ Database connection failed!")
-        print(f"Error type: {type(e).__name__}")
-        print(f"Error message: {str(e)}")
-        print(f"\nFull traceback:")
-        traceback.print_exc()
-        print(f"\nDATABASE_URL: {app_settings.DATABASE_URL}")
-        print("\n⚠️ Please check:")
-        print("1. PostgreSQL/Railway database is accessible")
-        print("2. DATABASE_URL in .env is correct")
-        print("3. Database credentials are valid")
-        print("4. Network connection is stable")
-        print("5. Database server is not overloaded")
+        logger.exception(
+            "Database connection failed. Check that the database is reachable, DATABASE_URL in .env "
+            "is correct, the credentials are valid and the server is not overloaded",
+            extra={"error_type": type(e).__name__, "database_url": app_settings.DATABASE_URL[:50]},
+        )
         
         # Don't exit, let FastAPI handle it gracefully
         raise
@@ -51,12 +56,31 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown: cleanup
-    print("🛑 Shutting down application...")
+    logger.info("Shutting down application")
+    try:
+        # only loaded once a pipeline endpoint was used
+        pipeline_runner = sys.modules.get("pipeline_runner")
+        if pipeline_runner is not None:
+            pipeline_runner.shutdown_scheduler()
+            pipeline_runner.shutdown_kernel_pool()
+    except Exception:
+        logger.exception("Error stopping pipeline workers")
+    model_registry.shutdown()
+    try:
+        await retention_job.stop()
+    except Exception:
+        logger.exception("Error stopping retention job")
+    try:
+        await log_writer.stop()
+        logger.info("Log writer flushed", extra=log_writer.stats())
+    except Exception:
+        logger.exception("Error flushing logs")
     try:
         await engine.dispose()
-        print("✅ Database connections closed")
-    except Exception as e:
-        print(f"⚠️ Error during shutdown: {e}")
+        logger.info("Database connections closed")
+    except Exception:
+        logger.exception("Error during shutdown")
+    shutdown_logging()
 
 app = FastAPI(
     title="Stock Forecasting MLOps API",
@@ -73,6 +97,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# outermost: times the whole request, CORS included
+app.add_middleware(InstrumentationMiddleware)
 
 # Include routers
 app.include_router(health.router, prefix="/api", tags=["Health"])
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from config import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _inference():
+    # `forecasting` lives at the repo root (the notebooks' working directory); numpy,
+    # pandas and the model libraries are only imported once a forecast is requested
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from forecasting import inference
+
+    return inference
+
+
+class SingleFlight:
+    """Concurrent `do(key, fn)` calls with the same key share one in-flight `fn()`."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = asyncio.ensure_future(fn())
+            call.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+        # a disconnecting caller must not cancel the work the others are waiting for
+        return await asyncio.shield(call)
+
+    def _done(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            call.exception()  # retrieved here in case every caller went away
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class ModelRegistry:
+    """
+    Deployed models loaded on first use and kept in an LRU bounded by the total size
+    of their artifacts. Callers name the deployment: the ticker's deployed model and
+    a version that changes whenever the pipeline publishes a new fit; an entry is
+    reloaded when either changes. Loading and forecasting run on a small thread pool,
+    never on the event loop.
+    """
+
+    def __init__(self, *, root: Path, max_bytes: int, workers: int):
+        self.root = Path(root)
+        self.max_bytes = max(0, max_bytes)
+        self.workers = max(1, workers)
+        self._models: "OrderedDict[str, Tuple[Hashable, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._flights = SingleFlight()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    async def _run(self, fn, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def get(self, ticker: str, model: Optional[str] = None, version: Hashable = None):
+        """
+        `ticker`'s deployed `model` (the pipeline's pick when None) as of `version`;
+        FileNotFoundError when it has no artifact.
+        """
+        signature = (model, version)
+        entry = self._models.get(ticker)
+        if entry is not None and entry[0] == signature:
+            self._models.move_to_end(ticker)
+            self.hits += 1
+            return entry[1]
+
+        try:
+            deployed = await self._flights.do(
+                ("load", ticker, signature), lambda: self._run(_inference().load_deployed, self.root, ticker, model)
+            )
+        except FileNotFoundError:
+            self._drop(ticker)
+            raise
+        current = self._models.get(ticker)
+        if current is None or current[1] is not deployed:
+            self.reloads += current is not None
+            self.loads += 1
+            self._drop(ticker)
+            self._models[ticker] = (signature, deployed)
+            self._bytes += deployed.nbytes
+            self._evict()
+            logger.info("Model loaded", extra={"ticker": ticker, "model": deployed.model_type, "bytes": deployed.nbytes})
+        return deployed
+
+    async def forecast(self, ticker: str, days: int, model: Optional[str] = None, version: Hashable = None) -> dict:
+        """`days`-step forecast from the deployed model; concurrent identical requests share one computation."""
+        async def compute():
+            deployed = await self.get(ticker, model, version)
+            return await self._run(_inference().forecast, deployed, self.root, days)
+
+        return await self._flights.do(("forecast", ticker, days, model, version), compute)
+
+    def _drop(self, ticker: str) -> None:
+        entry = self._models.pop(ticker, None)
+        if entry is not None:
+            self._bytes -= entry[1].nbytes
+
+    def _evict(self) -> None:
+        # the most recently used model stays even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._models) > 1:
+            self._drop(next(iter(self._models)))
+            self.evictions += 1
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "models": len(self._models),
+            "tickers": list(self._models),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "loads": self.loads,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+            "in_flight": len(self._flights),
+            "coalesced": self._flights.coalesced,
+        }
+
+
+model_registry = ModelRegistry(
+    root=REPO_ROOT,
+    max_bytes=int(app_settings.MODEL_REGISTRY_MAX_MB * 1024 * 1024),
+    workers=app_settings.MODEL_INFERENCE_WORKERS,
+)
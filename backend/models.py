@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Integer, Boolean, JSON, ForeignKey, Text
+from sqlalchemy import Column, String, Float, Date, DateTime, Integer, Boolean, JSON, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from db_config import Base
@@ -14,10 +14,14 @@ class Ticker(Base):
     last_trained_at = Column(DateTime, nullable=True)
     drift_score = Column(Float, nullable=True)
     accuracy = Column(Float, nullable=True)
+    # forecast_versions.id whose points/models the API serves; switched in the same
+    # transaction that writes a new version (no FK: it would make the two tables circular)
+    current_forecast_version_id = Column(Integer, nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     models = relationship("Model", back_populates="ticker_rel", cascade="all, delete-orphan")
+    forecast_versions = relationship("ForecastVersion", back_populates="ticker_rel", cascade="all, delete-orphan")
     forecasts = relationship("ForecastPoint", back_populates="ticker_rel", cascade="all, delete-orphan")
     logs = relationship("Log", back_populates="ticker_rel", cascade="all, delete-orphan")
     pipeline_runs = relationship("PipelineRun", back_populates="ticker_rel", cascade="all, delete-orphan")
@@ -26,7 +30,8 @@ class Model(Base):
     __tablename__ = "models"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    ticker = Column(String(10), ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False)
+    ticker = Column(String(10), ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False, index=True)
+    version_id = Column(Integer, ForeignKey("forecast_versions.id", ondelete="CASCADE"), nullable=True, index=True)
     model = Column(String(50), nullable=False)
     mae = Column(Float, nullable=False)
     rmse = Column(Float, nullable=False)
@@ -39,12 +44,33 @@ class Model(Base):
     # Relationships
     ticker_rel = relationship("Ticker", back_populates="models")
 
+class ForecastVersion(Base):
+    __tablename__ = "forecast_versions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ticker = Column(String(10), ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False, index=True)
+    source = Column(String(20), default="pipeline")  # pipeline | seed | legacy
+    model = Column(String(50), nullable=True)        # winning model of the run
+    trained_at = Column(DateTime, nullable=True)
+    n_points = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    ticker_rel = relationship("Ticker", back_populates="forecast_versions")
+
 class ForecastPoint(Base):
     __tablename__ = "forecast_points"
+    # forecast reads: one version ordered by date; retention scans: (ticker,) date < cutoff
+    __table_args__ = (
+        Index("ix_forecast_points_version_date", "version_id", "date"),
+        Index("ix_forecast_points_ticker_date", "ticker", "date"),
+        Index("ix_forecast_points_date", "date"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     ticker = Column(String(10), ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False)
-    date = Column(String(20), nullable=False)
+    version_id = Column(Integer, ForeignKey("forecast_versions.id", ondelete="CASCADE"), nullable=True)
+    date = Column(Date, nullable=False)
     actual = Column(Float, nullable=True)
     predicted = Column(Float, nullable=False)
     lower = Column(Float, nullable=True)
@@ -56,10 +82,16 @@ class ForecastPoint(Base):
 
 class Log(Base):
     __tablename__ = "logs"
+    # keyset pages ordered by (timestamp, id) DESC, optionally filtered by ticker or event
+    __table_args__ = (
+        Index("ix_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_logs_ticker_timestamp_id", "ticker", "timestamp", "id"),
+        Index("ix_logs_event_timestamp_id", "event", "timestamp", "id"),
+    )
     
     id = Column(String(50), primary_key=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    ticker = Column(String(10), ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False, index=True)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+    ticker = Column(String(10), ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False)
     event = Column(String(100), nullable=False)
     status = Column(String(20), nullable=False)
     message = Column(Text, nullable=False)
@@ -76,20 +108,23 @@ class Settings(Base):
     drift_threshold = Column(Float, default=0.2)
     enable_auto_deploy = Column(Boolean, default=True)
     slack_webhook_url = Column(String(500), default="")
-    candidate_models = Column(JSON, default=["LSTM", "GRU", "Transformer", "XGBoost"])
+    candidate_models = Column(JSON, default=["ARIMA", "Prophet", "LSTM"])
     exchanges_enabled = Column(JSON, default=["NYSE", "NASDAQ"])
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class PipelineRun(Base):
     __tablename__ = "pipeline_runs"
+    # retention: finished runs not updated since the cutoff
+    __table_args__ = (Index("ix_pipeline_runs_updated_at", "updated_at"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     ticker = Column(String(10), ForeignKey("tickers.ticker", ondelete="CASCADE"), nullable=False, index=True)
 
     status = Column(String(20), default="running")  # running | success | error
-    stage = Column(String(50), default="queued")    # queued | eda | experiments | finalize
+    stage = Column(String(50), default="queued")    # queued | ingest | validate | features | train_<model> | select | finalize (notebook mode: eda | experiments)
     progress = Column(Float, default=0.0)           # 0..100
     message = Column(Text, default="")
+    stage_cache = Column(JSON, nullable=True)       # script mode: stage -> "hit" | "ran" | "error" | "timeout"
 
     started_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
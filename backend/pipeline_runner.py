@@ -1,12 +1,45 @@
-import os
+import sys
+import time
+import logging
+import queue
 import asyncio
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache import invalidate_ticker
+from config import settings as app_settings
+from events import EventRelay, set_forward_queue
 from db_config import AsyncSessionLocal
 from database import update_pipeline_run, finalize_ticker_from_metadata
+from database import create_pipeline_run, get_pipeline_run, get_settings, get_ticker
+from models import PipelineRun
+
+logger = logging.getLogger(__name__)
+
+
+_PRELOAD_CODE = """\
+import importlib
+for _name in {modules!r}:
+    try:
+        importlib.import_module(_name)
+    except Exception:
+        pass
+"""
+
+_RESET_CODE = "%reset -f"
 
 
-def _exec_notebook(notebook_path: Path, *, cwd: Path, env: dict, timeout_s: int = 1800) -> None:
+def _notebook_deps():
     # Lazy import so server doesn't crash at startup if deps aren't installed yet
     try:
         import nbformat  # type: ignore
@@ -15,29 +48,387 @@ def _exec_notebook(notebook_path: Path, *, cwd: Path, env: dict, timeout_s: int
         raise RuntimeError(
             "Notebook execution dependencies missing. Install backend requirements (nbformat, nbclient)."
         ) from e
+    return nbformat, NotebookClient
 
-    nb = nbformat.read(str(notebook_path), as_version=4)
-    old_env = os.environ.copy()
+
+def _run_on_kernel(km, nb, *, cwd: Path, timeout_s: int) -> None:
+    """Executes `nb` on an already managed kernel without shutting it down afterwards."""
+    _, NotebookClient = _notebook_deps()
+    client = NotebookClient(
+        nb,
+        km=km,
+        timeout=timeout_s,
+        kernel_name="python3",
+        resources={"metadata": {"path": str(cwd)}},
+    )
     try:
-        os.environ.update(env)
-        client = NotebookClient(
-            nb,
-            timeout=timeout_s,
-            kernel_name="python3",
-            resources={"metadata": {"path": str(cwd)}},
-        )
-        client.execute()
+        client.execute(cleanup_kc=False)
     finally:
-        os.environ.clear()
-        os.environ.update(old_env)
+        if client.kc is not None:
+            client.kc.stop_channels()
+
+
+class PooledKernel:
+    def __init__(self, km):
+        self.km = km
+        self.runs = 0
+
+
+class KernelPool:
+    """
+    Fixed-size pool of pre-warmed `python3` kernels for notebook execution.
+
+    Kernels are started lazily (up to `size`), warmed with the heavy imports the
+    notebooks need, reset between runs and recycled after `max_runs` runs.
+    """
+
+    def __init__(self, size: int, *, cwd: Path, max_runs: int = 20, preload: Optional[List[str]] = None):
+        self.size = size
+        self.cwd = cwd
+        self.max_runs = max(1, max_runs)
+        self.preload = list(preload or [])
+
+        self._idle: "queue.LifoQueue[PooledKernel]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+
+    def _start_kernel(self) -> PooledKernel:
+        nbformat, _ = _notebook_deps()
+        from jupyter_client.manager import AsyncKernelManager  # type: ignore
+
+        km = AsyncKernelManager(kernel_name="python3")
+        warmup = nbformat.v4.new_notebook(
+            cells=[nbformat.v4.new_code_cell(_PRELOAD_CODE.format(modules=self.preload))]
+        )
+        # starts the kernel in `cwd` and keeps it alive for later runs
+        _run_on_kernel(km, warmup, cwd=self.cwd, timeout_s=600)
+        return PooledKernel(km)
+
+    def _shutdown_kernel(self, kernel: PooledKernel) -> None:
+        from jupyter_core.utils import run_sync  # type: ignore
+
+        try:
+            run_sync(kernel.km.shutdown_kernel)(now=True)
+        except Exception:
+            pass
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledKernel:
+        """Returns an idle kernel, starting a new one while the pool is below `size`."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Kernel pool is shut down")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            start_new = self._started < self.size
+            if start_new:
+                self._started += 1
+
+        if start_new:
+            try:
+                return self._start_kernel()
+            except Exception:
+                with self._lock:
+                    self._started -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty as e:
+            raise TimeoutError("Timed out waiting for a notebook kernel") from e
+
+    def release(self, kernel: PooledKernel) -> None:
+        """Resets the kernel namespace and returns it to the pool (or recycles it)."""
+        from jupyter_core.utils import run_sync  # type: ignore
+
+        kernel.runs += 1
+        recycle = self._closed or kernel.runs >= self.max_runs
+        if not recycle:
+            try:
+                recycle = not run_sync(kernel.km.is_alive)()
+                if not recycle:
+                    nbformat, _ = _notebook_deps()
+                    reset = nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell(_RESET_CODE)])
+                    _run_on_kernel(kernel.km, reset, cwd=self.cwd, timeout_s=60)
+            except Exception:
+                recycle = True
+
+        if recycle:
+            self._shutdown_kernel(kernel)
+            with self._lock:
+                self._started -= 1
+            return
+
+        self._idle.put(kernel)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        kernel = self.checkout(timeout)
+        try:
+            yield kernel
+        finally:
+            self.release(kernel)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                kernel = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._shutdown_kernel(kernel)
+            with self._lock:
+                self._started -= 1
+
+
+_kernel_pool: Optional[KernelPool] = None
+_kernel_pool_lock = threading.Lock()
+
+
+def get_kernel_pool() -> Optional[KernelPool]:
+    """Process-wide kernel pool, or None when pooling is disabled (size 0)."""
+    global _kernel_pool
+    if app_settings.NOTEBOOK_KERNEL_POOL_SIZE <= 0:
+        return None
+    with _kernel_pool_lock:
+        if _kernel_pool is None:
+            _kernel_pool = KernelPool(
+                app_settings.NOTEBOOK_KERNEL_POOL_SIZE,
+                cwd=Path(__file__).resolve().parents[1],
+                max_runs=app_settings.NOTEBOOK_KERNEL_MAX_RUNS,
+                preload=app_settings.notebook_kernel_preload_list,
+            )
+        return _kernel_pool
+
+
+def shutdown_kernel_pool() -> None:
+    global _kernel_pool
+    with _kernel_pool_lock:
+        pool, _kernel_pool = _kernel_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _inject_parameters(nbformat, nb, parameters: dict) -> None:
+    """
+    Inserts an `injected-parameters` cell right after the notebook's `parameters`
+    cell, so each run gets its own values without touching any process env.
+    """
+    lines = ["# Parameters (injected by backend/runner)"]
+    lines += [f"{name} = {value!r}" for name, value in parameters.items()]
+    cell = nbformat.v4.new_code_cell("\n".join(lines))
+    cell.metadata["tags"] = ["injected-parameters"]
+
+    position = 0
+    for i, existing in enumerate(nb.cells):
+        if "parameters" in existing.get("metadata", {}).get("tags", []):
+            position = i + 1
+            break
+    nb.cells.insert(position, cell)
+
+
+def _exec_notebook(
+    notebook_path: Path,
+    *,
+    cwd: Path,
+    parameters: dict,
+    timeout_s: int = 1800,
+    kernel: Optional[PooledKernel] = None,
+) -> None:
+    nbformat, NotebookClient = _notebook_deps()
+
+    nb = nbformat.read(str(notebook_path), as_version=4)
+    _inject_parameters(nbformat, nb, parameters)
+
+    if kernel is not None:
+        _run_on_kernel(kernel.km, nb, cwd=cwd, timeout_s=timeout_s)
+        return
+
+    client = NotebookClient(
+        nb,
+        timeout=timeout_s,
+        kernel_name="python3",
+        resources={"metadata": {"path": str(cwd)}},
+    )
+    client.execute()
+
+
+def _completed(version_id: Optional[int]) -> str:
+    return f"Completed (forecast version {version_id})" if version_id else "Completed"
+
+
+def script_mode() -> bool:
+    """Stages run as `forecasting` functions in the worker process unless PIPELINE_MODE is "notebook"."""
+    return app_settings.PIPELINE_MODE.strip().lower() != "notebook"
+
+
+def _use_repo_root(repo_root: Path) -> None:
+    # the notebooks import `forecasting` from the repo root (their cwd)
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+
+_STAGE_PROGRESS = {"ingest": 5.0, "validate": 15.0, "features": 25.0, "select": 80.0, "finalize": 90.0}
+_STAGE_VERBS = {"running": "Running", "hit": "Cached", "ran": "Finished", "error": "Failed", "timeout": "Timed out"}
+
+
+def _stage_progress(stage: str, candidates: Sequence[str], stage_cache: Dict[str, str]) -> float:
+    # the train_<model> stages run side by side and share 35..75 as they finish
+    if stage.startswith("train_"):
+        finished = sum(1 for name in stage_cache if name.startswith("train_"))
+        return 35.0 + 40.0 * finished / max(1, len(candidates))
+    return _STAGE_PROGRESS.get(stage, 0.0)
+
+
+_candidate_pool = None
+_candidate_pool_lock = threading.Lock()
+
+
+def get_candidate_pool():
+    """Process-wide candidate worker pool (one warm process per model type), or None when disabled."""
+    global _candidate_pool
+    if not app_settings.CANDIDATE_PARALLEL:
+        return None
+    with _candidate_pool_lock:
+        if _candidate_pool is None:
+            from forecasting.candidates import CandidatePool
+
+            _candidate_pool = CandidatePool()
+        return _candidate_pool
+
+
+def shutdown_candidate_pool() -> None:
+    global _candidate_pool
+    with _candidate_pool_lock:
+        pool, _candidate_pool = _candidate_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+# full refits of an incremental retrain follow the `retrain_frequency` setting
+_FULL_REFIT_DAYS = {"daily": 1, "weekly": 7, "bi-weekly": 14, "monthly": 30}
+
+
+# the seeded `candidate_models` before ARIMA/Prophet/LSTM (alembic 0004 rewrites it); only LSTM was trainable
+_LEGACY_CANDIDATE_MODELS = {"lstm", "gru", "transformer", "xgboost"}
+
+
+def _candidate_models(settings, all_candidates: Sequence[str]) -> List[str]:
+    """The trainable models named by the `candidate_models` setting (all of them when it names none)."""
+    wanted = {str(m).strip().lower() for m in (settings.candidate_models if settings else None) or []}
+    if wanted == _LEGACY_CANDIDATE_MODELS:
+        logger.warning(
+            "candidate_models is the old default; training all (run `alembic upgrade head` to update it)",
+            extra={"candidate_models": sorted(wanted), "trainable": list(all_candidates)},
+        )
+        return list(all_candidates)
+    unknown = sorted(wanted - {m.lower() for m in all_candidates})
+    if unknown:
+        logger.warning("Ignoring untrainable candidate_models", extra={"ignored": unknown})
+    chosen = [m for m in all_candidates if m.lower() in wanted]
+    if not chosen:
+        logger.warning(
+            "No trainable model in candidate_models; training all",
+            extra={"candidate_models": sorted(wanted), "trainable": list(all_candidates)},
+        )
+        return list(all_candidates)
+    return chosen
+
+
+async def _retrain_options(dag) -> dict:
+    """run_pipeline arguments that come from the settings row: candidates and the retrain policy."""
+    async with AsyncSessionLocal() as s:
+        settings = await get_settings(s)
+    frequency = (settings.retrain_frequency if settings else None) or ""
+    drift_threshold = settings.drift_threshold if settings and settings.drift_threshold is not None else None
+    return {
+        "candidates": _candidate_models(settings, dag.CANDIDATES),
+        "retrain": "full" if app_settings.RETRAIN_MODE.strip().lower() == "full" else "incremental",
+        "full_refit_days": _FULL_REFIT_DAYS.get(frequency.strip().lower(), dag.FULL_REFIT_DAYS),
+        "drift_threshold": dag.DRIFT_THRESHOLD if drift_threshold is None else drift_threshold,
+    }
+
+
+async def _run_stage_dag(ticker: str, run_id: int, repo_root: Path, *, lstm_cache=None) -> None:
+    """
+    Script mode: runs the ticker's stage DAG (`forecasting.dag`) and then finalize.
+    Each stage's outcome lands in the run's `stage_cache`; finalize is a hit when the
+    selected artifacts are unchanged and their forecast version is still current.
+    """
+    _use_repo_root(repo_root)
+    from forecasting import dag
+    from forecasting.candidates import Budget
+
+    options = await _retrain_options(dag)
+    candidates = options["candidates"]
+    budgets = {model: Budget(*app_settings.candidate_budget(model)) for model in candidates}
+    use_cache = app_settings.PIPELINE_STAGE_CACHE
+    stage_cache: Dict[str, str] = {}
+    loop = asyncio.get_running_loop()
+
+    async def record(stage: str, status: str) -> None:
+        if status != "running":
+            stage_cache[stage] = status
+        async with AsyncSessionLocal() as s:
+            await update_pipeline_run(
+                s, run_id, status="running", stage=stage, progress=_stage_progress(stage, candidates, stage_cache),
+                message=f"{_STAGE_VERBS[status]} {stage}", stage_cache=stage_cache,
+            )
+
+    def on_stage(stage: str, status: str) -> None:
+        # called from the DAG's thread
+        asyncio.run_coroutine_threadsafe(record(stage, status), loop).result()
+
+    await asyncio.to_thread(
+        dag.run_pipeline, ticker, repo_root,
+        **options,
+        lstm_cache=lstm_cache,
+        ingest_refresh_s=app_settings.PIPELINE_INGEST_REFRESH_S,
+        use_cache=use_cache,
+        on_stage=on_stage,
+        pool=get_candidate_pool(),
+        parallel=app_settings.CANDIDATE_PARALLEL,
+        budgets=budgets,
+    )
+
+    store = dag.StageStore(repo_root, ticker)
+    fp = dag.fingerprint({"select": store.outputs_fingerprint("select")})
+    manifest = store.lookup("finalize", fp) if use_cache else None
+    async with AsyncSessionLocal() as s:
+        row = await get_ticker(s, ticker)
+        current = row.current_forecast_version_id if row is not None else None
+
+    if manifest is not None and current is not None and manifest["result"].get("version_id") == current:
+        version_id = current
+        await record("finalize", "hit")
+    else:
+        await record("finalize", "running")
+        try:
+            async with AsyncSessionLocal() as s:
+                version_id = await finalize_ticker_from_metadata(s, ticker, repo_root)
+        except Exception:
+            await record("finalize", "error")
+            raise
+        store.record("finalize", fp, [], {"version_id": version_id})
+        stage_cache["finalize"] = "ran"
+
+    async with AsyncSessionLocal() as s:
+        await update_pipeline_run(
+            s, run_id, status="success", stage="done", progress=100.0,
+            message=_completed(version_id), stage_cache=stage_cache,
+        )
 
 
 async def run_ticker_pipeline(ticker: str, run_id: int) -> None:
     repo_root = Path(__file__).resolve().parents[1]
     nb1 = repo_root / "notebooks" / "01_EDA_Preprocessing.ipynb"
     nb2 = repo_root / "notebooks" / "02_Model_Experiments.ipynb"
+    scripted = script_mode()
 
-    if not nb1.exists() or not nb2.exists():
+    if not scripted and (not nb1.exists() or not nb2.exists()):
         async with AsyncSessionLocal() as s:
             await update_pipeline_run(
                 s, run_id, status="error", stage="queued", progress=0.0,
@@ -45,23 +436,32 @@ async def run_ticker_pipeline(ticker: str, run_id: int) -> None:
             )
         return
 
-    env = {"TICKER": ticker}
+    parameters = {"TICKER": ticker}
+    pool = None if scripted else get_kernel_pool()
+    kernel = None
 
     try:
+        if scripted:
+            await _run_stage_dag(ticker, run_id, repo_root)
+            return
+
+        if pool is not None:
+            kernel = await asyncio.to_thread(pool.checkout)
+
         async with AsyncSessionLocal() as s:
             await update_pipeline_run(s, run_id, status="running", stage="eda", progress=5.0, message="Running EDA/Preprocessing")
 
-        await asyncio.to_thread(_exec_notebook, nb1, cwd=repo_root, env=env)
+        await asyncio.to_thread(_exec_notebook, nb1, cwd=repo_root, parameters=parameters, kernel=kernel)
 
         async with AsyncSessionLocal() as s:
             await update_pipeline_run(s, run_id, status="running", stage="experiments", progress=55.0, message="Running Model Experiments")
 
-        await asyncio.to_thread(_exec_notebook, nb2, cwd=repo_root, env=env)
+        await asyncio.to_thread(_exec_notebook, nb2, cwd=repo_root, parameters=parameters, kernel=kernel)
 
         async with AsyncSessionLocal() as s:
             await update_pipeline_run(s, run_id, status="running", stage="finalize", progress=90.0, message="Finalizing artifacts")
-            await finalize_ticker_from_metadata(s, ticker)
-            await update_pipeline_run(s, run_id, status="success", stage="done", progress=100.0, message="Completed")
+            version_id = await finalize_ticker_from_metadata(s, ticker)
+            await update_pipeline_run(s, run_id, status="success", stage="done", progress=100.0, message=_completed(version_id))
 
     except Exception as e:
         async with AsyncSessionLocal() as s:
@@ -69,7 +469,450 @@ async def run_ticker_pipeline(ticker: str, run_id: int) -> None:
                 s, run_id, status="error", stage="error", progress=100.0,
                 message="Failed", error=str(e)
             )
+    finally:
+        if kernel is not None:
+            await asyncio.to_thread(pool.release, kernel)
 
 
 def run_ticker_pipeline_sync(ticker: str, run_id: int) -> None:
     asyncio.run(run_ticker_pipeline(ticker, run_id))
+
+
+async def run_batch_pipeline(runs: Dict[str, int]) -> None:
+    """
+    Runs the pipeline for many tickers in one worker process.
+
+    In script mode each ticker runs its stage DAG in turn; the candidate worker
+    processes (or, with CANDIDATE_PARALLEL off, one LSTM model cache) are shared. In notebook mode notebook 01 runs per ticker on one pooled kernel;
+    model experiments then run in-process via `forecasting.experiments.run_batch`.
+    Either way TensorFlow/statsmodels are imported once and the compiled LSTM
+    graphs are reused between tickers. Artifacts and experiment logs are written
+    per ticker exactly like notebook 02 does.
+    """
+    repo_root = Path(__file__).resolve().parents[1]
+    nb1 = repo_root / "notebooks" / "01_EDA_Preprocessing.ipynb"
+    scripted = script_mode()
+
+    async def fail(run_id: int, stage: str, message: str, error: str) -> None:
+        async with AsyncSessionLocal() as s:
+            await update_pipeline_run(
+                s, run_id, status="error", stage=stage, progress=100.0, message=message, error=error
+            )
+
+    if scripted:
+        _use_repo_root(repo_root)
+        from forecasting.experiments import LSTMModelCache
+
+        lstm_cache = LSTMModelCache()
+        for ticker, run_id in runs.items():
+            try:
+                await _run_stage_dag(ticker, run_id, repo_root, lstm_cache=lstm_cache)
+            except Exception as e:
+                await fail(run_id, "error", "Failed", str(e))
+        return
+
+    if not nb1.exists():
+        for run_id in runs.values():
+            await fail(run_id, "queued", "Notebook(s) missing", f"Missing: {nb1}")
+        return
+
+    pool = get_kernel_pool()
+    kernel = None
+    preprocessed: List[str] = []
+
+    try:
+        if pool is not None:
+            kernel = await asyncio.to_thread(pool.checkout)
+
+        for ticker, run_id in runs.items():
+            async with AsyncSessionLocal() as s:
+                await update_pipeline_run(s, run_id, status="running", stage="eda", progress=5.0, message="Running EDA/Preprocessing")
+            try:
+                await asyncio.to_thread(_exec_notebook, nb1, cwd=repo_root, parameters={"TICKER": ticker}, kernel=kernel)
+            except Exception as e:
+                await fail(run_id, "error", "Failed", str(e))
+                continue
+            preprocessed.append(ticker)
+    except Exception as e:
+        for ticker, run_id in runs.items():
+            if ticker not in preprocessed:
+                await fail(run_id, "error", "Failed", str(e))
+    finally:
+        if kernel is not None:
+            await asyncio.to_thread(pool.release, kernel)
+
+    if not preprocessed:
+        return
+
+    for ticker in preprocessed:
+        async with AsyncSessionLocal() as s:
+            await update_pipeline_run(
+                s, runs[ticker], status="running", stage="experiments", progress=55.0,
+                message=f"Running Model Experiments (batch of {len(preprocessed)})"
+            )
+
+    async def finish(ticker: str, error: Optional[Exception]) -> None:
+        run_id = runs[ticker]
+        if error is not None:
+            await fail(run_id, "error", "Failed", str(error))
+            return
+        async with AsyncSessionLocal() as s:
+            await update_pipeline_run(s, run_id, status="running", stage="finalize", progress=90.0, message="Finalizing artifacts")
+            version_id = await finalize_ticker_from_metadata(s, ticker)
+            await update_pipeline_run(s, run_id, status="success", stage="done", progress=100.0, message=_completed(version_id))
+
+    loop = asyncio.get_running_loop()
+
+    def on_done(ticker: str, experiment_log: Optional[dict], error: Optional[Exception]) -> None:
+        # called from the experiments thread; record each ticker as soon as it's done
+        asyncio.run_coroutine_threadsafe(finish(ticker, error), loop).result()
+
+    try:
+        _use_repo_root(repo_root)
+        from forecasting.experiments import run_batch
+
+        await asyncio.to_thread(run_batch, preprocessed, repo_root, on_done=on_done)
+    except Exception as e:
+        for ticker in preprocessed:
+            async with AsyncSessionLocal() as s:
+                run = await get_pipeline_run(s, runs[ticker])
+            if run is not None and run.status == "running":
+                await fail(runs[ticker], "error", "Failed", str(e))
+
+
+def run_batch_pipeline_sync(runs: Dict[str, int]) -> None:
+    asyncio.run(run_batch_pipeline(runs))
+
+
+async def fail_pipeline_runs(runs: Dict[str, int], message: str, error: str) -> None:
+    """Marks the runs of `runs` (ticker -> run id) that are still running as failed."""
+    async with AsyncSessionLocal() as s:
+        for run_id in runs.values():
+            run = await get_pipeline_run(s, run_id)
+            if run is not None and run.status == "running":
+                await update_pipeline_run(
+                    s, run_id, status="error", stage="error", progress=100.0, message=message, error=error
+                )
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class PipelineJob:
+    """One scheduled unit of work: a single ticker or a batch (`runs` maps ticker -> run id)."""
+
+    def __init__(self, runs: Dict[str, int]):
+        self.runs = dict(runs)
+        self.enqueued_at = time.monotonic()
+        self.queued_at_utc = datetime.utcnow()
+        self.started_at: Optional[float] = None
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.runs)
+
+    @property
+    def is_batch(self) -> bool:
+        return len(self.runs) > 1
+
+    @property
+    def wait_s(self) -> float:
+        end = self.started_at if self.started_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+
+def _init_pipeline_worker(event_queue=None) -> None:
+    # Worker processes exit via os._exit, so atexit hooks never run: use a
+    # multiprocessing finalizer to stop the worker's warm kernels and candidate processes.
+    from multiprocessing.util import Finalize
+
+    Finalize(None, shutdown_kernel_pool, exitpriority=10)
+    Finalize(None, shutdown_candidate_pool, exitpriority=10)
+    # run updates written here are streamed by the API process (see events.py)
+    set_forward_queue(event_queue)
+
+
+class PipelineScheduler:
+    """
+    Bounded pipeline job queue backed by a process pool.
+
+    At most `max_parallel` jobs execute at once (each in its own worker process),
+    at most `max_queue` wait behind them, and a ticker can only have one queued or
+    running job at a time. A batch job covers many tickers but takes one slot.
+    """
+
+    def __init__(self, max_parallel: int, max_queue: int):
+        self.max_parallel = max(1, max_parallel)
+        self.max_queue = max(0, max_queue)
+
+        self._lock = threading.RLock()
+        self._pending: Deque[PipelineJob] = deque()
+        self._running: Dict[str, PipelineJob] = {}  # ticker -> job (batch jobs appear once per ticker)
+        self._running_jobs = 0
+        self._recent_waits: Deque[float] = deque(maxlen=100)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._relay: Optional[EventRelay] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # the API's loop, for run updates from callbacks
+        self._closed = False
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            ctx = multiprocessing.get_context("spawn")
+            event_queue = ctx.Queue()
+            self._relay = EventRelay(event_queue)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_parallel,
+                mp_context=ctx,
+                initializer=_init_pipeline_worker,
+                initargs=(event_queue,),
+            )
+        return self._executor
+
+    def active_job(self, ticker: str) -> Optional[PipelineJob]:
+        with self._lock:
+            job = self._running.get(ticker)
+            if job is not None:
+                return job
+            for job in self._pending:
+                if ticker in job.runs:
+                    return job
+        return None
+
+    def is_full(self) -> bool:
+        with self._lock:
+            return len(self._pending) >= self.max_queue and self._running_jobs >= self.max_parallel
+
+    def submit(self, ticker: str, run_id: int) -> PipelineJob:
+        """Queues a run; returns the already active job instead if the ticker has one."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Pipeline scheduler is shut down")
+            existing = self.active_job(ticker)
+            if existing is not None:
+                return existing
+            if self.is_full():
+                raise QueueFullError(f"Pipeline queue is full ({self.max_queue} waiting)")
+
+            job = PipelineJob({ticker: run_id})
+            self._remember_loop()
+            self._pending.append(job)
+            self._dispatch()
+            return job
+
+    def submit_batch(self, runs: Dict[str, int]) -> PipelineJob:
+        """Queues one job for all of `runs`; callers coalesce tickers that already have a job first."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Pipeline scheduler is shut down")
+            active = [ticker for ticker in runs if self.active_job(ticker) is not None]
+            if active:
+                raise ValueError(f"Tickers already queued or running: {', '.join(active)}")
+            if self.is_full():
+                raise QueueFullError(f"Pipeline queue is full ({self.max_queue} waiting)")
+
+            job = PipelineJob(runs)
+            self._remember_loop()
+            self._pending.append(job)
+            self._dispatch()
+            return job
+
+    def _reset_executor(self) -> None:
+        # a worker died (e.g. OOM-killed): the pool is unusable, start a fresh one on next use
+        with self._lock:
+            executor, self._executor = self._executor, None
+            relay, self._relay = self._relay, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if relay is not None:
+            relay.stop()
+
+    def _submit_job(self, job: PipelineJob) -> Future:
+        if job.is_batch:
+            return self._get_executor().submit(run_batch_pipeline_sync, job.runs)
+        (ticker, run_id), = job.runs.items()
+        return self._get_executor().submit(run_ticker_pipeline_sync, ticker, run_id)
+
+    def _remember_loop(self) -> None:
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+    def _fail_job(self, job: PipelineJob, message: str, error: str) -> None:
+        """Records a job the worker never finished as failed (from any thread, without blocking)."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.error("No event loop to record failed runs", extra={"runs": list(job.runs.values())})
+            return
+
+        def logged(done: Future) -> None:
+            if not done.cancelled() and done.exception() is not None:
+                logger.error("Failed runs not recorded", extra={"runs": list(job.runs.values()), "error": str(done.exception())})
+
+        asyncio.run_coroutine_threadsafe(fail_pipeline_runs(job.runs, message, error), loop).add_done_callback(logged)
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            while self._pending and self._running_jobs < self.max_parallel:
+                job = self._pending.popleft()
+                try:
+                    future = self._submit_job(job)
+                except BrokenProcessPool:
+                    logger.warning("Pipeline worker pool broken, restarting it", extra={"tickers": job.tickers})
+                    self._reset_executor()
+                    try:
+                        future = self._submit_job(job)
+                    except Exception as e:
+                        self._not_started(job, e)
+                        continue
+                except Exception as e:
+                    self._not_started(job, e)
+                    continue
+                job.started_at = time.monotonic()
+                self._recent_waits.append(job.wait_s)
+                self._running_jobs += 1
+                for ticker in job.runs:
+                    self._running[ticker] = job
+                future.add_done_callback(partial(self._on_done, job))
+
+    def _not_started(self, job: PipelineJob, error: Exception) -> None:
+        # nothing would dispatch it again on an idle scheduler: fail its runs instead of leaving them queued
+        logger.error("Pipeline job could not be started", extra={"tickers": job.tickers, "error": str(error)})
+        self._fail_job(job, "Could not start", f"{type(error).__name__}: {error}")
+
+    def _on_done(self, job: PipelineJob, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            error = future.exception()
+            logger.error(
+                "Pipeline worker crashed",
+                extra={"tickers": list(job.tickers), "runs": list(job.runs.values()), "error": str(error)},
+            )
+            # the worker died before recording an outcome (OOM kill, segfault): its runs would stay "running"
+            self._fail_job(job, "Worker crashed", f"{type(error).__name__}: {error}")
+        # runs finalize in the worker process; drop this process's cached responses too
+        for ticker in job.runs:
+            invalidate_ticker(ticker)
+        with self._lock:
+            self._running_jobs -= 1
+            for ticker in job.runs:
+                if self._running.get(ticker) is job:
+                    del self._running[ticker]
+            if not self._closed:
+                self._dispatch()
+
+    def status(self, ticker: Optional[str] = None) -> dict:
+        with self._lock:
+            waits = list(self._recent_waits)
+            out = {
+                "queue_depth": len(self._pending),
+                "running": self._running_jobs,
+                "running_tickers": len(self._running),
+                "max_parallel": self.max_parallel,
+                "max_queue": self.max_queue,
+                "avg_wait_s": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            }
+            if ticker is not None:
+                job = self._running.get(ticker)
+                position = None
+                if job is None:
+                    for i, pending in enumerate(self._pending):
+                        if ticker in pending.runs:
+                            job, position = pending, i + 1
+                            break
+                out["state"] = None if job is None else ("running" if position is None else "queued")
+                out["position"] = position
+                out["wait_s"] = round(job.wait_s, 3) if job is not None else None
+                out["batch_size"] = len(job.runs) if job is not None else None
+            return out
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            executor, self._executor = self._executor, None
+            relay, self._relay = self._relay, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if relay is not None:
+            relay.stop()
+
+
+_scheduler: Optional[PipelineScheduler] = None
+_scheduler_lock = threading.Lock()
+_enqueue_lock = asyncio.Lock()
+
+
+def get_scheduler() -> PipelineScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PipelineScheduler(
+                app_settings.PIPELINE_MAX_PARALLEL,
+                app_settings.PIPELINE_MAX_QUEUE,
+            )
+        return _scheduler
+
+
+def shutdown_scheduler() -> None:
+    global _scheduler
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.shutdown()
+
+
+async def enqueue_pipeline_run(session: AsyncSession, ticker: str) -> Tuple[PipelineRun, bool]:
+    """
+    Creates and queues a pipeline run for `ticker`.
+
+    Returns `(run, coalesced)`; when the ticker already has a queued or running
+    job, that job's existing `PipelineRun` is returned and nothing new is queued.
+    Raises `QueueFullError` when the queue has no room.
+    """
+    scheduler = get_scheduler()
+    async with _enqueue_lock:
+        job = scheduler.active_job(ticker)
+        if job is not None:
+            run = await get_pipeline_run(session, job.runs[ticker])
+            if run is not None:
+                return run, True
+
+        if scheduler.is_full():
+            raise QueueFullError(f"Pipeline queue is full ({scheduler.max_queue} waiting)")
+
+        run = await create_pipeline_run(session, ticker)
+        scheduler.submit(ticker, run.id)
+        return run, False
+
+
+async def enqueue_pipeline_batch(session: AsyncSession, tickers: Sequence[str]) -> List[Tuple[PipelineRun, bool]]:
+    """
+    Creates pipeline runs for `tickers` and queues them as one batch job.
+
+    Returns `(run, coalesced)` per ticker, in input order. Tickers that already
+    have a queued or running job keep it (coalesced); the rest share a single new
+    job. Raises `QueueFullError` when the queue has no room.
+    """
+    scheduler = get_scheduler()
+    async with _enqueue_lock:
+        results: Dict[str, Tuple[PipelineRun, bool]] = {}
+        for ticker in tickers:
+            job = scheduler.active_job(ticker)
+            if job is not None:
+                run = await get_pipeline_run(session, job.runs[ticker])
+                if run is not None:
+                    results[ticker] = (run, True)
+
+        fresh = [ticker for ticker in tickers if ticker not in results]
+        if fresh:
+            if scheduler.is_full():
+                raise QueueFullError(f"Pipeline queue is full ({scheduler.max_queue} waiting)")
+            runs = {}
+            for ticker in fresh:
+                run = await create_pipeline_run(session, ticker)
+                results[ticker] = (run, False)
+                runs[ticker] = run.id
+            scheduler.submit_batch(runs)
+
+        return [results[ticker] for ticker in tickers]
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, or_, select
+
+from cache import invalidate_ticker
+from config import settings as app_settings
+from db_config import AsyncSessionLocal
+from models import ForecastPoint, ForecastVersion, Log, Model, PipelineRun, Ticker
+
+logger = logging.getLogger(__name__)
+
+
+async def _delete_ids(model, ids: List) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(model).where(model.id.in_(ids)))
+        await session.commit()
+
+
+async def _delete_in_batches(model, where: list, order_by, batch_size: int, touched: Optional[Set[str]] = None) -> int:
+    """
+    Deletes matching rows `batch_size` at a time, one short transaction per batch,
+    so a large backlog never holds long locks or one huge transaction.
+    """
+    deleted = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(model.id, model.ticker).where(*where).order_by(order_by).limit(batch_size)
+            )).all()
+        if not rows:
+            return deleted
+        await _delete_ids(model, [r.id for r in rows])
+        deleted += len(rows)
+        if touched is not None:
+            touched.update(r.ticker for r in rows)
+        if len(rows) < batch_size:
+            return deleted
+        await asyncio.sleep(0)
+
+
+async def prune_forecast_points(cutoff: date, batch_size: int, touched: Set[str]) -> int:
+    return await _delete_in_batches(
+        ForecastPoint, [ForecastPoint.date < cutoff], ForecastPoint.date, batch_size, touched
+    )
+
+
+def _week(day: date) -> Tuple[int, int]:
+    year, week, _ = day.isocalendar()
+    return year, week
+
+
+async def downsample_forecast_points(cutoff: date, batch_size: int, touched: Set[str]) -> int:
+    """Before `cutoff`, keeps only the last point per ticker, forecast version and ISO week."""
+    async with AsyncSessionLocal() as session:
+        tickers = (await session.execute(
+            select(ForecastPoint.ticker).where(ForecastPoint.date < cutoff).distinct()
+        )).scalars().all()
+
+    deleted = 0
+    for ticker in tickers:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(ForecastPoint.id, ForecastPoint.version_id, ForecastPoint.date)
+                .where(ForecastPoint.ticker == ticker, ForecastPoint.date < cutoff)
+                .order_by(ForecastPoint.date, ForecastPoint.id)
+            )).all()
+
+        keep: Dict[Tuple, int] = {}
+        for row in rows:
+            keep[(row.version_id, *_week(row.date))] = row.id
+        kept = set(keep.values())
+        drop = [row.id for row in rows if row.id not in kept]
+        for i in range(0, len(drop), batch_size):
+            await _delete_ids(ForecastPoint, drop[i:i + batch_size])
+            await asyncio.sleep(0)
+        if drop:
+            deleted += len(drop)
+            touched.add(ticker)
+    return deleted
+
+
+async def prune_forecast_versions(keep: int, batch_size: int, touched: Set[str]) -> int:
+    """
+    Keeps the current version plus the newest `keep - 1` others per ticker and
+    deletes the rest with their points and models (children first, in batches).
+    """
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(
+            select(ForecastVersion.id, ForecastVersion.ticker, Ticker.current_forecast_version_id)
+            .join(Ticker, Ticker.ticker == ForecastVersion.ticker)
+            .order_by(ForecastVersion.ticker, ForecastVersion.id.desc())
+        )).all()
+
+    seen: Dict[str, int] = {}
+    stale: List[Tuple[int, str]] = []
+    for row in rows:
+        if row.id == row.current_forecast_version_id:
+            continue
+        seen[row.ticker] = seen.get(row.ticker, 0) + 1
+        if seen[row.ticker] > keep - 1:
+            stale.append((row.id, row.ticker))
+
+    for version_id, ticker in stale:
+        for model in (ForecastPoint, Model):
+            await _delete_in_batches(model, [model.version_id == version_id], model.id, batch_size)
+        await _delete_ids(ForecastVersion, [version_id])
+        touched.add(ticker)
+    return len(stale)
+
+
+async def prune_logs(cutoff: datetime, error_cutoff: Optional[datetime], batch_size: int) -> int:
+    """Logs older than `cutoff`; error logs only once older than `error_cutoff` (None keeps them)."""
+    where = [Log.timestamp < cutoff]
+    if error_cutoff is None:
+        where.append(Log.status != "error")
+    elif error_cutoff < cutoff:
+        where.append(or_(Log.status != "error", Log.timestamp < error_cutoff))
+    return await _delete_in_batches(Log, where, Log.timestamp, batch_size)
+
+
+async def prune_pipeline_runs(cutoff: datetime, batch_size: int) -> int:
+    return await _delete_in_batches(
+        PipelineRun,
+        [PipelineRun.updated_at < cutoff, PipelineRun.status.in_(("success", "error"))],
+        PipelineRun.updated_at,
+        batch_size,
+    )
+
+
+def _days_ago(now: datetime, days: int) -> Optional[datetime]:
+    return now - timedelta(days=days) if days > 0 else None
+
+
+async def run_retention(now: Optional[datetime] = None) -> dict:
+    """One pass of the retention policy in `Settings`; returns rows removed per table."""
+    s = app_settings
+    now = now or datetime.utcnow()
+    batch = max(1, s.RETENTION_BATCH_SIZE)
+    started = time.perf_counter()
+    touched: Set[str] = set()
+    result = {
+        "forecast_versions_pruned": 0,
+        "forecast_points_pruned": 0,
+        "forecast_points_downsampled": 0,
+        "logs_pruned": 0,
+        "pipeline_runs_pruned": 0,
+    }
+
+    if s.FORECAST_VERSIONS_KEEP > 0:
+        result["forecast_versions_pruned"] = await prune_forecast_versions(s.FORECAST_VERSIONS_KEEP, batch, touched)
+
+    forecast_cutoff = _days_ago(now, s.FORECAST_RETENTION_DAYS)
+    if forecast_cutoff is not None:
+        result["forecast_points_pruned"] = await prune_forecast_points(forecast_cutoff.date(), batch, touched)
+
+    downsample_cutoff = _days_ago(now, s.FORECAST_DOWNSAMPLE_AFTER_DAYS)
+    if downsample_cutoff is not None:
+        result["forecast_points_downsampled"] = await downsample_forecast_points(downsample_cutoff.date(), batch, touched)
+
+    log_cutoff = _days_ago(now, s.LOG_RETENTION_DAYS)
+    if log_cutoff is not None:
+        result["logs_pruned"] = await prune_logs(log_cutoff, _days_ago(now, s.LOG_ERROR_RETENTION_DAYS), batch)
+
+    run_cutoff = _days_ago(now, s.PIPELINE_RUN_RETENTION_DAYS)
+    if run_cutoff is not None:
+        result["pipeline_runs_pruned"] = await prune_pipeline_runs(run_cutoff, batch)
+
+    for ticker in touched:
+        invalidate_ticker(ticker)
+
+    result["duration_s"] = round(time.perf_counter() - started, 3)
+    result["finished_at"] = datetime.utcnow().isoformat() + "Z"
+    return result
+
+
+class RetentionJob:
+    """Runs `run_retention` in the background every `interval_s` (first pass after `start`'s `delay_s`)."""
+
+    def __init__(self, *, interval_s: float):
+        self.interval_s = interval_s
+        self.runs = 0
+        self.failures = 0
+        self.last_result: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, *, delay_s: float = 0.0) -> None:
+        if self.running:
+            return
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(delay_s))
+
+    async def _run(self, delay_s: float) -> None:
+        if delay_s > 0:
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay_s)
+            except asyncio.TimeoutError:
+                pass
+        while not self._stop.is_set():
+            try:
+                self.last_result = await run_retention()
+                self.runs += 1
+                removed = sum(v for k, v in self.last_result.items() if k.endswith(("_pruned", "_downsampled")))
+                if removed:
+                    logger.info("Retention pass removed rows", extra={"removed": removed, **self.last_result})
+            except Exception as e:
+                self.failures += 1
+                logger.warning("Retention pass failed", extra={"error": str(e)})
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            # an interrupted batch is rolled back and picked up by the next pass
+            self._stop.set()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict:
+        s = app_settings
+        return {
+            "enabled": s.RETENTION_ENABLED,
+            "running": self.running,
+            "interval_s": self.interval_s,
+            "policy": {
+                "batch_size": s.RETENTION_BATCH_SIZE,
+                "forecast_versions_keep": s.FORECAST_VERSIONS_KEEP,
+                "forecast_retention_days": s.FORECAST_RETENTION_DAYS,
+                "forecast_downsample_after_days": s.FORECAST_DOWNSAMPLE_AFTER_DAYS,
+                "log_retention_days": s.LOG_RETENTION_DAYS,
+                "log_error_retention_days": s.LOG_ERROR_RETENTION_DAYS,
+                "pipeline_run_retention_days": s.PIPELINE_RUN_RETENTION_DAYS,
+            },
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_result": self.last_result,
+        }
+
+
+retention_job = RetentionJob(interval_s=app_settings.RETENTION_INTERVAL_S)
+
+
+if __name__ == "__main__":
+    # one pass from the command line (e.g. cron): python retention.py
+    print(asyncio.run(run_retention()))
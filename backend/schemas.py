@@ -30,6 +30,10 @@ class TickerResponse(TickerBase):
     accuracy: Optional[float] = None
     updated_at: str
 
+class TickerCreateResponse(TickerResponse):
+    pipeline: str = Field(..., description='"queued", or "not_queued" when the queue was full (retry later)')
+    run_id: Optional[int] = None
+
 class TickerDetail(BaseModel):
     ticker: str
     name: str
@@ -52,6 +56,15 @@ class ForecastResponse(BaseModel):
     horizon: int
     points: List[ForecastPoint]
 
+class LiveForecastResponse(ForecastResponse):
+    model: str
+    trained_at: Optional[str] = None
+    data_end: str
+
+class BatchForecastResponse(BaseModel):
+    forecasts: List[ForecastResponse]
+    not_found: List[str]
+
 # Models
 class ModelMetrics(BaseModel):
     model: str
@@ -63,6 +76,10 @@ class ModelMetrics(BaseModel):
     status: str
     recommended: bool
 
+class BatchModelsResponse(BaseModel):
+    models: Dict[str, List[ModelMetrics]]
+    not_found: List[str]
+
 class DeployModelRequest(BaseModel):
     model: str
 
@@ -82,11 +99,31 @@ class LogEntry(BaseModel):
     message: str
     details: Dict[str, Any] = {}
 
+class LogPage(BaseModel):
+    items: List[LogEntry]
+    next_cursor: Optional[str] = None
+
 # Pipeline
 class RetryPipelineResponse(BaseModel):
     ticker: str
     accepted: bool
     queued_at: str
+    run_id: Optional[int] = None
+    coalesced: bool = False
+
+class BatchPipelineRequest(BaseModel):
+    tickers: List[str]
+
+class BatchPipelineRun(BaseModel):
+    ticker: str
+    run_id: int
+    coalesced: bool
+
+class BatchPipelineResponse(BaseModel):
+    accepted: bool
+    queued_at: str
+    batch_size: int
+    runs: List[BatchPipelineRun]
 
 # Settings
 class Settings(BaseModel):
@@ -0,0 +1,102 @@
+"""
+Forecast response encoding benchmark: payload size and serialization time.
+
+Builds synthetic `GET /api/forecast?tickers=` payloads and encodes them the way
+the endpoint did before (response_model validation + jsonable_encoder + JSONResponse)
+and with each `format=` option of `backend/encoding.py`, raw and compressed.
+Usage (from the repo root):
+    python benchmarks/bench_forecast_encoding.py [--tickers 1 50 500] [--points 90] [--repeat 5]
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from encoding import BROTLI_QUALITY, FORMATS, GZIP_LEVEL, _brotli, encode_forecast_batch  # noqa: E402
+from schemas import BatchForecastResponse  # noqa: E402
+
+_FIELD = create_response_field(name="bench", type_=BatchForecastResponse)
+
+
+def payload(n_tickers: int, n_points: int) -> list:
+    rng = random.Random(0)
+    start = date(2025, 1, 1)
+    forecasts = []
+    for i in range(n_tickers):
+        price = rng.uniform(20, 500)
+        points = []
+        for d in range(n_points):
+            price *= 1 + rng.gauss(0, 0.01)
+            points.append({
+                "date": (start + timedelta(days=d)).isoformat(),
+                "actual": round(price, 2) if d < n_points // 2 else None,
+                "predicted": price * (1 + rng.gauss(0, 0.005)),
+                "lower": price * 0.95,
+                "upper": price * 1.05,
+            })
+        forecasts.append({"ticker": f"T{i:03d}", "horizon": n_points, "points": points})
+    return forecasts
+
+
+def baseline(forecasts: list) -> bytes:
+    # what FastAPI does for a dict returned from a route with response_model=BatchForecastResponse
+    content = asyncio.run(serialize_response(field=_FIELD, response_content={"forecasts": forecasts, "not_found": []}))
+    return JSONResponse(content).body
+
+
+def _timed(fn, repeat: int):
+    samples, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append(time.perf_counter() - t0)
+    return out, statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--points", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    brotli = _brotli()
+    if brotli is None:
+        print("(brotli not installed: br column skipped)")
+
+    for n in args.tickers:
+        forecasts = payload(n, args.points)
+        print(f"\n{n} ticker(s) x {args.points} points")
+        print(f"{'encoding':>10} {'encode ms':>10} {'bytes':>11} {'vs base':>8} {'gzip':>10} {'gzip ms':>8} {'br':>10} {'br ms':>7}")
+
+        variants = [("baseline", lambda: baseline(forecasts))]
+        variants += [(fmt, lambda fmt=fmt: encode_forecast_batch(forecasts, [], args.points, fmt)) for fmt in FORMATS]
+        base_size = None
+        for name, fn in variants:
+            body, ms = _timed(fn, args.repeat)
+            base_size = base_size or len(body)
+            gz, gz_ms = _timed(lambda: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), args.repeat)
+            br_cols = f"{'-':>10} {'-':>7}"
+            if brotli is not None:
+                br, br_ms = _timed(lambda: brotli.compress(body, quality=BROTLI_QUALITY), args.repeat)
+                br_cols = f"{len(br):>10,} {br_ms:>7.2f}"
+            print(f"{name:>10} {ms:>10.2f} {len(body):>11,} {len(body) / base_size:>7.0%} "
+                  f"{len(gz):>10,} {gz_ms:>8.2f} {br_cols}")
+
+
+if __name__ == "__main__":
+    main()
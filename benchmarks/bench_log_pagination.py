@@ -0,0 +1,133 @@
+"""
+Log pagination benchmark: keyset cursors vs OFFSET over a large log table.
+
+Seeds `--rows` log rows into a temporary SQLite database (the backend schema and
+indexes), then times one page at increasing depths through `database.query_logs`
+(keyset on (timestamp, id)) and through the equivalent OFFSET query. Fails when a
+deep keyset page is more than `--tolerance` times slower than the first page.
+Usage (from the repo root):
+    python benchmarks/bench_log_pagination.py [--rows 1000000] [--page 200] [--tolerance 3]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "backend"))
+
+_DB_FILE = Path(tempfile.mkdtemp()) / "bench_logs.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_DB_FILE}")
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from db_config import Base  # noqa: E402
+from database import encode_log_cursor, log_query, query_logs  # noqa: E402
+
+TICKERS = [f"T{i:03d}" for i in range(50)]
+EVENTS = ["pipeline_retry_requested", "pipeline_batch_requested", "model_deployed", "training_completed",
+          "drift_detected", "data_ingested"]
+STATUSES = ["success", "success", "success", "warning", "error"]
+
+
+def seed(path: Path, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(0)
+    start = datetime(2020, 1, 1)
+    con = sqlite3.connect(path)
+    con.executemany("INSERT INTO tickers (ticker, name, exchange, status) VALUES (?, ?, 'NASDAQ', 'healthy')",
+                    [(t, t) for t in TICKERS])
+
+    def batch(lo: int, hi: int):
+        for i in range(lo, hi):
+            # ~2 rows per second so (timestamp, id) ties are common
+            ts = start + timedelta(seconds=i // 2)
+            yield (f"log_{i:08d}", ts.isoformat(sep=" "), rng.choice(TICKERS), rng.choice(EVENTS),
+                   rng.choice(STATUSES), "benchmark row", "{}")
+
+    step = 100_000
+    for lo in range(0, rows, step):
+        con.executemany(
+            "INSERT INTO logs (id, timestamp, ticker, event, status, message, details) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            batch(lo, min(rows, lo + step)),
+        )
+    con.commit()
+    con.execute("ANALYZE")
+    con.close()
+
+
+async def _timed(coro_factory, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await coro_factory()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+async def run(page: int, repeat: int, tolerance: float) -> int:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{_DB_FILE}")
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    failures = 0
+
+    async with Session() as session:
+        for label, filters in (("all", {}), ("ticker", {"ticker": TICKERS[7]}), ("event", {"event": EVENTS[2]})):
+            total = (await session.execute(select(func.count()).select_from(log_query(**filters, limit=None).subquery()))).scalar_one()
+            depths = sorted({int(total * f) for f in (0, 0.001, 0.01, 0.1, 0.5)} | {max(0, total - page)})
+            print(f"\n[{label}] {total:,} matching rows")
+            print(f"{'depth':>10} {'keyset ms':>10} {'offset ms':>10}")
+
+            first = None
+            for depth in depths:
+                cursor = None
+                if depth > 0:
+                    # cursor of the row right before the page (setup only, not timed)
+                    prev = (await session.execute(log_query(**filters, limit=1).offset(depth - 1))).scalar_one()
+                    cursor = encode_log_cursor(prev)
+
+                keyset_ms = await _timed(lambda: query_logs(session, limit=page, cursor=cursor, **filters), repeat)
+                offset_ms = await _timed(lambda: session.execute(log_query(**filters, limit=page).offset(depth)), repeat)
+                session.expunge_all()
+
+                first = keyset_ms if first is None else first
+                print(f"{depth:>10,} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
+                if keyset_ms > max(first * tolerance, first + 5.0):
+                    print(f"  ✗ keyset page at depth {depth:,} took {keyset_ms / first:.1f}x the first page")
+                    failures += 1
+
+    await engine.dispose()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=3.0)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    seed(_DB_FILE, args.rows)
+    print(f"Seeded {args.rows:,} log rows in {time.perf_counter() - t0:.1f}s ({_DB_FILE})")
+
+    failures = asyncio.run(run(args.page, args.repeat, args.tolerance))
+    _DB_FILE.unlink(missing_ok=True)
+    if failures:
+        sys.exit(f"{failures} keyset page(s) outside tolerance")
+    print("\nKeyset page latency is stable across depths.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Recursive LSTM forecast: per-step `model.predict` loop vs the compiled rollout.
+
+Also checks that both paths produce numerically equivalent predictions.
+Usage (from the repo root):
+    python benchmarks/bench_lstm_forecast.py [--steps 2000] [--window 30]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from forecasting.lstm import build_model, direct_forecast, predict_loop, recursive_forecast  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=2000, help="validation days (20%% of 10k rows is 2000)")
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--horizon", type=int, default=30, help="outputs per call for the direct model")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    tf.random.set_seed(42)
+    rng = np.random.default_rng(0)
+    series = np.cumsum(rng.normal(0, 0.05, 5000)).astype(np.float32)
+    model = build_model(args.window)
+
+    t0 = time.perf_counter()
+    loop_preds = predict_loop(model, series, args.steps)
+    loop_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast_preds = recursive_forecast(model, series, args.steps)
+    first_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    recursive_forecast(model, series, args.steps)
+    warm_s = time.perf_counter() - t0
+
+    direct_model = build_model(args.window, horizon=args.horizon)
+    direct_forecast(direct_model, series, args.horizon)  # build
+    t0 = time.perf_counter()
+    direct_forecast(direct_model, series, args.steps)
+    direct_s = time.perf_counter() - t0
+
+    max_abs = float(np.max(np.abs(loop_preds - fast_preds)))
+    print(f"steps={args.steps} window={args.window}")
+    print(f"predict() loop           {loop_s:8.3f} s")
+    print(f"compiled rollout (trace) {first_s:8.3f} s   speedup {loop_s / first_s:6.1f}x")
+    print(f"compiled rollout (warm)  {warm_s:8.3f} s   speedup {loop_s / warm_s:6.1f}x")
+    print(f"direct H={args.horizon:<3} model       {direct_s:8.3f} s")
+    print(f"max |loop - compiled|    {max_abs:.2e}")
+    assert np.allclose(loop_preds, fast_preds, rtol=1e-4, atol=1e-5), "compiled rollout diverged from predict() loop"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Daily retrain: full refits vs incremental (warm-start) retraining.
+
+Replays the last `--days` trading days of a price series one day at a time through
+the stage DAG, once with `retrain="full"` and once with `retrain="incremental"`
+(never scheduled for a full refit, so only drift can force one), and reports the
+wall time per daily retrain and the validation RMSE delta per candidate model.
+Usage (from the repo root):
+    python benchmarks/bench_retrain.py [--csv prices.csv] [--days 5] [--candidates ARIMA,LSTM]
+The CSV needs the columns `date,open,high,low,close,adj_close,volume`; without one a
+synthetic random-walk series is used.
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from forecasting.dag import CANDIDATES, run_pipeline  # noqa: E402
+from forecasting.ingest import LocalFileSource  # noqa: E402
+
+TICKER = "BENCH"
+
+
+def synthetic_prices(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, rows)))
+    return pd.DataFrame({
+        "date": pd.bdate_range("2019-01-01", periods=rows),
+        "open": close, "high": close * 1.01, "low": close * 0.99,
+        "close": close, "adj_close": close,
+        "volume": rng.integers(500_000, 1_000_000, rows),
+    })
+
+
+def replay(prices: pd.DataFrame, days: int, workdir: Path, retrain: str, candidates, drift_threshold: float):
+    source_dir, root = workdir / "source", workdir / "root"
+    source_dir.mkdir(parents=True)
+    runs = []
+    for day in range(days + 1):
+        # day 0 trains from scratch in both modes; days 1..N each add one trading day
+        prices.iloc[: len(prices) - days + day].to_csv(source_dir / f"{TICKER}.csv", index=False)
+        started = time.perf_counter()
+        result = run_pipeline(
+            TICKER, root,
+            source=LocalFileSource(source_dir),
+            candidates=candidates,
+            arima_time_budget_s=120,
+            ingest_refresh_s=0,
+            parallel=False,
+            retrain=retrain,
+            full_refit_days=float("inf"),
+            drift_threshold=drift_threshold,
+        )
+        elapsed = time.perf_counter() - started
+        rmse = {m: result.stages[f"train_{m}"].result.get("rmse") for m in candidates}
+        runs.append({"elapsed": elapsed, "rmse": rmse, "plan": result.plan,
+                     "best": result.stages["select"].result.get("best")})
+    return runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", type=Path, help="price history (default: synthetic random walk)")
+    parser.add_argument("--rows", type=int, default=1500, help="rows of the synthetic series")
+    parser.add_argument("--days", type=int, default=5, help="daily retrains to replay")
+    parser.add_argument("--candidates", default=",".join(CANDIDATES))
+    parser.add_argument("--drift-threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    prices = pd.read_csv(args.csv, parse_dates=["date"]) if args.csv else synthetic_prices(args.rows)
+    candidates = [c.strip() for c in args.candidates.split(",") if c.strip()]
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_retrain_"))
+    try:
+        full = replay(prices, args.days, workdir / "full", "full", candidates, args.drift_threshold)
+        incremental = replay(prices, args.days, workdir / "incremental", "incremental", candidates, args.drift_threshold)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"rows={len(prices)} days={args.days} candidates={','.join(candidates)}")
+    print(f"{'day':>3}  {'full s':>8}  {'incr s':>8}  {'incr plan':<24}  best (full / incr)")
+    for day, (f, i) in enumerate(zip(full, incremental)):
+        plan = f"{i['plan'].mode} ({i['plan'].reason})"
+        print(f"{day:>3}  {f['elapsed']:8.2f}  {i['elapsed']:8.2f}  {plan:<24}  {f['best']} / {i['best']}")
+
+    daily_full = mean(r["elapsed"] for r in full[1:])
+    daily_incr = mean(r["elapsed"] for r in incremental[1:])
+    print(f"\nmean daily retrain  full {daily_full:.2f} s  incremental {daily_incr:.2f} s  "
+          f"speedup {daily_full / daily_incr:.1f}x")
+    print("validation RMSE, mean over days 1..N (incremental vs full):")
+    for model in candidates:
+        pairs = [(f["rmse"][model], i["rmse"][model]) for f, i in zip(full[1:], incremental[1:])
+                 if f["rmse"][model] is not None and i["rmse"][model] is not None]
+        if not pairs:
+            print(f"  {model:<8} not trained")
+            continue
+        f_rmse, i_rmse = mean(p[0] for p in pairs), mean(p[1] for p in pairs)
+        print(f"  {model:<8} full {f_rmse:.4f}  incremental {i_rmse:.4f}  delta {100 * (i_rmse / f_rmse - 1):+.2f}%")
+
+
+if __name__ == "__main__":
+    main()
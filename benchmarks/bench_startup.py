@@ -0,0 +1,96 @@
+"""
+Startup benchmark: cold start to first successful request, per STARTUP_MODE.
+
+Prepares a database once (tables + sample data), then for each mode spawns
+`uvicorn main:app` as a fresh process and polls `GET /api/tickers` until it
+answers 200. Reports the median spawn-to-first-200 time over `--repeat` boots.
+Usage (from the repo root):
+    python benchmarks/bench_startup.py [--repeat 5] [--database-url postgresql+asyncpg://...]
+Without --database-url a temporary SQLite file is used (needs aiosqlite).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = ROOT / "backend"
+MODES = ("dev", "production")
+
+
+def prepare(database_url: str) -> None:
+    # production mode expects an existing schema (alembic upgrade head); create_all stands in here
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, str(BACKEND))
+    from db_config import AsyncSessionLocal, Base, engine
+    from database import init_db
+
+    async def _prepare():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSessionLocal() as session:
+            await init_db(session)
+        await engine.dispose()
+
+    asyncio.run(_prepare())
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def boot(mode: str, database_url: str, timeout_s: float) -> float:
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, STARTUP_MODE=mode)
+    url = f"http://127.0.0.1:{port}/api/tickers"
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - t0 < timeout_s:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {proc.returncode} in {mode} mode")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - t0
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.005)
+        raise TimeoutError(f"no 200 from {url} within {timeout_s}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{tmp}/bench_startup.db"
+        prepare(database_url)
+
+        print(f"{'mode':>11} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+        for mode in MODES:
+            samples = [boot(mode, database_url, args.timeout) * 1000 for _ in range(args.repeat)]
+            print(f"{mode:>11} {statistics.median(samples):>10.0f} {min(samples):>8.0f} {max(samples):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
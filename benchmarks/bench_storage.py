@@ -0,0 +1,105 @@
+"""
+CSV vs Parquet load benchmark for raw/processed-shaped datasets.
+
+Each load runs in a fresh process so wall time and peak RSS are not skewed by
+earlier runs. Usage (from the repo root):
+    python benchmarks/bench_storage.py [--rows 16000] [--repeat 5]
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from forecasting.storage import _pyarrow, read_frame, write_frame  # noqa: E402
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        # peak RSS is the best portable fallback (KB on Linux, bytes on macOS)
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def make_frames(rows: int):
+    rng = np.random.default_rng(0)
+    close = 50 + np.cumsum(rng.normal(0, 1, rows))
+    raw = pd.DataFrame({
+        "date": pd.bdate_range("1962-01-02", periods=rows),
+        "open": close + rng.normal(0, 0.5, rows),
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "adj_close": close * 0.98,
+        "volume": rng.integers(1_000, 10_000_000, rows),
+    })
+    proc = raw[["date", "adj_close", "volume"]].copy()
+    proc["returns"] = proc["adj_close"].pct_change()
+    for w in (5, 10, 20):
+        proc[f"roll_mean_{w}"] = proc["adj_close"].rolling(w).mean()
+        proc[f"roll_vol_{w}"] = proc["returns"].rolling(w).std()
+    proc = proc.dropna().reset_index(drop=True)
+    proc["split"] = np.where(np.arange(len(proc)) < int(len(proc) * 0.8), "train", "val")
+    return {"raw": raw, "processed": proc}
+
+
+def _load(kind: str, path: str, conn) -> None:
+    _pyarrow()  # keep library import time out of the measurement
+    before = _rss_mb()
+    t0 = time.perf_counter()
+    if kind == "csv":
+        df = pd.read_csv(path, parse_dates=["date"])
+    else:
+        df = read_frame(Path(path))
+    elapsed = time.perf_counter() - t0
+    conn.send((elapsed, _rss_mb() - before, len(df)))
+    conn.close()
+
+
+def measure(kind: str, path: Path, repeat: int):
+    ctx = multiprocessing.get_context("spawn")
+    times, rss = [], []
+    for _ in range(repeat):
+        parent, child = ctx.Pipe()
+        p = ctx.Process(target=_load, args=(kind, str(path), child))
+        p.start()
+        elapsed, rss_mb, _ = parent.recv()
+        p.join()
+        times.append(elapsed)
+        rss.append(rss_mb)
+    return float(np.median(times)), float(np.median(rss))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=16_000, help="~16k rows is 60+ years of trading days")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print(f"{'dataset':<10} {'format':<8} {'size KB':>9} {'load ms':>9} {'RSS +MB':>9}")
+        for name, df in make_frames(args.rows).items():
+            csv_path = tmp / f"{name}.csv"
+            pq_path = tmp / f"{name}.parquet"
+            df.to_csv(csv_path, index=False)
+            write_frame(df, pq_path)
+            for kind, path in (("csv", csv_path), ("parquet", pq_path)):
+                load_s, rss_mb = measure(kind, path, args.repeat)
+                size_kb = path.stat().st_size / 1024.0
+                print(f"{name:<10} {kind:<8} {size_kb:>9.1f} {load_s * 1000:>9.2f} {rss_mb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Reusable pipeline code shared by the notebooks and the backend pipeline runner.
+
+Modules are importable from the repo root (the notebooks' working directory).
+"""
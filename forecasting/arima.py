@@ -0,0 +1,153 @@
+"""
+ARIMA order grid search across a process pool.
+
+Every order is fitted on the full training series and scored on the validation
+horizon, exactly like the sequential grid in `02_Model_Experiments`. With a time
+budget, orders are first screened by AIC on a short tail of the series so the
+most promising ones are evaluated first. The screen gets at most
+`SCREEN_BUDGET_FRACTION` of the budget; whatever hasn't finished when the rest
+runs out is pruned, except the top-ranked order, which is always fitted.
+"""
+import multiprocessing
+import os
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from forecasting.metrics import mape, rmse
+
+Order = Tuple[int, int, int]
+
+DEFAULT_ORDERS: List[Order] = [(p, d, q) for p in (0, 1, 2, 3) for d in (0, 1) for q in (0, 1, 2)]
+SCREEN_BUDGET_FRACTION = 0.5
+
+
+def fit_order(y, order: Order, *, start_params=None):
+    """ARIMA(order) fitted on `y`; `start_params` (e.g. a previous fit's) seeds the optimizer."""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return ARIMA(y, order=order).fit(start_params=start_params)
+
+
+def _screen_order(y_tail: np.ndarray, order: Order) -> float:
+    try:
+        return float(fit_order(y_tail, order).aic)
+    except Exception:
+        return float("inf")
+
+
+def _evaluate_order(y_train: np.ndarray, y_val: np.ndarray, order: Order) -> Optional[dict]:
+    try:
+        fit = fit_order(y_train, order)
+        pred = fit.forecast(steps=len(y_val))
+    except Exception:
+        return None
+    return {"order": order, "rmse": rmse(y_val, pred), "mape": mape(y_val, pred), "aic": float(fit.aic)}
+
+
+def _rank_by_screening(executor, y_train, orders, screen_size, deadline) -> List[Order]:
+    y_tail = y_train[-screen_size:]
+    aic = {}
+    if executor is None:
+        for order in orders:
+            if time.monotonic() >= deadline:
+                break
+            aic[order] = _screen_order(y_tail, order)
+    else:
+        futures = {executor.submit(_screen_order, y_tail, order): order for order in orders}
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for future in not_done:
+            future.cancel()  # queued screens would hold up the full fits
+        aic = {futures[f]: f.result() for f in done}
+    # unscreened / failed orders go last, keeping grid order among equals
+    return sorted(orders, key=lambda o: aic.get(o, float("inf")))
+
+
+def grid_search(
+    y_train: Sequence[float],
+    y_val: Sequence[float],
+    orders: Sequence[Order] = DEFAULT_ORDERS,
+    *,
+    max_workers: Optional[int] = None,  # defaults to os.cpu_count(); 1 runs in-process
+    time_budget_s: Optional[float] = None,
+    screen_size: int = 500,
+) -> Tuple[dict, object, dict]:
+    """
+    Returns `(best, fit, info)` where `best` has the winning `order`, `rmse` and
+    `mape` (lowest validation RMSE, ties going to the earlier order in `orders`),
+    `fit` is the ARIMA results object for that order and `info` describes what
+    was evaluated or pruned.
+    """
+    y_train = np.asarray(y_train, dtype=float)
+    y_val = np.asarray(y_val, dtype=float)
+    orders = [tuple(o) for o in orders]
+    grid_index = {o: i for i, o in enumerate(orders)}
+
+    started = time.monotonic()
+    deadline = started + time_budget_s if time_budget_s is not None else float("inf")
+    screened = time_budget_s is not None and len(y_train) > screen_size
+    screen_deadline = started + SCREEN_BUDGET_FRACTION * time_budget_s if screened else deadline
+    attempted: List[Order] = []
+    results: List[dict] = []
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1:
+        queue = _rank_by_screening(None, y_train, orders, screen_size, screen_deadline) if screened else orders
+        for order in queue:
+            # the top-ranked order (and the next ones until one succeeds) runs even past the deadline
+            if results and time.monotonic() >= deadline:
+                break
+            attempted.append(order)
+            res = _evaluate_order(y_train, y_val, order)
+            if res is not None:
+                results.append(res)
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        try:
+            queue = _rank_by_screening(executor, y_train, orders, screen_size, screen_deadline) if screened else orders
+            pending = {executor.submit(_evaluate_order, y_train, y_val, order): order for order in queue}
+            top = next(iter(pending), None)
+            while pending:
+                remaining = deadline - time.monotonic()
+                # past the deadline, still wait for the top-ranked order and for a first result
+                settled = bool(results) and top not in pending
+                if remaining <= 0 and settled:
+                    break
+                timeout = None if remaining == float("inf") or not settled else remaining
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempted.append(pending.pop(future))
+                    res = future.result()
+                    if res is not None:
+                        results.append(res)
+        finally:
+            # pruned orders still being fitted must not run on past the budget
+            processes = list((getattr(executor, "_processes", None) or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+    if not results:
+        raise RuntimeError("ARIMA grid search failed for all orders")
+
+    best = min(results, key=lambda r: (r["rmse"], grid_index[r["order"]]))
+    best_fit = fit_order(y_train, best["order"])
+
+    info = {
+        "orders": len(orders),
+        "evaluated": len(attempted),
+        "failed": len(attempted) - len(results),
+        "pruned": [list(o) for o in orders if o not in set(attempted)],
+        "screened": screened,
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+    return {"order": best["order"], "rmse": best["rmse"], "mape": best["mape"]}, best_fit, info
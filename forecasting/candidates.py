@@ -0,0 +1,252 @@
+"""
+Candidate-model fits (the DAG's `train_<model>` stages) in worker processes.
+
+`CandidatePool` keeps one long-lived process per model type, so ARIMA, Prophet and
+LSTM fit at the same time and keep their imports (and the LSTM model cache) between
+tickers. Every fit has its own `Budget`: a fit still running at its deadline is killed
+and reported as `status: "timeout"`, one whose worker outgrows its memory budget as
+an error. Either way the worker is restarted for the next fit and the other
+candidates carry on. Each worker leads its own process group, so the memory budget
+covers the processes a fit starts (the ARIMA grid search's pool) and a kill reaches
+them too.
+"""
+import logging
+import multiprocessing
+import os
+import pickle
+import signal
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+POLL_S = 0.5
+
+
+@dataclass(frozen=True)
+class Budget:
+    timeout_s: Optional[float] = None  # wall clock per fit
+    memory_mb: Optional[int] = None    # resident memory of the worker and its children (Linux only)
+    cpus: int = 1                      # processes a fit may use (the ARIMA grid search's pool size)
+
+
+@dataclass
+class CandidateTask:
+    model: str
+    root: str
+    ticker: str
+    params: dict
+    artifact_path: str
+    warm_start_path: Optional[str] = None  # previous artifact to continue from (incremental retrain)
+
+
+def train_candidate(
+    model: str, data, params: dict, lstm_cache=None, warm_start: Optional[dict] = None
+) -> Tuple[dict, Optional[dict]]:
+    from forecasting import experiments as exp
+
+    if model == "ARIMA":
+        return exp.train_arima(data, warm_start=warm_start, **params)
+    if model == "Prophet":
+        return exp.train_prophet(data, warm_start=warm_start, **params)
+    if model == "LSTM":
+        return exp.train_lstm(data, model_cache=lstm_cache, warm_start=warm_start, **params)
+    raise ValueError(f"Unknown candidate model: {model}")
+
+
+def fit_candidate(task: CandidateTask, lstm_cache=None) -> dict:
+    """Trains one candidate and pickles its artifact to `task.artifact_path`; returns its result."""
+    from forecasting.experiments import load_dataset
+
+    data = load_dataset(Path(task.root), task.ticker)
+    warm_start = None
+    if task.warm_start_path and Path(task.warm_start_path).exists():
+        with Path(task.warm_start_path).open("rb") as f:
+            warm_start = pickle.load(f)
+    result, artifact = train_candidate(task.model, data, task.params, lstm_cache, warm_start)
+    if artifact is not None:
+        path = Path(task.artifact_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(artifact, f)
+        tmp.replace(path)
+    return result
+
+
+def _serve(conn) -> None:
+    # worker process: one fit at a time until the pool closes the pipe
+    if hasattr(os, "setpgid"):
+        os.setpgid(0, 0)
+    # started as a daemon (the parent reaps it at exit), but a fit may start its own pool
+    # (ARIMA grid search); killing the worker's group stops those processes too
+    multiprocessing.current_process().daemon = False
+    from forecasting.experiments import LSTMModelCache
+
+    lstm_cache = LSTMModelCache()
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        try:
+            result = fit_candidate(task, lstm_cache)
+        except Exception as e:
+            result = {"model": task.model, "status": "error", "error": f"{type(e).__name__}: {e}"}
+        conn.send(result)
+
+
+def _group_rss_mb(pgid: int) -> Optional[float]:
+    """Resident memory of every process in group `pgid` (None without /proc)."""
+    try:
+        pids = [name for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return None
+    pages, found = 0, False
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # fields after "(comm)": state, ppid, pgrp, ... rss is the 22nd
+                fields = f.read().rpartition(")")[2].split()
+            if int(fields[2]) == pgid:
+                pages += int(fields[21])
+                found = True
+        except (OSError, ValueError, IndexError):
+            continue
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024) if found else None
+
+
+class CandidateWorker:
+    def __init__(self, model: str):
+        self.model = model
+        self.process = None
+        self.conn = None
+
+    def submit(self, task: CandidateTask) -> None:
+        if self.process is None or not self.process.is_alive():
+            self._start()
+        self.conn.send(task)
+
+    def _start(self) -> None:
+        self.kill()
+        # spawn: TensorFlow and the BLAS thread pools are not fork-safe
+        ctx = multiprocessing.get_context("spawn")
+        parent, child = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child,), name=f"candidate-{self.model}", daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    def rss_mb(self) -> Optional[float]:
+        return _group_rss_mb(self.process.pid) if self.process is not None else None
+
+    def exitcode(self) -> Optional[int]:
+        if self.process is None:
+            return None
+        self.process.join(timeout=1)
+        return self.process.exitcode
+
+    def kill(self) -> None:
+        process, self.process = self.process, None
+        conn, self.conn = self.conn, None
+        if process is not None and hasattr(os, "killpg"):
+            try:
+                # the worker's group: also stops processes a fit started
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        if process is not None and process.is_alive():
+            process.kill()
+        if process is not None:
+            process.join(timeout=5)
+        if conn is not None:
+            conn.close()
+
+    def close(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=5)
+            except (OSError, ValueError):
+                pass
+        self.kill()
+
+
+class CandidatePool:
+    """One worker process per candidate model; `fit` runs a ticker's candidates concurrently."""
+
+    def __init__(self):
+        self._workers: Dict[str, CandidateWorker] = {}
+        self.fits = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    def fit(
+        self,
+        tasks: Sequence[CandidateTask],
+        budgets: Optional[Dict[str, Budget]] = None,
+        *,
+        on_done: Optional[Callable[[CandidateTask, dict], None]] = None,
+    ) -> Dict[str, dict]:
+        """
+        Fits `tasks` (at most one per model) at the same time and returns their results
+        by model. `on_done(task, result)` is called as each one finishes.
+        """
+        budgets = budgets or {}
+        pending = {}
+        for task in tasks:
+            worker = self._workers.get(task.model)
+            if worker is None:
+                worker = self._workers[task.model] = CandidateWorker(task.model)
+            budget = budgets.get(task.model, Budget())
+            worker.submit(task)
+            deadline = time.monotonic() + budget.timeout_s if budget.timeout_s else None
+            pending[worker.conn] = (task, worker, budget, deadline)
+
+        results: Dict[str, dict] = {}
+        while pending:
+            ready = wait(list(pending), timeout=POLL_S)
+            now = time.monotonic()
+            for conn in list(pending):
+                task, worker, budget, deadline = pending[conn]
+                result = self._check(conn in ready, task, worker, budget, deadline, now)
+                if result is None:
+                    continue
+                del pending[conn]
+                self.fits += 1
+                results[task.model] = result
+                if on_done is not None:
+                    on_done(task, result)
+        return results
+
+    def _check(self, ready: bool, task: CandidateTask, worker: CandidateWorker, budget: Budget,
+               deadline: Optional[float], now: float) -> Optional[dict]:
+        failed = {"model": task.model, "status": "error"}
+        if ready:
+            try:
+                return worker.conn.recv()
+            except (EOFError, OSError):
+                failed["error"] = f"Worker exited with code {worker.exitcode()}"
+        elif deadline is not None and now >= deadline:
+            self.timeouts += 1
+            failed.update(status="timeout", error=f"No result within {budget.timeout_s:g} s")
+        else:
+            rss = worker.rss_mb() if budget.memory_mb else None
+            if rss is None or rss <= budget.memory_mb:
+                return None
+            failed["error"] = f"Memory budget exceeded ({rss:.0f} MB > {budget.memory_mb} MB)"
+
+        logger.warning("Candidate fit stopped", extra={"ticker": task.ticker, **failed})
+        self.restarts += 1
+        worker.kill()
+        return failed
+
+    def shutdown(self) -> None:
+        workers, self._workers = self._workers, {}
+        for worker in workers.values():
+            worker.close()
@@ -0,0 +1,427 @@
+"""
+One ticker's pipeline as a stage DAG with content-hash caching.
+
+    ingest → validate → features → train_<model> (per candidate) → select → finalize
+
+Each stage has an input fingerprint (hashes of the files it reads plus the
+parameters that affect its output) and a list of output files. When a stage
+succeeds, `data/pipeline/{TICKER}/{stage}.json` records the fingerprint, the
+content hashes of its outputs and its small JSON result. A stage whose
+fingerprint and outputs still match that manifest is a cache **hit** and is
+skipped. A failed stage writes no manifest, so the next run resumes from it.
+`finalize` (publishing to the database) runs in the backend with the same store.
+`data/logs/{TICKER}_eda.json` is not a stage output: it is rewritten every run with
+that run's ingestion info and feature-cache stats.
+
+The `train_<model>` stages that miss the cache fit at the same time, each in its
+own worker process with its own time and memory budget (`forecasting/candidates.py`).
+A candidate that times out is recorded as `status: "timeout"` and retried next run.
+"""
+import hashlib
+import json
+import pickle
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from forecasting.candidates import Budget, CandidatePool, CandidateTask, fit_candidate
+from forecasting.eda import close_column, eda_summary, validate_frame
+from forecasting.features import build_features, feature_spec, manifest_path, spec_hash
+from forecasting.ingest import DataSource, YFinanceSource, ingest
+from forecasting.metrics import naive_rmse
+from forecasting.retrain import (
+    DRIFT_THRESHOLD, FULL_REFIT_DAYS, RetrainPlan, drift_score, full_refit_state, plan_retrain,
+)
+from forecasting.storage import dataset_path, read_frame
+
+DAG_VERSION = 1  # bump when a stage's logic changes, to invalidate every manifest
+CANDIDATES = ("ARIMA", "Prophet", "LSTM")
+INGEST_REFRESH_S = 6 * 3600
+
+# on_stage(stage, status): "running" before a stage runs, then "ran", "hit", "error" or "timeout"
+StageCallback = Callable[[str, str], None]
+
+
+def fingerprint(inputs: dict) -> str:
+    payload = json.dumps({"dag_version": DAG_VERSION, **inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def file_hash(path: Path) -> Optional[str]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _json_safe(obj) -> dict:
+    from forecasting.experiments import safe_json
+
+    return json.loads(json.dumps(obj, default=safe_json))
+
+
+class StageStore:
+    """Manifests of the stages that completed for one ticker (`data/pipeline/{TICKER}/`)."""
+
+    def __init__(self, root: Path, ticker: str):
+        self.root = Path(root)
+        self.dir = self.root / "data" / "pipeline" / ticker
+
+    def _path(self, stage: str) -> Path:
+        return self.dir / f"{stage}.json"
+
+    def read(self, stage: str) -> Optional[dict]:
+        try:
+            return json.loads(self._path(stage).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def lookup(self, stage: str, fp: str) -> Optional[dict]:
+        """The stage's manifest if it was built from `fp` and its outputs are unchanged."""
+        manifest = self.read(stage)
+        if manifest is None or manifest.get("fingerprint") != fp:
+            return None
+        for rel, digest in manifest.get("outputs", {}).items():
+            if file_hash(self.root / rel) != digest:
+                return None
+        return manifest
+
+    def record(self, stage: str, fp: str, outputs: Sequence[Path], result: dict) -> dict:
+        manifest = {
+            "stage": stage,
+            "fingerprint": fp,
+            "outputs": {str(Path(p).relative_to(self.root)): file_hash(p) for p in outputs},
+            "result": result,
+            "completed_at_utc": datetime.utcnow().isoformat() + "Z",
+        }
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(stage).with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        tmp.replace(self._path(stage))
+        return manifest
+
+    def state(self) -> dict:
+        """The ticker's retrain state (`state.json`: last full refit and its reference RMSE)."""
+        return self.read("state") or {}
+
+    def update_state(self, **fields) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._path("state").with_suffix(".tmp")
+        tmp.write_text(json.dumps({**self.state(), **fields}, indent=2, default=str), encoding="utf-8")
+        tmp.replace(self._path("state"))
+
+    def output_hash(self, stage: str, path: Path) -> Optional[str]:
+        manifest = self.read(stage) or {}
+        return manifest.get("outputs", {}).get(str(Path(path).relative_to(self.root)))
+
+    def outputs_fingerprint(self, stage: str) -> str:
+        """Fingerprint of a stage's recorded outputs (the input of the stage after it)."""
+        return fingerprint({"stage": stage, "outputs": (self.read(stage) or {}).get("outputs")})
+
+
+@dataclass
+class StageOutcome:
+    stage: str
+    status: str  # "hit" | "ran" | "error" | "timeout"
+    result: dict = field(default_factory=dict)
+    duration_s: float = 0.0
+
+
+@dataclass
+class PipelineResult:
+    ticker: str
+    stages: Dict[str, StageOutcome]
+    plan: Optional[RetrainPlan] = None
+
+    @property
+    def cache(self) -> Dict[str, str]:
+        return {name: outcome.status for name, outcome in self.stages.items()}
+
+
+def _cached_stage(
+    store: StageStore, stage: str, fp: str, *, use_cache: bool, on_stage: Optional[StageCallback]
+) -> Optional[StageOutcome]:
+    manifest = store.lookup(stage, fp) if use_cache else None
+    if manifest is None:
+        return None
+    if on_stage:
+        on_stage(stage, "hit")
+    return StageOutcome(stage, "hit", manifest["result"])
+
+
+def _finish_stage(
+    store: StageStore,
+    stage: str,
+    fp: str,
+    result: dict,
+    outputs: Sequence[Path],
+    started: float,
+    *,
+    on_stage: Optional[StageCallback],
+) -> StageOutcome:
+    result = _json_safe(result)
+    # a candidate that failed or timed out is reported, not cached: the next run retries it
+    status = result.get("status") if result.get("status") in ("error", "timeout") else "ran"
+    if status == "ran":
+        store.record(stage, fp, outputs, result)
+    if on_stage:
+        on_stage(stage, status)
+    return StageOutcome(stage, status, result, round(time.perf_counter() - started, 3))
+
+
+def _run_stage(
+    store: StageStore,
+    stage: str,
+    fp: str,
+    fn: Callable[[], Tuple[dict, List[Path]]],
+    *,
+    use_cache: bool,
+    on_stage: Optional[StageCallback],
+) -> StageOutcome:
+    outcome = _cached_stage(store, stage, fp, use_cache=use_cache, on_stage=on_stage)
+    if outcome is not None:
+        return outcome
+
+    if on_stage:
+        on_stage(stage, "running")
+    started = time.perf_counter()
+    try:
+        result, outputs = fn()
+    except Exception:
+        if on_stage:
+            on_stage(stage, "error")
+        raise
+    return _finish_stage(store, stage, fp, result, outputs, started, on_stage=on_stage)
+
+
+def run_pipeline(
+    ticker: str,
+    root: Path,
+    *,
+    source: Optional[DataSource] = None,
+    candidates: Sequence[str] = CANDIDATES,
+    arima_time_budget_s: Optional[float] = 600,
+    lstm_mode: str = "recursive",
+    lstm_horizon: int = 30,
+    lstm_features: Sequence[str] = (),
+    lstm_cache=None,
+    ingest_refresh_s: float = INGEST_REFRESH_S,
+    use_cache: bool = True,
+    on_stage: Optional[StageCallback] = None,
+    pool: Optional[CandidatePool] = None,
+    parallel: bool = True,
+    budgets: Optional[Dict[str, Budget]] = None,
+    retrain: str = "full",
+    full_refit_days: float = FULL_REFIT_DAYS,
+    drift_threshold: float = DRIFT_THRESHOLD,
+) -> PipelineResult:
+    """
+    Runs ingest → validate → features → train_* → select for one ticker, skipping
+    stages whose inputs are unchanged. Raises on the first failing stage
+    (`select` fails when no candidate trained).
+
+    With `parallel` the candidates fit concurrently on `pool` (a temporary pool when
+    None) under their `budgets`; otherwise they fit one after another in this process,
+    sharing `lstm_cache`. `retrain="incremental"` warm-starts them from their previous
+    fits between full refits (see `forecasting/retrain.py`).
+    """
+    from forecasting import experiments as exp
+
+    ticker = ticker.strip().upper()
+    unknown = [model for model in candidates if model not in CANDIDATES]
+    if unknown or not candidates:
+        raise ValueError(f"Candidates must be a non-empty subset of {CANDIDATES}, got {list(candidates)}")
+    if retrain not in ("full", "incremental"):
+        raise ValueError(f"retrain must be 'full' or 'incremental', got {retrain!r}")
+    root = Path(root)
+    source = source or YFinanceSource()
+    store = StageStore(root, ticker)
+    data_dir = root / "data"
+    raw_path = dataset_path(data_dir / "raw", ticker)
+    proc_path = dataset_path(data_dir / "processed", ticker)
+    eda_log_path = data_dir / "logs" / f"{ticker}_eda.json"
+    candidates_dir = store.dir / "candidates"
+    stages: Dict[str, StageOutcome] = {}
+
+    def run(stage: str, inputs: dict, fn) -> StageOutcome:
+        stages[stage] = _run_stage(store, stage, fingerprint(inputs), fn, use_cache=use_cache, on_stage=on_stage)
+        return stages[stage]
+
+    # ingest: the source is external, so its input is the refresh window
+    def do_ingest():
+        _, info = ingest(ticker, raw_path, source)
+        return info, [raw_path]
+
+    window = int(time.time() // ingest_refresh_s) if ingest_refresh_s > 0 else time.time()
+    ingest_out = run("ingest", {"ticker": ticker, "source": type(source).__name__, "window": window}, do_ingest)
+    raw_hash = store.output_hash("ingest", raw_path) or file_hash(raw_path)
+
+    def do_validate():
+        df = read_frame(raw_path)
+        close_col = close_column(df)
+        summary = eda_summary(ticker, df, {}, validate_frame(df), close_col)
+        del summary["ingestion"]  # filled in per run below
+        return {"close_col": close_col, "rows": summary["rows"], "validation": summary["validation"],
+                "summary": summary}, []
+
+    # "summary": validate results recorded before the EDA log moved out of the stage lack it
+    validate_out = run("validate", {"raw": raw_hash, "summary": True}, do_validate)
+    close_col = validate_out.result["close_col"]
+
+    def do_features():
+        _, stats = build_features(read_frame(raw_path), proc_path, close_col)
+        return stats, [proc_path, manifest_path(proc_path)]
+
+    features_out = run("features", {"raw": raw_hash, "spec": spec_hash(feature_spec(close_col))}, do_features)
+    proc_hash = store.output_hash("features", proc_path) or file_hash(proc_path)
+
+    # the EDA log is rewritten every run, so its ingestion and feature-cache stats are this run's
+    feature_cache = dict(features_out.result)
+    if features_out.status == "hit":
+        # the whole processed file was reused without calling build_features
+        rows = feature_cache.get("rows_reused", 0) + feature_cache.get("rows_computed", 0)
+        feature_cache.update(status="hit", rows_reused=rows, rows_computed=0)
+    eda_log_path.parent.mkdir(parents=True, exist_ok=True)
+    eda_log_path.write_text(json.dumps({
+        **validate_out.result["summary"],
+        "generated_at_utc": datetime.utcnow().isoformat() + "Z",
+        "ingestion": ingest_out.result,
+        "feature_cache": feature_cache,
+    }, indent=2))
+
+    budgets = budgets or {}
+    arima_budget = budgets.get("ARIMA", Budget()).timeout_s
+    if parallel and arima_budget and arima_time_budget_s:
+        # the grid search stops in time to return its best order before the fit is killed
+        arima_time_budget_s = min(arima_time_budget_s, 0.8 * arima_budget)
+    train_params = {
+        "ARIMA": {"time_budget_s": arima_time_budget_s},
+        "Prophet": {},
+        "LSTM": {"mode": lstm_mode, "horizon": lstm_horizon},
+    }
+    if lstm_features:
+        # only when set, so univariate fits keep their stage fingerprints
+        train_params["LSTM"]["features"] = list(lstm_features)
+
+    state = store.state()
+    if retrain == "incremental":
+        has_previous_fit = any((candidates_dir / f"{model}.pkl").exists() for model in candidates)
+        plan = plan_retrain(state, has_previous_fit, full_refit_days=full_refit_days)
+    else:
+        plan = RetrainPlan("full", "requested")
+
+    def train_candidates(warm: bool) -> None:
+        tasks, fingerprints, started = [], {}, {}
+        for model in candidates:
+            stage = f"train_{model}"
+            params = dict(train_params[model])
+            if model == "LSTM":
+                params.update(window=exp.LSTM_WINDOW, epochs=exp.LSTM_EPOCHS)
+            inputs = {"processed": proc_hash, "model": model, "params": params, "forecast_steps": exp.FORECAST_STEPS}
+            if warm:
+                inputs["retrain"] = "incremental"
+            fingerprints[model] = fingerprint(inputs)
+            outcome = _cached_stage(store, stage, fingerprints[model], use_cache=use_cache, on_stage=on_stage)
+            if outcome is not None:
+                stages[stage] = outcome
+                continue
+            artifact_path = str(candidates_dir / f"{model}.pkl")
+            task_params = dict(train_params[model])
+            if model == "ARIMA" and parallel:
+                # the grid search's pool runs inside the candidate worker: keep it within the budget's cpus
+                # (not part of the fingerprint: the pool size doesn't change the result)
+                task_params["max_workers"] = budgets.get(model, Budget()).cpus
+            # a warm fit continues from the stage's last output and then replaces it
+            tasks.append(CandidateTask(model, str(root), ticker, task_params, artifact_path,
+                                       warm_start_path=artifact_path if warm else None))
+
+        def train_start(task: CandidateTask) -> None:
+            if on_stage:
+                on_stage(f"train_{task.model}", "running")
+            started[task.model] = time.perf_counter()
+
+        def train_done(task: CandidateTask, result: dict) -> None:
+            outputs = [Path(task.artifact_path)] if result.get("status") == "ok" else []
+            stages[f"train_{task.model}"] = _finish_stage(
+                store, f"train_{task.model}", fingerprints[task.model], result, outputs, started[task.model],
+                on_stage=on_stage,
+            )
+
+        if tasks and parallel:
+            for task in tasks:
+                train_start(task)
+            fit_pool = pool or CandidatePool()
+            try:
+                fit_pool.fit(tasks, budgets, on_done=train_done)
+            finally:
+                if fit_pool is not pool:
+                    fit_pool.shutdown()
+        else:
+            for task in tasks:
+                train_start(task)
+                try:
+                    result = fit_candidate(task, lstm_cache)
+                except Exception as e:
+                    result = {"model": task.model, "status": "error", "error": f"{type(e).__name__}: {e}"}
+                train_done(task, result)
+
+    def train_results() -> List[dict]:
+        return [stages[f"train_{model}"].result for model in candidates]
+
+    def naive_val_rmse() -> float:
+        # drift is measured against the no-change forecast on this run's validation window
+        data = exp.load_dataset(root, ticker)
+        return naive_rmse(data.y_train, data.y_val)
+
+    train_candidates(warm=plan.mode == "incremental")
+    if plan.mode == "incremental":
+        plan.drift_score = drift_score(state, train_results(), naive_val_rmse())
+        if plan.drift_score is not None and plan.drift_score > drift_threshold:
+            plan = RetrainPlan("full", "drift", plan.drift_score)
+            train_candidates(warm=False)
+
+    candidate_inputs = {}
+    for model in candidates:
+        stage = f"train_{model}"
+        out = stages[stage]
+        candidate_inputs[model] = store.outputs_fingerprint(stage) if out.status in ("hit", "ran") else out.result
+
+    def do_select():
+        data = exp.load_dataset(root, ticker)
+        results, artifacts = [], {}
+        for model in candidates:
+            result = stages[f"train_{model}"].result
+            results.append(result)
+            artifact_path = candidates_dir / f"{model}.pkl"
+            if result.get("status") == "ok" and artifact_path.exists():
+                with artifact_path.open("rb") as f:
+                    artifacts[model] = pickle.load(f)
+        best = exp.select_best(results)
+        _, log_path = exp.write_experiment_log(root, data, results, best)
+        metadata = exp.save_best_artifact(root, data, best, artifacts, {
+            "retrain": plan.to_dict(),
+            "drift_score": plan.drift_score if plan.drift_score is not None else 0.0,
+        })
+        latest_dir = latest_model_dir(root, ticker)
+        outputs = [log_path, latest_dir / "metadata.json", latest_dir / "model.pkl"]
+        if metadata.get("forecast_file"):
+            outputs.append(latest_dir / metadata["forecast_file"])
+        return {"best": best["model"], "metrics": metadata["metrics"], "retrain": plan.to_dict()}, outputs
+
+    selected = run("select", {"processed": proc_hash, "candidates": candidate_inputs, "interval_z": exp.INTERVAL_Z},
+                   do_select)
+    trained = any(stages[f"train_{model}"].status == "ran" for model in candidates)
+    if plan.mode == "full" and trained and selected.status == "ran":
+        # the schedule and the drift reference restart from this refit
+        store.update_state(**full_refit_state(train_results(), naive_val_rmse()))
+    return PipelineResult(ticker, stages, plan)
+
+
+def latest_model_dir(root: Path, ticker: str) -> Path:
+    return Path(root) / "models" / "latest" / ticker
@@ -0,0 +1,107 @@
+"""
+EDA & preprocessing stage (the logic behind `01_EDA_Preprocessing`, minus the plots).
+
+`run_eda` ingests `data/raw/{TICKER}.parquet`, validates it, writes the summary log
+`data/logs/{TICKER}_eda.json` and builds `data/processed/{TICKER}.parquet`, all
+in-process: the backend's script mode calls it instead of executing the notebook.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from forecasting.features import build_features
+from forecasting.ingest import DataSource, YFinanceSource, ingest
+from forecasting.storage import dataset_path
+
+
+@dataclass
+class EdaResult:
+    ticker: str
+    raw_path: Path
+    processed_path: Path
+    eda_log_path: Path
+    rows: int
+    close_col: str
+    summary: dict
+
+
+def validate_frame(df: pd.DataFrame) -> dict:
+    """Duplicate dates, null counts and missing business days (rough: markets have holidays)."""
+    val = {}
+    val["duplicate_dates"] = int(df.duplicated(subset=["date"]).sum())
+    val["null_counts"] = {k: int(v) for k, v in df.isna().sum().to_dict().items()}
+
+    dmin, dmax = df["date"].min(), df["date"].max()
+    expected = pd.date_range(dmin.normalize(), dmax.normalize(), freq="B")
+    observed = pd.to_datetime(df["date"].dt.normalize().unique())
+    val["missing_business_days_count"] = int(len(set(expected) - set(observed)))
+    val["date_range"] = {"min": dmin.isoformat(), "max": dmax.isoformat()}
+    return val
+
+
+def close_column(df: pd.DataFrame) -> str:
+    return "adj_close" if "adj_close" in df.columns else "close"
+
+
+def eda_summary(ticker: str, df: pd.DataFrame, ingest_info: dict, validation: dict, close_col: str) -> dict:
+    """The `{TICKER}_eda.json` summary: row/column info, ingestion, validation, price and returns stats."""
+    prices = df[["date", close_col]].sort_values("date")[close_col]
+    returns = prices.pct_change().dropna()
+    return {
+        "ticker": ticker,
+        "generated_at_utc": datetime.utcnow().isoformat() + "Z",
+        "rows": int(len(df)),
+        "columns": list(df.columns),
+        "ingestion": ingest_info,
+        "validation": validation,
+        "price_summary": {
+            "close_col": close_col,
+            "min": float(prices.min()),
+            "max": float(prices.max()),
+            "mean": float(prices.mean()),
+            "std": float(prices.std()),
+        },
+        "returns_summary": {
+            "mean": float(returns.mean()),
+            "std": float(returns.std()),
+            "skew": float(returns.skew()),
+            "kurt": float(returns.kurt()),
+        },
+    }
+
+
+def run_eda(ticker: str, root: Path, *, source: Optional[DataSource] = None) -> EdaResult:
+    """Runs the full EDA/preprocessing stage for one ticker (no plots, no kernel)."""
+    ticker = ticker.strip().upper()
+    if not ticker:
+        raise ValueError("TICKER is required")
+
+    data_dir = Path(root) / "data"
+    for d in ("raw", "processed", "logs"):
+        (data_dir / d).mkdir(parents=True, exist_ok=True)
+    raw_path = dataset_path(data_dir / "raw", ticker)
+    proc_path = dataset_path(data_dir / "processed", ticker)
+    eda_log_path = data_dir / "logs" / f"{ticker}_eda.json"
+
+    df, ingest_info = ingest(ticker, raw_path, source or YFinanceSource())
+    close_col = close_column(df)
+    summary = eda_summary(ticker, df, ingest_info, validate_frame(df), close_col)
+
+    _, feature_stats = build_features(df, proc_path, close_col)
+    summary["feature_cache"] = feature_stats
+    eda_log_path.write_text(json.dumps(summary, indent=2))
+
+    return EdaResult(
+        ticker=ticker,
+        raw_path=raw_path,
+        processed_path=proc_path,
+        eda_log_path=eda_log_path,
+        rows=int(len(df)),
+        close_col=close_col,
+        summary=summary,
+    )
+
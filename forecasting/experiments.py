@@ -0,0 +1,520 @@
+"""
+Model experiments & selection (the logic behind `02_Model_Experiments`).
+
+Trains the candidate models on `data/processed/{TICKER}.parquet`, logs metrics to
+`data/logs/{TICKER}_experiments.json`, archives `models/latest/{TICKER}` and saves
+the best model there, with its validation backtest and forward forecast
+(`forecast.json`, published to the database by the backend's finalize stage). `run_experiments_stage` is the
+whole stage for one ticker (the backend's script mode); `run_batch` does this for many tickers in one process,
+reusing imported libraries and compiled LSTM graphs between tickers.
+"""
+import json
+import pickle
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from forecasting.metrics import mae, mape, r2, rmse
+from forecasting.features import load_features
+from forecasting.storage import dataset_path, frame_exists
+
+LSTM_WINDOW = 30
+LSTM_EPOCHS = 10
+LSTM_WARM_EPOCHS = 2       # epochs when continuing from the previous weights
+ARIMA_REFIT_TOLERANCE = 1.25  # an extended ARIMA is refit when its validation RMSE grows past this factor
+FORECAST_STEPS = 30  # business days forecast past the last observation
+INTERVAL_Z = 1.96    # forecast band: predicted +/- z * validation RMSE
+# per-candidate predictions kept on the artifact for `forecast.json` (not pickled)
+PREDICTION_KEYS = ("val_pred", "future_pred")
+
+
+def safe_json(obj):
+    # ensure JSON serializable
+    if isinstance(obj, (np.floating, np.integer)):
+        return obj.item()
+    return obj
+
+
+def scores(y_true, y_pred) -> dict:
+    return {
+        "rmse": rmse(y_true, y_pred),
+        "mape": mape(y_true, y_pred),
+        "mae": mae(y_true, y_pred),
+        "r2": r2(y_true, y_pred),
+    }
+
+
+@dataclass
+class ExperimentData:
+    ticker: str
+    df: pd.DataFrame
+    train_df: pd.DataFrame
+    val_df: pd.DataFrame
+    close_col: str
+    y_train: np.ndarray
+    y_val: np.ndarray
+    date_min: str
+    date_max: str
+
+
+def load_dataset(root: Path, ticker: str) -> ExperimentData:
+    proc_path = dataset_path(Path(root) / "data" / "processed", ticker)
+    if not frame_exists(proc_path):
+        raise FileNotFoundError(f"Processed dataset not found: {proc_path}")
+
+    df = load_features(proc_path)
+    df = df.sort_values("date").reset_index(drop=True)
+
+    close_col = "adj_close" if "adj_close" in df.columns else "close"
+    if close_col not in df.columns:
+        raise ValueError(f"Expected close column not found in processed data. Found: {list(df.columns)}")
+
+    train_df = df[df["split"] == "train"].copy()
+    val_df = df[df["split"] == "val"].copy()
+
+    return ExperimentData(
+        ticker=ticker,
+        df=df,
+        train_df=train_df,
+        val_df=val_df,
+        close_col=close_col,
+        y_train=train_df[close_col].astype(float).values,
+        y_val=val_df[close_col].astype(float).values,
+        date_min=df["date"].min().date().isoformat(),
+        date_max=df["date"].max().date().isoformat(),
+    )
+
+
+def future_dates(data: ExperimentData, steps: int) -> pd.DatetimeIndex:
+    return pd.bdate_range(pd.Timestamp(data.date_max) + pd.offsets.BDay(1), periods=steps)
+
+
+def _arima_warm_fit(data: ExperimentData, warm_start: dict) -> Tuple[object, dict]:
+    """
+    The previous fit's parameters applied to the grown training series (state-space
+    filtering only). Refit from those parameters when that validates much worse.
+    """
+    from forecasting.arima import fit_order
+
+    previous = warm_start["fit"]
+    fit = previous.apply(data.y_train)
+    val_rmse = scores(data.y_val, fit.forecast(steps=len(data.y_val)))["rmse"]
+    limit = warm_start.get("val_rmse")
+    if limit is None or val_rmse <= ARIMA_REFIT_TOLERANCE * limit:
+        return fit, {"warm_start": "extended"}
+    refit = fit_order(data.y_train, warm_start["order"], start_params=previous.params)
+    return refit, {"warm_start": "refit", "extended_rmse": val_rmse}
+
+
+def train_arima(
+    data: ExperimentData,
+    *,
+    time_budget_s: Optional[float] = 600,
+    max_workers: Optional[int] = None,
+    forecast_steps: int = FORECAST_STEPS,
+    warm_start: Optional[dict] = None,
+) -> Tuple[dict, Optional[dict]]:
+    """
+    `max_workers` sizes the order search's process pool (see `grid_search`). `warm_start`
+    (the previous ARIMA artifact) skips the order search: see `_arima_warm_fit`.
+    """
+    try:
+        from forecasting.arima import grid_search
+
+        if warm_start is not None:
+            best_fit, info = _arima_warm_fit(data, warm_start)
+            best = {"order": tuple(warm_start["order"]), **info}
+        else:
+            # small grid (kept light for automation)
+            best, best_fit, search_info = grid_search(
+                data.y_train, data.y_val, max_workers=max_workers, time_budget_s=time_budget_s
+            )
+            best = {**best, "search": search_info}
+        val_pred = np.asarray(best_fit.forecast(steps=len(data.y_val)), dtype=float)
+        # forward forecast continues from the end of validation, parameters unchanged
+        future_pred = np.asarray(best_fit.append(data.y_val).forecast(steps=forecast_steps), dtype=float)
+
+        result = {"model": "ARIMA", "status": "ok", **best, **scores(data.y_val, val_pred)}
+        artifact = {"type": "ARIMA", "order": best["order"], "fit": best_fit, "val_rmse": result["rmse"],
+                    "val_pred": val_pred, "future_pred": future_pred}
+        return result, artifact
+    except Exception as e:
+        return {"model": "ARIMA", "status": "error", "error": str(e)}, None
+
+
+def train_prophet(
+    data: ExperimentData,
+    *,
+    forecast_steps: int = FORECAST_STEPS,
+    warm_start: Optional[dict] = None,
+) -> Tuple[dict, Optional[dict]]:
+    """`warm_start` (the previous Prophet artifact) initialises the fit from its parameters."""
+    try:
+        from prophet import Prophet
+
+        close_col = data.close_col
+        p_train = data.train_df[["date", close_col]].rename(columns={"date": "ds", close_col: "y"})
+        p_val = data.val_df[["date", close_col]].rename(columns={"date": "ds", close_col: "y"})
+
+        m = Prophet(daily_seasonality=False, weekly_seasonality=True, yearly_seasonality=True)
+        if warm_start is not None:
+            from prophet.utilities import warm_start_params
+
+            m.fit(p_train, init=warm_start_params(warm_start["model"]))
+        else:
+            m.fit(p_train)
+
+        forecast = m.predict(p_val[["ds"]])
+        pred = forecast["yhat"].values
+        future = m.predict(pd.DataFrame({"ds": future_dates(data, forecast_steps)}))
+
+        result = {
+            "model": "Prophet",
+            "status": "ok",
+            **scores(p_val["y"].values, pred),
+        }
+        if warm_start is not None:
+            result["warm_start"] = "initialized"
+        artifact = {"type": "Prophet", "model": m,
+                    "val_pred": np.asarray(pred, dtype=float), "future_pred": future["yhat"].values.astype(float)}
+        return result, artifact
+    except Exception as e:
+        return {"model": "Prophet", "status": "error", "error": str(e)}, None
+
+
+class LSTMModelCache:
+    """
+    Keeps one compiled LSTM per (window, horizon, n_features) and resets it to its initial
+    weights and a fresh optimizer state between tickers, so later fits reuse the
+    already traced training and rollout graphs instead of rebuilding them.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[int, int, int], Tuple[object, list]] = {}
+
+    def get(self, window: int, horizon: int, n_features: int = 1):
+        import tensorflow as tf
+        from forecasting.lstm import build_model
+
+        key = (window, horizon, n_features)
+        entry = self._models.get(key)
+        if entry is None:
+            tf.random.set_seed(42)
+            model = build_model(window, n_features=n_features, horizon=horizon)
+            self._models[key] = (model, [w.copy() for w in model.get_weights()])
+            return model
+
+        model, initial_weights = entry
+        model.set_weights(initial_weights)
+        variables = model.optimizer.variables
+        for var in (variables() if callable(variables) else variables):
+            var.assign(np.zeros(var.shape, dtype=var.dtype))
+        return model
+
+
+def train_lstm(
+    data: ExperimentData,
+    *,
+    mode: str = "recursive",
+    horizon: int = 30,
+    model_cache: Optional[LSTMModelCache] = None,
+    forecast_steps: int = FORECAST_STEPS,
+    warm_start: Optional[dict] = None,
+    features: Sequence[str] = (),
+) -> Tuple[dict, Optional[dict]]:
+    """
+    `mode="recursive"` rolls one-step predictions forward; `"direct"` predicts `horizon` steps per call.
+    `features` (processed columns such as `roll_vol_20` or `volume`, see `windows.DEFAULT_FEATURES`)
+    are fed next to the close price; the forecasts hold them at their last observed values.
+    `warm_start` (the previous LSTM artifact, same window/mode/horizon/features) continues from its
+    weights and scaling for LSTM_WARM_EPOCHS epochs.
+    """
+    try:
+        import tensorflow as tf
+        from forecasting.lstm import build_model, direct_forecast, recursive_forecast
+        from forecasting.windows import feature_matrix, sliding_windows
+
+        y_train, y_val = data.y_train, data.y_val
+        window = LSTM_WINDOW
+        horizon = horizon if mode == "direct" else 1
+        # columns the processed data lacks (e.g. no volume) are left out
+        features = [c for c in features if c in data.df.columns and c != data.close_col]
+        architecture = (window, mode, horizon, features)
+        if warm_start is not None and (
+            warm_start.get("window"), warm_start.get("mode"), warm_start.get("horizon"), list(warm_start.get("features", []))
+        ) != architecture:
+            warm_start = None  # a different architecture: nothing to continue from
+
+        # normalize each column using train stats (kept from the previous fit when continuing it)
+        train_values = feature_matrix(data.train_df, data.close_col, features)
+        val_values = feature_matrix(data.val_df, data.close_col, features)
+        if warm_start is not None:
+            mu, sigma = float(warm_start["mu"]), float(warm_start["sigma"])
+            feature_mu, feature_sigma = warm_start.get("feature_mu", []), warm_start.get("feature_sigma", [])
+        else:
+            mu = float(np.mean(y_train))
+            sigma = float(np.std(y_train) + 1e-8)
+            feature_mu = train_values[:, 1:].mean(axis=0, dtype=np.float64).tolist()
+            feature_sigma = (train_values[:, 1:].std(axis=0, dtype=np.float64) + 1e-8).tolist()
+        scale_mu = np.asarray([mu, *feature_mu], dtype=np.float32)
+        scale_sigma = np.asarray([sigma, *feature_sigma], dtype=np.float32)
+        train_s = (train_values - scale_mu) / scale_sigma
+
+        # zero-copy float32 window views, target in column 0
+        Xtr, Ytr = sliding_windows(train_s, window, horizon)
+
+        # train small, deterministic-ish (same seed for fresh and cached models)
+        n_features = train_s.shape[1]
+        if model_cache is not None:
+            model = model_cache.get(window, horizon, n_features)
+        else:
+            tf.random.set_seed(42)
+            model = build_model(window, n_features=n_features, horizon=horizon)
+        epochs = LSTM_EPOCHS
+        if warm_start is not None:
+            model.set_weights(warm_start["weights"])
+            epochs = LSTM_WARM_EPOCHS
+        tf.random.set_seed(42)
+        model.fit(Xtr, Ytr, epochs=epochs, batch_size=32, verbose=0)
+
+        # multi-step forecast over validation horizon
+        if mode == "direct":
+            preds_s = direct_forecast(model, train_s, len(y_val))
+        else:
+            preds_s = recursive_forecast(model, train_s, len(y_val))
+        preds = np.asarray(preds_s, dtype=float) * sigma + mu
+
+        # forward forecast seeded with the validation data the model never trained on
+        seed = np.concatenate([train_s, (val_values - scale_mu) / scale_sigma])
+        if mode == "direct":
+            future_s = direct_forecast(model, seed, forecast_steps)
+        else:
+            future_s = recursive_forecast(model, seed, forecast_steps)
+        future = np.asarray(future_s, dtype=float) * sigma + mu
+
+        result = {
+            "model": "LSTM",
+            "status": "ok",
+            **scores(y_val, preds),
+            "window": window,
+            "epochs": epochs,
+            "mode": mode,
+            "horizon": horizon,
+            "features": features,
+        }
+        if warm_start is not None:
+            result["warm_start"] = "continued"
+        # store picklable bundle
+        artifact = {
+            "type": "LSTM",
+            "model_json": model.to_json(),
+            "weights": model.get_weights(),
+            "mu": mu,
+            "sigma": sigma,
+            "features": features,
+            "feature_mu": feature_mu,
+            "feature_sigma": feature_sigma,
+            "window": window,
+            "mode": mode,
+            "horizon": horizon,
+            "val_rmse": result["rmse"],
+            "val_pred": preds,
+            "future_pred": future,
+        }
+        return result, artifact
+    except Exception as e:
+        return {"model": "LSTM", "status": "error", "error": str(e)}, None
+
+
+def select_best(results: List[dict]) -> dict:
+    ok = [r for r in results if r.get("status") == "ok"]
+    if not ok:
+        raise RuntimeError(f"No models trained successfully: {results}")
+    return sorted(ok, key=lambda r: r["rmse"])[0]
+
+
+def write_experiment_log(root: Path, data: ExperimentData, results: List[dict], best: dict) -> Tuple[dict, Path]:
+    log_dir = Path(root) / "data" / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    path = log_dir / f"{data.ticker}_experiments.json"
+
+    experiment_log = {
+        "ticker": data.ticker,
+        "generated_at_utc": datetime.utcnow().isoformat() + "Z",
+        "data_range": {"min": data.date_min, "max": data.date_max},
+        "n_train": int(len(data.train_df)),
+        "n_val": int(len(data.val_df)),
+        "target": data.close_col,
+        "results": results,
+        "best": best,
+    }
+    path.write_text(json.dumps(experiment_log, indent=2, default=safe_json))
+    return experiment_log, path
+
+
+def archive_latest_if_exists(latest_dir: Path, archive_base: Path):
+    if latest_dir.exists() and any(latest_dir.iterdir()):
+        ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        dest = archive_base / ts
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            shutil.rmtree(dest)
+        shutil.move(str(latest_dir), str(dest))
+        latest_dir.mkdir(parents=True, exist_ok=True)
+        return str(dest)
+    latest_dir.mkdir(parents=True, exist_ok=True)
+    return None
+
+
+def forecast_points(data: ExperimentData, val_pred, future_pred, band_rmse: float) -> dict:
+    """
+    Validation backtest (with actuals) followed by the forward forecast, in the
+    shape of the API's forecast points.
+    """
+    half_width = INTERVAL_Z * float(band_rmse)
+    dates = list(data.val_df["date"]) + list(future_dates(data, len(future_pred)))
+    actuals = list(data.y_val) + [None] * len(future_pred)
+    predicted = np.concatenate([np.asarray(val_pred, dtype=float), np.asarray(future_pred, dtype=float)])
+
+    points = []
+    for day, actual, pred in zip(dates, actuals, predicted):
+        pred = float(pred)
+        points.append({
+            "date": pd.Timestamp(day).date().isoformat(),
+            "actual": None if actual is None else float(actual),
+            "predicted": pred,
+            "lower": pred - half_width,
+            "upper": pred + half_width,
+        })
+    return {"ticker": data.ticker, "steps": len(future_pred), "points": points}
+
+
+def save_best_artifact(
+    root: Path,
+    data: ExperimentData,
+    best: dict,
+    artifacts: Dict[str, Optional[dict]],
+    extra: Optional[dict] = None,
+) -> dict:
+    """
+    Archives `models/latest/{TICKER}` and writes `model.pkl`, `metadata.json` and `forecast.json` for `best`.
+    `extra` fields are added to the metadata.
+    """
+    best_type = best["model"]
+    if best_type not in artifacts:
+        raise ValueError(f"Unknown best model type: {best_type}")
+
+    models_dir = Path(root) / "models"
+    latest_dir = models_dir / "latest" / data.ticker
+    archive_base = models_dir / "archived" / data.ticker
+    for d in (models_dir, latest_dir, archive_base):
+        d.mkdir(parents=True, exist_ok=True)
+
+    archived_to = archive_latest_if_exists(latest_dir, archive_base)
+
+    artifact = artifacts[best_type]
+    with (latest_dir / "model.pkl").open("wb") as f:
+        pickle.dump({k: v for k, v in artifact.items() if k not in PREDICTION_KEYS}, f)
+
+    forecast_file = None
+    if all(k in artifact for k in PREDICTION_KEYS):
+        forecast_file = "forecast.json"
+        forecast = forecast_points(data, artifact["val_pred"], artifact["future_pred"], best["rmse"])
+        (latest_dir / forecast_file).write_text(json.dumps(forecast, default=safe_json))
+
+    metadata = {
+        "ticker": data.ticker,
+        "model_type": best_type,
+        "trained_at_utc": datetime.utcnow().isoformat() + "Z",
+        "metrics": {k: best[k] for k in ("rmse", "mape", "mae", "r2") if k in best},
+        "data_range": {"min": data.date_min, "max": data.date_max},
+        "target": data.close_col,
+        "forecast_file": forecast_file,
+        "archived_previous_to": archived_to,
+        **(extra or {}),
+    }
+    (latest_dir / "metadata.json").write_text(json.dumps(metadata, indent=2, default=safe_json))
+    return metadata
+
+
+@dataclass
+class ExperimentsResult:
+    ticker: str
+    best_model: str
+    metrics: dict
+    experiment_log: dict
+    metadata: dict
+    model_dir: Path
+
+
+def run_experiments_stage(
+    ticker: str,
+    root: Path,
+    *,
+    arima_time_budget_s: Optional[float] = 600,
+    lstm_mode: str = "recursive",
+    lstm_horizon: int = 30,
+    lstm_features: Sequence[str] = (),
+    lstm_cache: Optional[LSTMModelCache] = None,
+) -> ExperimentsResult:
+    """Runs the full experiment stage for one ticker (trains, selects, saves `models/latest/{TICKER}`)."""
+    data = load_dataset(root, ticker)
+
+    arima_result, arima_artifact = train_arima(data, time_budget_s=arima_time_budget_s)
+    prophet_result, prophet_artifact = train_prophet(data)
+    lstm_result, lstm_artifact = train_lstm(
+        data, mode=lstm_mode, horizon=lstm_horizon, features=lstm_features, model_cache=lstm_cache
+    )
+
+    results = [arima_result, prophet_result, lstm_result]
+    best = select_best(results)
+    experiment_log, _ = write_experiment_log(root, data, results, best)
+    metadata = save_best_artifact(root, data, best, {
+        "ARIMA": arima_artifact,
+        "Prophet": prophet_artifact,
+        "LSTM": lstm_artifact,
+    })
+    return ExperimentsResult(
+        ticker=data.ticker,
+        best_model=best["model"],
+        metrics=metadata["metrics"],
+        experiment_log=experiment_log,
+        metadata=metadata,
+        model_dir=Path(root) / "models" / "latest" / data.ticker,
+    )
+
+
+def run_experiments(ticker: str, root: Path, **kwargs) -> dict:
+    """`run_experiments_stage`, returning only the experiment log."""
+    return run_experiments_stage(ticker, root, **kwargs).experiment_log
+
+
+def run_batch(
+    tickers: Iterable[str],
+    root: Path,
+    *,
+    on_done: Optional[Callable[[str, Optional[dict], Optional[Exception]], None]] = None,
+    **kwargs,
+) -> Dict[str, dict]:
+    """
+    Runs `run_experiments` for each ticker in this process with a shared LSTM
+    model cache. A failing ticker doesn't stop the batch; `on_done(ticker, log, error)`
+    is called after each one. Returns the experiment logs of the tickers that succeeded.
+    """
+    kwargs.setdefault("lstm_cache", LSTMModelCache())
+    logs: Dict[str, dict] = {}
+    for ticker in tickers:
+        try:
+            logs[ticker] = run_experiments(ticker, root, **kwargs)
+        except Exception as e:
+            if on_done is not None:
+                on_done(ticker, None, e)
+            continue
+        if on_done is not None:
+            on_done(ticker, logs[ticker], None)
+    return logs
@@ -0,0 +1,180 @@
+"""
+Content-addressed feature cache for the preprocessing stage.
+
+`data/processed/{TICKER}.parquet` doubles as the feature store. A manifest next to
+it records the feature-spec hash and the hash of the cleaned source rows the
+features were computed from:
+
+- same spec, same source hash → **hit**, the stored features are reused as is
+- same spec, stored source rows unchanged and new rows appended → **partial**,
+  rolling features are computed only for the new rows, with the trailing stored
+  rows (longest window) as state
+- anything else (new spec, revised history, no manifest) → **miss**, full recompute
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from forecasting.storage import frame_exists, read_frame, write_frame
+
+SPEC_VERSION = 1
+WINDOWS = (5, 10, 20)
+VAL_FRACTION = 0.2
+
+
+def feature_spec(close_col: str, windows=WINDOWS) -> dict:
+    return {"version": SPEC_VERSION, "target": close_col, "returns": True, "windows": list(windows)}
+
+
+def spec_hash(spec: dict) -> str:
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def manifest_path(proc_path: Path) -> Path:
+    proc_path = Path(proc_path)
+    return proc_path.with_name(f"{proc_path.stem}.manifest.json")
+
+
+def read_manifest(proc_path: Path) -> Optional[dict]:
+    path = manifest_path(proc_path)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except ValueError:
+        return None
+
+
+def base_frame(df: pd.DataFrame, close_col: str) -> pd.DataFrame:
+    """Cleaned source rows the features are computed from (`date`, close, optional `volume`)."""
+    base = df[["date", close_col] + (["volume"] if "volume" in df.columns else [])].copy()
+    base = base.sort_values("date").drop_duplicates(subset=["date"]).reset_index(drop=True)
+
+    # basic cleaning
+    base[close_col] = base[close_col].astype(float)
+    if "volume" in base.columns:
+        base["volume"] = pd.to_numeric(base["volume"], errors="coerce").astype(float)
+
+    return base.dropna(subset=["date", close_col]).reset_index(drop=True)
+
+
+def frame_hash(base: pd.DataFrame) -> str:
+    h = hashlib.sha256()
+    for col in base.columns:
+        values = base[col].values
+        if col == "date":
+            values = values.astype("datetime64[ns]").view("int64")
+        h.update(col.encode())
+        h.update(np.ascontiguousarray(values).tobytes())
+    return h.hexdigest()[:16]
+
+
+def compute_features(
+    base: pd.DataFrame,
+    close_col: str,
+    *,
+    state: Optional[pd.DataFrame] = None,
+    windows=WINDOWS,
+) -> pd.DataFrame:
+    """
+    Adds `returns`, `roll_mean_{w}` and `roll_vol_{w}` to `base`. `state` holds the
+    stored rows right before `base` (at least `max(windows)` of them, with their
+    `returns`); only `base` rows are returned. Rows with incomplete windows are dropped.
+    """
+    n_state = 0
+    frame = base
+    if state is not None and len(state):
+        n_state = len(state)
+        frame = pd.concat([state[base.columns.tolist() + ["returns"]], base], ignore_index=True)
+
+    frame = frame.copy()
+    returns = frame[close_col].pct_change()
+    if n_state:
+        # keep the stored returns of the state rows; only new rows get computed ones
+        returns.iloc[:n_state] = frame["returns"].iloc[:n_state]
+    frame["returns"] = returns
+    for w in windows:
+        frame[f"roll_mean_{w}"] = frame[close_col].rolling(w).mean()
+        frame[f"roll_vol_{w}"] = frame["returns"].rolling(w).std()
+
+    # final clean
+    frame = frame.iloc[n_state:]
+    frame = frame.replace([np.inf, -np.inf], np.nan)
+    return frame.dropna().reset_index(drop=True)
+
+
+def time_split(proc: pd.DataFrame, val_fraction: float = VAL_FRACTION) -> pd.DataFrame:
+    """Time-aware split: the last `val_fraction` of rows are `val`."""
+    proc = proc.copy()
+    split_idx = int(len(proc) * (1 - val_fraction))
+    proc["split"] = "train"
+    proc.loc[split_idx:, "split"] = "val"
+    return proc
+
+
+def build_features(df: pd.DataFrame, proc_path: Path, close_col: str) -> Tuple[pd.DataFrame, dict]:
+    """
+    Returns the processed frame (features + `split`) for the raw rows in `df`,
+    reusing `proc_path` where the cache key allows, and writes it back with its
+    manifest. The second value reports the cache outcome for the EDA log.
+    """
+    proc_path = Path(proc_path)
+    spec = feature_spec(close_col)
+    key_spec = spec_hash(spec)
+    base = base_frame(df, close_col)
+    key_source = frame_hash(base)
+    max_window = max(spec["windows"])
+
+    manifest = read_manifest(proc_path)
+    stored = None
+    if manifest is not None and manifest.get("spec_hash") == key_spec and frame_exists(proc_path):
+        stored = read_frame(proc_path)
+
+    stats = {"status": "miss", "spec_hash": key_spec, "source_hash": key_source, "rows_reused": 0, "rows_computed": 0}
+
+    if stored is not None and manifest.get("source_hash") == key_source:
+        stats.update(status="hit", rows_reused=int(len(stored)))
+        return stored, stats
+
+    proc = None
+    if stored is not None and len(stored) >= max_window:
+        last_date = pd.Timestamp(manifest["last_date"])
+        prefix = base[base["date"] <= last_date]
+        # only append when the rows the cache was built from are unchanged
+        if len(prefix) == manifest.get("source_rows") and frame_hash(prefix) == manifest.get("source_hash"):
+            state = stored.drop(columns=["split"], errors="ignore").tail(max_window)
+            new_rows = compute_features(base.iloc[len(prefix):], close_col, state=state)
+            proc = pd.concat([stored.drop(columns=["split"], errors="ignore"), new_rows], ignore_index=True)
+            stats.update(status="partial", rows_reused=int(len(stored)), rows_computed=int(len(new_rows)))
+
+    if proc is None:
+        proc = compute_features(base, close_col)
+        stats.update(rows_computed=int(len(proc)))
+
+    proc = time_split(proc)
+    write_frame(proc, proc_path)
+    manifest_path(proc_path).write_text(json.dumps({
+        "spec": spec,
+        "spec_hash": key_spec,
+        "source_hash": key_source,
+        "source_rows": int(len(base)),
+        "last_date": base["date"].max().isoformat(),
+        "rows": int(len(proc)),
+    }, indent=2))
+    return proc, stats
+
+
+def load_features(proc_path: Path) -> pd.DataFrame:
+    """Reads the processed features, refusing a cache built with another feature spec."""
+    manifest = read_manifest(proc_path)
+    if manifest is not None:
+        expected = spec_hash(feature_spec(manifest["spec"]["target"]))
+        if manifest.get("spec_hash") != expected:
+            raise ValueError(
+                f"Features in {proc_path} were built with another feature spec; rerun preprocessing (01_EDA_Preprocessing)"
+            )
+    return read_frame(proc_path)
@@ -0,0 +1,148 @@
+"""
+On-demand forecasts from the deployed model (the serving side of `save_best_artifact`).
+
+`load_deployed` unpickles the deployed model once: the pipeline's pick in
+`models/latest/{TICKER}/model.pkl`, or, once another candidate has been deployed in
+its place, that candidate's last fit (`data/pipeline/{TICKER}/candidates/{model}.pkl`).
+`forecast` then continues the ticker's current processed series for any number of business days,
+without retraining: ARIMA re-applies its fitted parameters to the series, the LSTM
+is seeded with its last window and Prophet extends its fitted trend/seasonality.
+"""
+import json
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from forecasting.experiments import INTERVAL_Z
+from forecasting.features import load_features
+from forecasting.storage import dataset_path, frame_exists
+from forecasting.windows import feature_matrix
+
+
+@dataclass
+class DeployedModel:
+    ticker: str
+    model_type: str
+    metadata: dict
+    artifact: dict = field(repr=False)
+    nbytes: int  # size of model.pkl, the registry's memory estimate
+
+
+def model_dir(root: Path, ticker: str) -> Path:
+    return Path(root) / "models" / "latest" / ticker
+
+
+def candidate_path(root: Path, ticker: str, model: str) -> Path:
+    return Path(root) / "data" / "pipeline" / ticker / "candidates" / f"{model}.pkl"
+
+
+def load_deployed(root: Path, ticker: str, model: Optional[str] = None) -> DeployedModel:
+    """
+    Reads `metadata.json` and `model.pkl`, or the `model` candidate's artifact when the
+    pipeline picked a different one (its metrics then come from that candidate's fit).
+    An LSTM is rebuilt from its JSON config and weights.
+    """
+    latest_dir = model_dir(root, ticker)
+    meta_path, model_path = latest_dir / "metadata.json", latest_dir / "model.pkl"
+    metadata = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+
+    if model is not None and model != metadata.get("model_type"):
+        model_path = candidate_path(root, ticker, model)
+        if not model_path.exists():
+            raise FileNotFoundError(f"No artifact for {ticker}'s deployed model {model} ({model_path})")
+    elif not meta_path.exists() or not model_path.exists():
+        raise FileNotFoundError(f"No deployed model for {ticker} in {latest_dir}")
+
+    with model_path.open("rb") as f:
+        artifact = pickle.load(f)
+    if model_path.parent != latest_dir:
+        # same target and training run as the pipeline's pick; the band comes from this fit
+        metadata = {**metadata, "model_type": model, "metrics": {"rmse": artifact.get("val_rmse", 0.0)}}
+
+    if artifact["type"] == "LSTM":
+        import tensorflow as tf
+
+        model = tf.keras.models.model_from_json(artifact["model_json"])
+        model.set_weights(artifact["weights"])
+        artifact = {**artifact, "keras_model": model}
+
+    return DeployedModel(
+        ticker=ticker,
+        model_type=artifact["type"],
+        metadata=metadata,
+        artifact=artifact,
+        nbytes=model_path.stat().st_size,
+    )
+
+
+def load_history(root: Path, ticker: str, target: str, features: Sequence[str] = ()) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Dates and values of `target` in `data/processed/{TICKER}`, oldest first; with
+    `features`, a matrix with `target` in column 0 and one column per feature.
+    """
+    proc_path = dataset_path(Path(root) / "data" / "processed", ticker)
+    if not frame_exists(proc_path):
+        raise FileNotFoundError(f"Processed dataset not found: {proc_path}")
+    df = load_features(proc_path).sort_values("date")
+    if features:
+        missing = [c for c in features if c not in df.columns]
+        if missing:
+            raise ValueError(f"Processed dataset of {ticker} lacks the model's features {missing}")
+        return df["date"], feature_matrix(df, target, features)
+    return df["date"], df[target].astype(float).values
+
+
+def predict(deployed: DeployedModel, dates: pd.Series, y: np.ndarray, steps: int) -> np.ndarray:
+    artifact = deployed.artifact
+    kind = artifact["type"]
+    if kind == "ARIMA":
+        # same parameters, state filtered through the current series
+        return np.asarray(artifact["fit"].apply(y).forecast(steps=steps), dtype=float)
+    if kind == "Prophet":
+        future = pd.bdate_range(pd.Timestamp(dates.iloc[-1]) + pd.offsets.BDay(1), periods=steps)
+        return artifact["model"].predict(pd.DataFrame({"ds": future}))["yhat"].values.astype(float)
+    if kind == "LSTM":
+        from forecasting.lstm import direct_forecast, recursive_forecast
+
+        mu, sigma = artifact["mu"], artifact["sigma"]
+        # target (and covariate columns) scaled with the training stats
+        scale_mu = np.asarray([mu, *artifact.get("feature_mu", [])])
+        scale_sigma = np.asarray([sigma, *artifact.get("feature_sigma", [])])
+        seed = (y - scale_mu) / scale_sigma
+        rollout = direct_forecast if artifact.get("mode") == "direct" else recursive_forecast
+        return np.asarray(rollout(artifact["keras_model"], seed, steps), dtype=float) * sigma + mu
+    raise ValueError(f"Unknown model type: {kind}")
+
+
+def forecast(deployed: DeployedModel, root: Path, steps: int) -> dict:
+    """
+    `steps` business days past the last processed observation, in the shape of the
+    API's forecast points (band: predicted +/- z * validation RMSE).
+    """
+    target = deployed.metadata.get("target", "adj_close")
+    dates, y = load_history(root, deployed.ticker, target, deployed.artifact.get("features") or ())
+    predicted = predict(deployed, dates, y, steps)
+
+    half_width = INTERVAL_Z * float(deployed.metadata.get("metrics", {}).get("rmse", 0.0))
+    future = pd.bdate_range(pd.Timestamp(dates.iloc[-1]) + pd.offsets.BDay(1), periods=steps)
+    return {
+        "ticker": deployed.ticker,
+        "horizon": steps,
+        "model": deployed.model_type,
+        "trained_at": deployed.metadata.get("trained_at_utc"),
+        "data_end": pd.Timestamp(dates.iloc[-1]).date().isoformat(),
+        "points": [
+            {
+                "date": day.date().isoformat(),
+                "actual": None,
+                "predicted": float(pred),
+                "lower": float(pred) - half_width,
+                "upper": float(pred) + half_width,
+            }
+            for day, pred in zip(future, predicted)
+        ],
+    }
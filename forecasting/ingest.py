@@ -0,0 +1,178 @@
+"""
+Incremental market-data ingestion.
+
+Reads the last stored date from `data/raw/{TICKER}.parquet`, fetches only the missing
+tail from a `DataSource`, then appends and de-duplicates by date. The re-fetched overlap
+is checked against the stored rows first: when the provider has rescaled history
+(dividend/split adjustments), the whole series is downloaded again instead.
+"""
+import logging
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from forecasting.storage import coerce_types, frame_exists, read_frame, write_frame
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Date column + snake_case column names, as stored in `data/raw`."""
+    if isinstance(df.columns, pd.MultiIndex):
+        # yfinance returns (field, ticker) columns even for a single ticker
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+
+    df = df.reset_index().rename(columns={"Date": "date", "index": "date"})
+    df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+    df["date"] = pd.to_datetime(df["date"], utc=False)
+    if getattr(df["date"].dt, "tz", None) is not None:
+        df["date"] = df["date"].dt.tz_localize(None)
+    return df
+
+
+class DataSource(ABC):
+    """Daily OHLCV provider used by `ingest`."""
+
+    @abstractmethod
+    def fetch(self, ticker: str, start: Optional[date] = None) -> pd.DataFrame:
+        """
+        Returns normalized rows (see `normalize_ohlcv`) dated on/after `start`,
+        or the full available history when `start` is None.
+        """
+
+
+class YFinanceSource(DataSource):
+    def fetch(self, ticker: str, start: Optional[date] = None) -> pd.DataFrame:
+        import yfinance as yf
+
+        kwargs = {"start": start.isoformat()} if start is not None else {"period": "max"}
+        df = yf.download(ticker, auto_adjust=False, progress=False, **kwargs)
+        if df is None or df.empty:
+            return pd.DataFrame()
+        return normalize_ohlcv(df)
+
+
+class LocalFileSource(DataSource):
+    """Serves `{directory}/{TICKER}.csv` files (offline reruns and tests)."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def fetch(self, ticker: str, start: Optional[date] = None) -> pd.DataFrame:
+        path = self.directory / f"{ticker}.csv"
+        if not path.exists():
+            return pd.DataFrame()
+        df = pd.read_csv(path, parse_dates=["date"])
+        if start is not None:
+            df = df[df["date"] >= pd.Timestamp(start)]
+        return df.reset_index(drop=True)
+
+
+# adjusted prices are rescaled over the whole history after dividends and splits
+OVERLAP_COLUMNS = ("adj_close", "close")
+OVERLAP_RTOL = 1e-4
+
+
+def overlap_difference(existing: pd.DataFrame, fetched: pd.DataFrame) -> Optional[float]:
+    """
+    Largest relative difference of the price columns on the dates both frames have,
+    leaving out the last stored bar (it may have been an unfinished day). None when
+    nothing overlaps.
+    """
+    last_stored = existing["date"].max()
+    columns = [c for c in OVERLAP_COLUMNS if c in existing.columns and c in fetched.columns]
+    old = existing[existing["date"] < last_stored].drop_duplicates("date", keep="last").set_index("date")
+    new = fetched.drop_duplicates("date", keep="last").set_index("date")
+    dates = old.index.intersection(new.index)
+    if not columns or dates.empty:
+        return None
+    a = old.loc[dates, columns].to_numpy(dtype="float64")
+    b = new.loc[dates, columns].to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel = np.abs(b - a) / np.abs(a)
+    rel = rel[~np.isnan(rel)]
+    return float(rel.max()) if rel.size else None
+
+
+def _read_raw(raw_path: Path) -> pd.DataFrame:
+    if not frame_exists(raw_path):
+        return pd.DataFrame()
+    return read_frame(raw_path)
+
+
+def ingest(
+    ticker: str,
+    raw_path: Path,
+    source: DataSource,
+    *,
+    overlap_days: int = 5,
+    overlap_rtol: float = OVERLAP_RTOL,
+) -> Tuple[pd.DataFrame, dict]:
+    """
+    Brings `raw_path` up to date and returns `(full_history, info)`.
+
+    The last `overlap_days` before the stored tail are re-fetched so late
+    corrections to the newest bar replace the stored one (newest row wins).
+    Falls back to a full download when nothing is stored yet, the source's
+    columns no longer match the stored file, or the overlapping prices differ
+    by more than `overlap_rtol` (the provider re-adjusted its history). If that
+    re-download comes back empty, the stored history is kept as is (mode "stale").
+    """
+    raw_path = Path(raw_path)
+    existing = stored = _read_raw(raw_path)
+
+    mode = "full"
+    last_stored = None
+    overlap_diff = None
+    fetched = pd.DataFrame()
+    if not existing.empty:
+        last_stored = existing["date"].max()
+        start = (last_stored - timedelta(days=overlap_days)).date()
+        fetched = source.fetch(ticker, start)
+        mode = "incremental"
+        if not fetched.empty and set(fetched.columns) != set(existing.columns):
+            existing, mode = pd.DataFrame(), "full"
+        elif not fetched.empty:
+            overlap_diff = overlap_difference(existing, coerce_types(fetched))
+            if overlap_diff is not None and overlap_diff > overlap_rtol:
+                existing, mode = pd.DataFrame(), "full"
+
+    if mode == "full":
+        fetched = source.fetch(ticker, None)
+        if fetched.empty and not stored.empty:
+            logger.warning(
+                "Full re-download returned no data, stored history kept",
+                extra={"ticker": ticker, "last_stored_date": last_stored.isoformat(), "overlap_max_rel_diff": overlap_diff},
+            )
+            existing, mode = stored, "stale"
+
+    if existing.empty and fetched.empty:
+        raise RuntimeError(f"No data returned for ticker: {ticker}")
+
+    if existing.empty:
+        df = fetched
+    elif fetched.empty:
+        df = existing
+    else:
+        df = pd.concat([existing, coerce_types(fetched[existing.columns])], ignore_index=True)
+
+    df = df.drop_duplicates(subset=["date"], keep="last").sort_values("date").reset_index(drop=True)
+    new_rows = int(len(df) - len(existing))
+
+    if not fetched.empty:
+        write_frame(df, raw_path)
+
+    info = {
+        "mode": mode,
+        "last_stored_date": last_stored.isoformat() if last_stored is not None else None,
+        "overlap_max_rel_diff": overlap_diff,
+        "fetched_rows": int(len(fetched)),
+        "new_rows": new_rows,
+        "total_rows": int(len(df)),
+    }
+    return df, info
@@ -0,0 +1,110 @@
+"""
+LSTM model helpers and fast multi-step inference.
+
+`recursive_forecast` runs the whole recursive rollout as one compiled TensorFlow
+function (a direct `model(x, training=False)` per step inside the graph) instead
+of one `model.predict` call per forecast day. A direct multi-horizon model
+(`build_model(..., horizon=H)`) predicts H steps per call.
+
+A model with `n_features > 1` reads the target in column 0 and covariates in the
+other columns (`windows.feature_matrix`). Their future values are unknown, so
+both rollouts hold them at their last observed values while feeding the
+predicted target back.
+"""
+import numpy as np
+
+# compiled rollout, cached on the model itself: a module-level map keyed by the
+# model would keep it alive through the function's closure
+_ROLLOUT_ATTR = "_recursive_rollout"
+
+
+def build_model(window: int, n_features: int = 1, horizon: int = 1, units: int = 32):
+    from tensorflow import keras
+
+    model = keras.Sequential([
+        keras.layers.Input(shape=(window, n_features)),
+        keras.layers.LSTM(units),
+        keras.layers.Dense(horizon),
+    ])
+    model.compile(optimizer=keras.optimizers.Adam(1e-3), loss="mse")
+    return model
+
+
+def predict_loop(model, seed, steps: int) -> np.ndarray:
+    """Reference recursive forecast with one `model.predict` call per step (slow)."""
+    window = int(model.input_shape[1])
+    history = list(np.asarray(seed, dtype=np.float32)[-window:])
+    preds = []
+    for _ in range(steps):
+        x = np.asarray(history[-window:], dtype=np.float32)[None, :, None]
+        yhat = float(model.predict(x, verbose=0).ravel()[0])
+        preds.append(yhat)
+        history.append(yhat)
+    return np.asarray(preds, dtype=np.float32)
+
+
+def _seed_window(model, seed) -> np.ndarray:
+    """The last `window` rows of `seed` (1-D target, or target + covariate columns) as one model input."""
+    window, n_features = int(model.input_shape[1]), int(model.input_shape[2])
+    rows = np.asarray(seed, dtype=np.float32)
+    rows = rows[:, None] if rows.ndim == 1 else rows
+    return rows[-window:].reshape(1, window, n_features)
+
+
+def _rollout_fn(model):
+    rollout = model.__dict__.get(_ROLLOUT_ATTR)
+    if rollout is not None:
+        return rollout
+
+    import tensorflow as tf
+
+    window, n_features = int(model.input_shape[1]), int(model.input_shape[2])
+
+    @tf.function(
+        input_signature=[
+            tf.TensorSpec(shape=(1, window, n_features), dtype=tf.float32),
+            tf.TensorSpec(shape=(), dtype=tf.int32),
+        ],
+        reduce_retracing=True,
+    )
+    def rollout(x, steps):
+        preds = tf.TensorArray(tf.float32, size=steps)
+        for i in tf.range(steps):
+            yhat = model(x, training=False)[:, :1]
+            preds = preds.write(i, yhat[0, 0])
+            # the predicted target, covariates carried over from the last row
+            row = tf.concat([tf.reshape(yhat, (1, 1, 1)), x[:, -1:, 1:]], axis=2)
+            x = tf.concat([x[:, 1:, :], row], axis=1)
+        return preds.stack()
+
+    # plain __dict__ entry: bypasses Keras attribute tracking, so it is not
+    # treated as model state when saving
+    model.__dict__[_ROLLOUT_ATTR] = rollout
+    return rollout
+
+
+def recursive_forecast(model, seed, steps: int) -> np.ndarray:
+    """
+    Feeds each one-step prediction back as input for `steps` steps, starting from
+    the last `window` rows of `seed` (scaled like the training data).
+    """
+    if steps <= 0:
+        return np.zeros(0, dtype=np.float32)
+    return _rollout_fn(model)(_seed_window(model, seed), np.int32(steps)).numpy()
+
+
+def direct_forecast(model, seed, steps: int) -> np.ndarray:
+    """
+    Forecast with a multi-horizon model: one call yields `horizon` steps; longer
+    forecasts chain blocks, feeding each block back as input.
+    """
+    window = int(model.input_shape[1])
+    history = _seed_window(model, seed)[0]
+    out = []
+    while len(out) < steps:
+        block = model(history[None], training=False).numpy()[0]
+        out.extend(block.tolist())
+        rows = np.repeat(history[-1:], len(block), axis=0)
+        rows[:, 0] = block
+        history = np.concatenate([history, rows])[-window:]
+    return np.asarray(out[:steps], dtype=np.float32)
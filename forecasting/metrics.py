@@ -0,0 +1,36 @@
+"""Validation metrics shared by the candidate models."""
+import numpy as np
+
+
+def rmse(y_true, y_pred) -> float:
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    return float(np.sqrt(np.mean((y_true - y_pred) ** 2)))
+
+
+def naive_rmse(y_history, y_true) -> float:
+    """RMSE of the no-change forecast (last value of `y_history` held) over `y_true`."""
+    y_true = np.asarray(y_true, dtype=float)
+    return rmse(y_true, np.full(len(y_true), float(np.asarray(y_history, dtype=float)[-1])))
+
+
+def mape(y_true, y_pred, eps=1e-8) -> float:
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    denom = np.maximum(np.abs(y_true), eps)
+    return float(np.mean(np.abs((y_true - y_pred) / denom)))
+
+
+def mae(y_true, y_pred) -> float:
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    return float(np.mean(np.abs(y_true - y_pred)))
+
+
+def r2(y_true, y_pred) -> float:
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    ss_tot = float(np.sum((y_true - y_true.mean()) ** 2))
+    if ss_tot == 0.0:
+        return 0.0
+    return float(1.0 - np.sum((y_true - y_pred) ** 2) / ss_tot)
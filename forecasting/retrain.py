@@ -0,0 +1,81 @@
+"""
+Retrain policy for the stage DAG's incremental mode.
+
+An incremental retrain warm-starts each candidate from its previous fit
+(`data/pipeline/{TICKER}/candidates/{model}.pkl`): ARIMA re-filters its state with
+the new observations (refitting its order only when that validates much worse),
+Prophet starts from its previous parameters and the LSTM continues from its weights
+for a few epochs. A full refit (order search, fresh weights) still happens:
+
+- on schedule, when the last one is `full_refit_days` old (or there is none yet);
+- on drift, when the warm-started winner validates more than `drift_threshold`
+  worse than the winner of the last full refit did.
+
+The two runs validate on different windows, so their RMSEs are not compared
+directly: each is divided by the RMSE of the no-change forecast on its own window
+(relative RMSE), which takes out how volatile the window happened to be.
+"""
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+FULL_REFIT_DAYS = 7
+DRIFT_THRESHOLD = 0.2
+
+
+@dataclass
+class RetrainPlan:
+    mode: str    # "full" | "incremental"
+    reason: str  # "requested" | "no previous fit" | "scheduled" | "warm start" | "drift"
+    drift_score: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def plan_retrain(
+    state: dict,
+    has_previous_fit: bool,
+    *,
+    full_refit_days: float = FULL_REFIT_DAYS,
+    now: Optional[datetime] = None,
+) -> RetrainPlan:
+    """Full or incremental, before training (`state` is the ticker's retrain state, see `StageStore.state`)."""
+    now = now or datetime.utcnow()
+    last_full = state.get("last_full_refit_utc")
+    # states from before the relative reference get one full refit to record it
+    if not has_previous_fit or not last_full or state.get("reference_rel_rmse") is None:
+        return RetrainPlan("full", "no previous fit")
+    if (now - datetime.fromisoformat(last_full.rstrip("Z"))).total_seconds() >= full_refit_days * 86400:
+        return RetrainPlan("full", "scheduled")
+    return RetrainPlan("incremental", "warm start")
+
+
+def best_rmse(results: Sequence[dict]) -> Optional[float]:
+    ok = [r["rmse"] for r in results if r.get("status") == "ok" and r.get("rmse") is not None]
+    return min(ok) if ok else None
+
+
+def relative_rmse(results: Sequence[dict], naive_rmse: float) -> Optional[float]:
+    """Best candidate RMSE over the no-change forecast's RMSE on the same validation window."""
+    best = best_rmse(results)
+    if best is None or not naive_rmse:
+        return None
+    return best / naive_rmse
+
+
+def drift_score(state: dict, results: Sequence[dict], naive_rmse: float) -> Optional[float]:
+    """Relative-RMSE increase of the best warm-started candidate over the last full refit's winner."""
+    reference, current = state.get("reference_rel_rmse"), relative_rmse(results, naive_rmse)
+    if not reference or current is None:
+        return None
+    return round(current / reference - 1.0, 4)
+
+
+def full_refit_state(results: Sequence[dict], naive_rmse: float, now: Optional[datetime] = None) -> Dict[str, object]:
+    """State fields to record after a full refit: its time and its winner's (relative) RMSE, the drift reference."""
+    return {
+        "last_full_refit_utc": (now or datetime.utcnow()).isoformat() + "Z",
+        "reference_rmse": best_rmse(results),
+        "reference_rel_rmse": relative_rmse(results, naive_rmse),
+    }
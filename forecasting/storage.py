@@ -0,0 +1,94 @@
+"""
+Columnar storage for the raw and processed datasets.
+
+Frames are stored as zstd-compressed Parquet with typed columns and read back
+through memory-mapped files, so loads skip CSV date/float parsing entirely.
+"""
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+SUFFIX = ".parquet"
+COMPRESSION = "zstd"
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ModuleNotFoundError as e:
+        raise RuntimeError("Parquet storage requires `pyarrow` (see backend/requirements.txt).") from e
+    return pa, pq
+
+
+def dataset_path(directory: Path, ticker: str) -> Path:
+    return Path(directory) / f"{ticker}{SUFFIX}"
+
+
+def coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """`date` → datetime64, integral volume → int64, other numerics → float64."""
+    df = df.copy()
+    for col in df.columns:
+        if col == "date":
+            df[col] = pd.to_datetime(df[col])
+        elif col == "volume":
+            vol = pd.to_numeric(df[col], errors="coerce")
+            df[col] = vol.astype("int64") if vol.notna().all() and (vol % 1 == 0).all() else vol.astype("float64")
+        elif pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            df[col] = df[col].astype("float64")
+        elif col == "split":
+            df[col] = df[col].astype("category")
+    return df
+
+
+def write_frame(df: pd.DataFrame, path: Path) -> Path:
+    pa, pq = _pyarrow()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(coerce_types(df), preserve_index=False)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    pq.write_table(table, tmp, compression=COMPRESSION)
+    tmp.replace(path)
+    return path
+
+
+def read_frame(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Reads a stored frame. If only a legacy `.csv` sibling exists (not yet migrated),
+    it is parsed instead. Raises FileNotFoundError when neither exists.
+    """
+    path = Path(path)
+    if path.exists():
+        _, pq = _pyarrow()
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        # hand column buffers over to pandas instead of holding two copies
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    legacy = path.with_suffix(".csv")
+    if legacy.exists():
+        parse_dates = ["date"] if columns is None or "date" in columns else None
+        return coerce_types(pd.read_csv(legacy, parse_dates=parse_dates, usecols=columns))
+
+    raise FileNotFoundError(f"Dataset not found: {path}")
+
+
+def frame_exists(path: Path) -> bool:
+    path = Path(path)
+    return path.exists() or path.with_suffix(".csv").exists()
+
+
+def migrate_csv(csv_path: Path, *, delete_csv: bool = False) -> Path:
+    """Converts one legacy CSV dataset to Parquet next to it and verifies the round trip."""
+    csv_path = Path(csv_path)
+    df = coerce_types(pd.read_csv(csv_path, parse_dates=["date"]))
+    out = write_frame(df, csv_path.with_suffix(SUFFIX))
+
+    back = read_frame(out)
+    if len(back) != len(df) or list(back.columns) != list(df.columns):
+        out.unlink()
+        raise RuntimeError(f"Parquet round trip mismatch for {csv_path}")
+
+    if delete_csv:
+        csv_path.unlink()
+    return out
@@ -0,0 +1,69 @@
+"""
+Sliding-window datasets for sequence models.
+
+Windows are zero-copy strided views (`sliding_window_view`) over one float32
+array, so building them costs O(1) Python work and no extra memory per window.
+"""
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_FEATURES = [
+    "roll_mean_5", "roll_mean_10", "roll_mean_20",
+    "roll_vol_5", "roll_vol_10", "roll_vol_20",
+    "volume",
+]
+
+
+def feature_matrix(df: pd.DataFrame, target_col: str, feature_cols: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    `(n, 1 + len(feature_cols))` float32 array from the processed dataset, target
+    in column 0. Feature columns missing from `df` (e.g. no volume) are skipped.
+    """
+    cols = [target_col] + [c for c in (feature_cols or []) if c in df.columns and c != target_col]
+    return np.ascontiguousarray(df[cols].to_numpy(dtype=np.float32))
+
+
+def _as_2d(values) -> np.ndarray:
+    arr = np.ascontiguousarray(values, dtype=np.float32)  # no copy if already float32
+    return arr[:, None] if arr.ndim == 1 else arr
+
+
+def sliding_windows(values, window: int, horizon: int = 1, *, target: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns `(X, Y)` views: `X[i]` is rows `i .. i+window-1` with shape
+    `(window, n_features)` and `Y[i]` the next `horizon` values of column `target`.
+    """
+    arr = _as_2d(values)
+    n = len(arr) - window - horizon + 1
+    if n <= 0:
+        raise ValueError(f"Series of length {len(arr)} is too short for window={window}, horizon={horizon}")
+
+    X = sliding_window_view(arr, window, axis=0)[:n].transpose(0, 2, 1)
+    Y = sliding_window_view(arr[window:, target], horizon)[:n]
+    return X, Y
+
+
+def iter_window_batches(
+    values,
+    window: int,
+    horizon: int = 1,
+    *,
+    target: int = 0,
+    batch_size: int = 1024,
+    shuffle: bool = False,
+    seed: Optional[int] = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yields contiguous `(X, Y)` batches, so only one batch is ever materialized
+    (for series too long to hand to `fit` as a whole).
+    """
+    X, Y = sliding_windows(values, window, horizon, target=target)
+    order = np.arange(len(X))
+    if shuffle:
+        np.random.default_rng(seed).shuffle(order)
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        yield np.ascontiguousarray(X[idx]), np.ascontiguousarray(Y[idx])
@@ -77,7 +77,7 @@ export default function SettingsForm({ initialSettings, onSave }) {
       retrainFrequency: 'Daily',
       driftThreshold: 0.1,
       slackWebhook: '',
-      candidateModels: ['LSTM', 'GRU', 'Transformer'],
+      candidateModels: ['ARIMA', 'Prophet', 'LSTM'],
       autoSelectBest: true,
     });
   };
@@ -0,0 +1,42 @@
+"""
+Converts existing `data/raw/*.csv` and `data/processed/*.csv` datasets to Parquet.
+
+Usage (from the repo root):
+    python scripts/migrate_csv_to_parquet.py [--delete-csv]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from forecasting.storage import SUFFIX, migrate_csv  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", type=Path, default=ROOT / "data")
+    parser.add_argument("--delete-csv", action="store_true", help="remove each CSV after a verified conversion")
+    parser.add_argument("--force", action="store_true", help="re-convert even if the Parquet file exists")
+    args = parser.parse_args()
+
+    failures = 0
+    for sub in ("raw", "processed"):
+        for csv_path in sorted((args.data_dir / sub).glob("*.csv")):
+            if csv_path.with_suffix(SUFFIX).exists() and not args.force:
+                print(f"skip     {csv_path} (already migrated)")
+                continue
+            try:
+                out = migrate_csv(csv_path, delete_csv=args.delete_csv)
+            except Exception as e:
+                failures += 1
+                print(f"FAILED   {csv_path}: {e}")
+                continue
+            print(f"migrated {csv_path} -> {out.name}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# `forecasting` is imported from the repo root, the backend modules as top-level modules
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# backend/config.py reads the database URL at import: a throwaway SQLite file per test session
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp(prefix='stock-forecasting-tests-')) / 'test.db'}"
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """Empty tables for one test; yields a session on the app's engine."""
+    from db_config import AsyncSessionLocal, Base, engine
+    import models  # noqa: F401  (registers the tables)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    # connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+def add_ticker_row(db):
+    """`await add_ticker_row("AAPL", **fields)` inserts a ticker (pipeline runs, logs and versions need one)."""
+    from datetime import datetime
+
+    from database import add_ticker
+
+    async def add(ticker: str, **fields):
+        return await add_ticker(db, {
+            "ticker": ticker, "name": ticker, "exchange": "NYSE", "status": "active",
+            "updated_at": datetime.utcnow(), **fields,
+        })
+
+    return add
@@ -0,0 +1,112 @@
+"""The parallel, budgeted grid search picks the same order as the original sequential loop."""
+import time
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip("statsmodels")
+
+from forecasting.arima import DEFAULT_ORDERS, grid_search  # noqa: E402
+from forecasting.metrics import mape, rmse  # noqa: E402
+
+
+def sequential_grid(y_train, y_val):
+    # the loop `02_Model_Experiments` ran before forecasting/arima.py
+    from statsmodels.tsa.arima.model import ARIMA
+
+    best = None
+    for p in [0, 1, 2, 3]:
+        for d in [0, 1]:
+            for q in [0, 1, 2]:
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        fit = ARIMA(y_train, order=(p, d, q)).fit()
+                    pred = fit.forecast(steps=len(y_val))
+                    score = rmse(y_val, pred)
+                    if best is None or score < best["rmse"]:
+                        best = {"order": (p, d, q), "rmse": score, "mape": mape(y_val, pred)}
+                except Exception:
+                    continue
+    return best
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(7)
+    # AR(1) around a drifting level: enough structure that the orders score differently
+    noise = rng.normal(0, 1.0, 260)
+    y = np.empty_like(noise)
+    y[0] = 0.0
+    for t in range(1, len(y)):
+        y[t] = 0.6 * y[t - 1] + noise[t]
+    y = 100 + 0.05 * np.arange(len(y)) + y
+    return y[:-20], y[-20:]
+
+
+@pytest.fixture(scope="module")
+def expected(series):
+    return sequential_grid(*series)
+
+
+def test_default_grid_matches_the_notebook_loop():
+    assert DEFAULT_ORDERS == [(p, d, q) for p in [0, 1, 2, 3] for d in [0, 1] for q in [0, 1, 2]]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_same_best_order_as_sequential_loop(series, expected, max_workers):
+    y_train, y_val = series
+    # a generous budget with screening on (screen_size below the series length): everything gets evaluated
+    best, fit, info = grid_search(y_train, y_val, max_workers=max_workers, time_budget_s=600, screen_size=100)
+
+    assert info["screened"] and info["pruned"] == []
+    assert best["order"] == expected["order"]
+    assert best["rmse"] == pytest.approx(expected["rmse"])
+    assert best["mape"] == pytest.approx(expected["mape"])
+    assert tuple(fit.model.order) == expected["order"]
+
+
+def test_unbudgeted_search_matches_sequential_loop(series, expected):
+    best, _, info = grid_search(*series, max_workers=2)
+
+    assert not info["screened"] and info["evaluated"] == len(DEFAULT_ORDERS)
+    assert best["order"] == expected["order"]
+
+
+def test_exhausted_budget_still_fits_the_top_screened_order(series, monkeypatch):
+    from forecasting import arima
+
+    y_train, y_val = series
+    screened, evaluated = [], []
+    # grid position 5 screens best; every screen and full fit takes 0.1s
+    aic = {order: abs(i - 5) for i, order in enumerate(DEFAULT_ORDERS)}
+
+    def screen(y_tail, order):
+        screened.append(order)
+        time.sleep(0.1)
+        return aic[order]
+
+    def evaluate(y_train, y_val, order):
+        evaluated.append(order)
+        time.sleep(0.1)
+        return {"order": order, "rmse": 1.0 + aic[order], "mape": 1.0, "aic": 0.0}
+
+    monkeypatch.setattr(arima, "_screen_order", screen)
+    monkeypatch.setattr(arima, "_evaluate_order", evaluate)
+    best, _, info = grid_search(y_train, y_val, max_workers=1, time_budget_s=1.2, screen_size=100)
+
+    # the screen stops at half the budget instead of taking all of it
+    assert 6 <= len(screened) <= 7
+    assert evaluated[0] == DEFAULT_ORDERS[5] and best["order"] == DEFAULT_ORDERS[5]
+    assert 1 <= info["evaluated"] <= 7 and len(info["pruned"]) == len(DEFAULT_ORDERS) - info["evaluated"]
+
+
+def test_budget_spent_before_any_fit_keeps_the_top_order(series):
+    y_train, y_val = series
+    best, fit, info = grid_search(y_train, y_val, max_workers=2, time_budget_s=1e-3, screen_size=100)
+
+    # nothing was screened in time, so the grid's first order ranks on top: it is fitted all the same
+    assert info["screened"] and info["evaluated"] >= 1
+    assert [0, 0, 0] not in info["pruned"]
+    assert tuple(fit.model.order) == best["order"]
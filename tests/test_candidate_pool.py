@@ -0,0 +1,67 @@
+"""CandidatePool budgets: a fit past its deadline or memory budget is killed, the others carry on."""
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecasting.candidates import Budget, CandidatePool, CandidateTask
+from forecasting.storage import dataset_path, write_frame
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="memory budgets read /proc")
+pytest.importorskip("statsmodels")
+
+TICKER = "POOL"
+
+
+@pytest.fixture
+def root(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 120
+    write_frame(pd.DataFrame({
+        "date": pd.bdate_range("2025-01-01", periods=n),
+        "adj_close": 100 + np.cumsum(rng.normal(0, 1, n)),
+        "split": ["train"] * 100 + ["val"] * 20,
+    }), dataset_path(tmp_path / "data" / "processed", TICKER))
+    return tmp_path
+
+
+def task(root, model: str) -> CandidateTask:
+    params = {"time_budget_s": 5, "max_workers": 1} if model == "ARIMA" else {}
+    return CandidateTask(model, str(root), TICKER, params, str(root / "candidates" / f"{model}.pkl"))
+
+
+@pytest.fixture
+def pool():
+    pool = CandidatePool()
+    yield pool
+    pool.shutdown()
+
+
+def test_timeout_kills_only_that_fit(root, pool):
+    done = []
+    # the worker can't even finish importing in 0.2 s
+    results = pool.fit([task(root, "ARIMA"), task(root, "Prophet")], {"ARIMA": Budget(timeout_s=0.2)},
+                       on_done=lambda t, r: done.append(t.model))
+
+    assert results["ARIMA"]["status"] == "timeout"
+    assert "0.2 s" in results["ARIMA"]["error"]
+    # Prophet finishes on its own terms (an error when it isn't installed), not killed with ARIMA
+    assert results["Prophet"]["status"] in ("ok", "error")
+    assert sorted(done) == ["ARIMA", "Prophet"]
+    assert pool.timeouts == 1 and pool.restarts == 1
+    assert not (root / "candidates" / "ARIMA.pkl").exists()
+
+    # the killed worker is replaced for the next fit
+    retry = pool.fit([task(root, "ARIMA")])
+    assert retry["ARIMA"]["status"] == "ok", retry
+    assert (root / "candidates" / "ARIMA.pkl").exists()
+
+
+def test_memory_budget_kills_the_worker(root, pool):
+    results = pool.fit([task(root, "ARIMA")], {"ARIMA": Budget(memory_mb=1)})
+
+    assert results["ARIMA"]["status"] == "error"
+    assert "Memory budget exceeded" in results["ARIMA"]["error"]
+    assert pool.restarts == 1 and pool.timeouts == 0
+    assert pool._workers["ARIMA"].process is None
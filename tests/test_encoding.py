@@ -0,0 +1,99 @@
+"""Every forecast encoding decodes back to the row JSON's points."""
+import gzip
+import json
+
+import pytest
+
+from encoding import (
+    compress,
+    encode_forecast,
+    encode_forecast_batch,
+    negotiate_format,
+)
+
+
+def forecast(ticker: str, n: int = 5) -> dict:
+    return {
+        "ticker": ticker,
+        "horizon": n,
+        "points": [
+            {
+                "date": f"2026-01-{i + 1:02d}",
+                # history rows have actuals, the forward forecast doesn't
+                "actual": 100.0 + i if i < 2 else None,
+                "predicted": 100.5 + i,
+                "lower": 99.0 + i,
+                "upper": 102.0 + i,
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def rows(columns: dict) -> list:
+    fields = ("date", "actual", "predicted", "lower", "upper")
+    return [dict(zip(fields, values)) for values in zip(*(columns[f] for f in fields))]
+
+
+def arrow_table(body: bytes):
+    pa = pytest.importorskip("pyarrow")
+    return pa.ipc.open_stream(body).read_all()
+
+
+@pytest.mark.parametrize("fmt", ["json", "columnar", "msgpack", "arrow"])
+def test_single_forecast_round_trip(fmt):
+    payload = forecast("AAA")
+    body = encode_forecast(payload, fmt)
+
+    if fmt == "json":
+        decoded = json.loads(body)
+        assert decoded["ticker"] == "AAA" and decoded["points"] == payload["points"]
+    elif fmt in ("columnar", "msgpack"):
+        if fmt == "msgpack":
+            msgpack = pytest.importorskip("msgpack")
+            decoded = msgpack.unpackb(body, raw=False)
+        else:
+            decoded = json.loads(body)
+        assert (decoded["ticker"], decoded["horizon"]) == ("AAA", 5)
+        assert rows(decoded) == payload["points"]
+    else:
+        table = arrow_table(body)
+        assert json.loads(table.schema.metadata[b"horizon"]) == 5
+        decoded = table.to_pydict()
+        assert set(decoded.pop("ticker")) == {"AAA"}
+        decoded["date"] = [d.isoformat() for d in decoded["date"]]
+        assert rows(decoded) == payload["points"]
+
+
+@pytest.mark.parametrize("fmt", ["columnar", "msgpack", "arrow"])
+def test_batch_round_trip(fmt):
+    forecasts = [forecast("AAA"), forecast("BBB", 3)]
+    body = encode_forecast_batch(forecasts, ["ZZZ"], 5, fmt)
+
+    if fmt == "arrow":
+        table = arrow_table(body)
+        assert json.loads(table.schema.metadata[b"not_found"]) == ["ZZZ"]
+        decoded = table.to_pydict()
+        decoded["date"] = [d.isoformat() for d in decoded["date"]]
+        by_ticker = {
+            f["ticker"]: [r for t, r in zip(decoded["ticker"], rows(decoded)) if t == f["ticker"]] for f in forecasts
+        }
+    else:
+        if fmt == "msgpack":
+            decoded = pytest.importorskip("msgpack").unpackb(body, raw=False)
+        else:
+            decoded = json.loads(body)
+        assert decoded["not_found"] == ["ZZZ"]
+        by_ticker = {f["ticker"]: rows(f) for f in decoded["forecasts"]}
+    assert by_ticker == {f["ticker"]: f["points"] for f in forecasts}
+
+
+def test_negotiation_and_compression():
+    assert negotiate_format(None, "text/html, application/msgpack;q=0.9") == "msgpack"
+    assert negotiate_format("arrow", "application/msgpack") == "arrow"
+    assert negotiate_format(None, "*/*") == "json"
+
+    body = encode_forecast(forecast("AAA", 400), "columnar")
+    compressed, encoding = compress(body, "gzip;q=1.0, br;q=0")
+    assert encoding == "gzip" and gzip.decompress(compressed) == body
+    assert compress(body, "identity") == (body, None)
@@ -0,0 +1,65 @@
+"""The feature cache reuses, extends or rebuilds the processed dataset, always matching a full recompute."""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from forecasting.features import build_features, load_features, manifest_path  # noqa: E402
+from forecasting.storage import dataset_path  # noqa: E402
+
+
+def raw(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(rng.normal(0, 1, 200))[:n]
+    return pd.DataFrame({"date": pd.bdate_range("2025-01-01", periods=n), "adj_close": close,
+                         "volume": np.full(n, 1_000.0)})
+
+
+def recomputed(df: pd.DataFrame, tmp_path) -> pd.DataFrame:
+    proc, stats = build_features(df, tmp_path / "fresh" / "X.parquet", "adj_close")
+    assert stats["status"] == "miss"
+    return proc
+
+
+@pytest.fixture
+def proc_path(tmp_path):
+    return dataset_path(tmp_path / "processed", "AAA")
+
+
+def test_unchanged_source_is_a_hit(proc_path):
+    first, stats = build_features(raw(80), proc_path, "adj_close")
+    assert stats["status"] == "miss" and manifest_path(proc_path).exists()
+
+    again, stats = build_features(raw(80), proc_path, "adj_close")
+    assert stats["status"] == "hit" and stats["rows_computed"] == 0
+    # storage narrows whole-number volume to int64; values are what matter
+    pd.testing.assert_frame_equal(again, first, check_dtype=False, check_categorical=False)
+
+
+def test_appended_rows_only_compute_the_tail(proc_path, tmp_path):
+    build_features(raw(80), proc_path, "adj_close")
+    proc, stats = build_features(raw(90), proc_path, "adj_close")
+
+    assert stats["status"] == "partial" and stats["rows_computed"] == 10
+    expected = recomputed(raw(90), tmp_path)
+    pd.testing.assert_frame_equal(proc.reset_index(drop=True), expected, check_dtype=False, check_categorical=False)
+
+
+def test_revised_history_is_recomputed(proc_path, tmp_path):
+    build_features(raw(80), proc_path, "adj_close")
+    revised = raw(90)
+    revised.loc[10, "adj_close"] += 5.0
+    proc, stats = build_features(revised, proc_path, "adj_close")
+
+    assert stats["status"] == "miss"
+    pd.testing.assert_frame_equal(proc, recomputed(revised, tmp_path), check_dtype=False, check_categorical=False)
+
+
+def test_other_feature_spec_is_refused(proc_path):
+    build_features(raw(80), proc_path, "adj_close")
+    manifest = manifest_path(proc_path)
+    manifest.write_text(manifest.read_text().replace('"spec_hash": "', '"spec_hash": "stale'))
+
+    with pytest.raises(ValueError, match="another feature spec"):
+        load_features(proc_path)
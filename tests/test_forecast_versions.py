@@ -0,0 +1,45 @@
+"""A published forecast version replaces what the API serves in one step."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+pytestmark = pytest.mark.anyio
+
+
+def points(start_day: int, value: float, n: int = 3) -> list:
+    return [{"date": f"2026-02-{start_day + i:02d}", "actual": None, "predicted": value,
+             "lower": value - 1, "upper": value + 1} for i in range(n)]
+
+
+def candidates(*rmses: float) -> list:
+    return [{"model": name, "mae": r, "rmse": r, "mape": r, "r2": 0.0, "status": "success", "recommended": i == 0}
+            for i, (name, r) in enumerate(zip(("ARIMA", "LSTM"), rmses))]
+
+
+async def test_new_version_switches_points_and_models(db, add_ticker_row):
+    from database import get_forecast, get_forecasts, get_models, get_ticker, publish_forecast_version
+    from models import ForecastPoint, ForecastVersion
+
+    await add_ticker_row("AAA")
+    first = await publish_forecast_version(db, "AAA", points=points(2, 10.0), models=candidates(1.0, 2.0),
+                                           model_name="ARIMA", trained_at=datetime(2026, 2, 1))
+    assert [p["predicted"] for p in (await get_forecast(db, "AAA"))["points"]] == [10.0] * 3
+
+    second = await publish_forecast_version(db, "AAA", points=points(3, 20.0, n=4), models=candidates(3.0),
+                                            model_name="LSTM", trained_at=datetime(2026, 2, 2), drift_score=0.1)
+    assert second != first
+
+    served = await get_forecast(db, "AAA")
+    assert [(p["date"], p["predicted"]) for p in served["points"]] == [(p["date"], 20.0) for p in points(3, 20.0, 4)]
+    assert (await get_forecasts(db, ["AAA"]))["AAA"]["points"] == served["points"]
+    assert [(m.model, m.rmse) for m in await get_models(db, "AAA")] == [("ARIMA", 3.0)]
+
+    ticker = await get_ticker(db, "AAA")
+    await db.refresh(ticker)
+    assert (ticker.current_forecast_version_id, ticker.current_model, ticker.drift_score) == (second, "LSTM", 0.1)
+    # the previous version stays until retention prunes it
+    assert (await db.execute(select(func.count()).select_from(ForecastVersion))).scalar_one() == 2
+    assert (await db.execute(
+        select(func.count()).select_from(ForecastPoint).where(ForecastPoint.version_id == first)
+    )).scalar_one() == 3
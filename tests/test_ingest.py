@@ -0,0 +1,112 @@
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecasting.ingest import DataSource, ingest
+from forecasting.storage import read_frame
+
+
+def prices(days: int, start: str = "2024-01-01", factor: float = 1.0) -> pd.DataFrame:
+    close = 100 + np.arange(days, dtype="float64")
+    return pd.DataFrame({
+        "date": pd.bdate_range(start, periods=days),
+        "open": close, "high": close + 1, "low": close - 1,
+        "close": close, "adj_close": close * factor,
+        "volume": np.full(days, 1_000, dtype="int64"),
+    })
+
+
+class FakeSource(DataSource):
+    """Serves a fixed history and records the `start` of every fetch."""
+
+    def __init__(self, history: pd.DataFrame):
+        self.history = history
+        self.starts: List[Optional[date]] = []
+
+    def fetch(self, ticker: str, start: Optional[date] = None) -> pd.DataFrame:
+        self.starts.append(start)
+        df = self.history
+        if start is not None:
+            df = df[df["date"] >= pd.Timestamp(start)]
+        return df.reset_index(drop=True)
+
+
+@pytest.fixture
+def raw_path(tmp_path):
+    return tmp_path / "raw" / "TEST.parquet"
+
+
+def test_first_ingest_downloads_full_history(raw_path):
+    source = FakeSource(prices(30))
+    df, info = ingest("TEST", raw_path, source)
+
+    assert source.starts == [None]
+    assert info["mode"] == "full"
+    assert info["new_rows"] == info["total_rows"] == 30
+    assert len(read_frame(raw_path)) == 30
+
+
+def test_incremental_ingest_appends_only_the_tail(raw_path):
+    ingest("TEST", raw_path, FakeSource(prices(30)))
+    source = FakeSource(prices(33))
+    df, info = ingest("TEST", raw_path, source)
+
+    assert len(source.starts) == 1 and source.starts[0] is not None
+    assert info["mode"] == "incremental"
+    assert info["new_rows"] == 3
+    assert info["overlap_max_rel_diff"] == 0.0
+    stored = read_frame(raw_path)
+    assert len(stored) == 33 and stored["date"].is_unique
+    pd.testing.assert_series_equal(stored["adj_close"], prices(33)["adj_close"], check_names=False)
+
+
+def test_rescaled_overlap_falls_back_to_full_download(raw_path):
+    ingest("TEST", raw_path, FakeSource(prices(30)))
+    # a dividend adjustment rescales every adjusted close the provider returns
+    adjusted = prices(33, factor=0.98)
+    source = FakeSource(adjusted)
+    df, info = ingest("TEST", raw_path, source)
+
+    assert source.starts[-1] is None
+    assert info["mode"] == "full"
+    assert info["overlap_max_rel_diff"] == pytest.approx(0.02)
+    stored = read_frame(raw_path)
+    assert len(stored) == 33
+    # no splice: the whole stored series is on the new scale
+    np.testing.assert_allclose(stored["adj_close"].to_numpy(), adjusted["adj_close"].to_numpy())
+
+
+def test_correction_to_the_last_stored_bar_is_not_a_mismatch(raw_path):
+    ingest("TEST", raw_path, FakeSource(prices(30)))
+    updated = prices(31)
+    # the stored last bar was an unfinished day; its final close differs
+    updated.loc[29, ["close", "adj_close"]] += 0.5
+    source = FakeSource(updated)
+    df, info = ingest("TEST", raw_path, source)
+
+    assert info["mode"] == "incremental"
+    assert info["new_rows"] == 1
+    assert read_frame(raw_path)["adj_close"].iloc[29] == updated["adj_close"].iloc[29]
+
+
+def test_empty_full_download_keeps_the_stored_history(raw_path, caplog):
+    ingest("TEST", raw_path, FakeSource(prices(30)))
+
+    class RescaledThenEmpty(FakeSource):
+        # the tail comes back rescaled, the full download that follows comes back empty
+        def fetch(self, ticker, start=None):
+            df = super().fetch(ticker, start)
+            return df if start is not None else df.iloc[:0]
+
+    source = RescaledThenEmpty(prices(33, factor=0.98))
+    df, info = ingest("TEST", raw_path, source)
+
+    assert source.starts[-1] is None
+    assert info["mode"] == "stale"
+    assert info["new_rows"] == 0 and info["total_rows"] == 30
+    pd.testing.assert_frame_equal(df, read_frame(raw_path))
+    np.testing.assert_allclose(read_frame(raw_path)["adj_close"].to_numpy(), prices(30)["adj_close"].to_numpy())
+    assert "stored history kept" in caplog.text
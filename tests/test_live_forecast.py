@@ -0,0 +1,96 @@
+"""`/forecast/{ticker}/live` serves whichever model is deployed, not just the pipeline's pick."""
+import json
+import pickle
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+
+pytestmark = pytest.mark.anyio
+
+TICKER = "LIVE"
+
+
+def write_artifacts(root):
+    from statsmodels.tsa.arima.model import ARIMA
+    from tensorflow import keras
+
+    from forecasting.lstm import build_model
+    from forecasting.storage import dataset_path, write_frame
+
+    rng = np.random.default_rng(0)
+    y = 100 + np.cumsum(rng.normal(0, 1, 120))
+    dates = pd.bdate_range("2025-01-01", periods=len(y))
+    write_frame(pd.DataFrame({"date": dates, "adj_close": y}), dataset_path(root / "data" / "processed", TICKER))
+
+    # the pipeline picked ARIMA ...
+    latest = root / "models" / "latest" / TICKER
+    latest.mkdir(parents=True)
+    fit = ARIMA(y, order=(1, 0, 0)).fit()
+    with (latest / "model.pkl").open("wb") as f:
+        pickle.dump({"type": "ARIMA", "order": (1, 0, 0), "fit": fit, "val_rmse": 1.0}, f)
+    (latest / "metadata.json").write_text(json.dumps({
+        "ticker": TICKER, "model_type": "ARIMA", "target": "adj_close", "metrics": {"rmse": 1.0},
+    }))
+
+    # ... and the LSTM candidate's last fit is kept next to the stage manifests
+    keras.utils.set_random_seed(0)
+    lstm = build_model(10)
+    candidates = root / "data" / "pipeline" / TICKER / "candidates"
+    candidates.mkdir(parents=True)
+    with (candidates / "LSTM.pkl").open("wb") as f:
+        pickle.dump({"type": "LSTM", "model_json": lstm.to_json(), "weights": lstm.get_weights(),
+                     "mu": float(y.mean()), "sigma": float(y.std()), "window": 10, "mode": "recursive",
+                     "horizon": 1, "val_rmse": 3.0}, f)
+
+
+async def test_live_forecast_follows_deploy(db, add_ticker_row, tmp_path, monkeypatch):
+    from api import forecast as forecast_api
+    from database import deploy_model
+    from forecasting.experiments import INTERVAL_Z
+    from model_registry import ModelRegistry
+
+    write_artifacts(tmp_path)
+    registry = ModelRegistry(root=tmp_path, max_bytes=1 << 30, workers=1)
+    monkeypatch.setattr(forecast_api, "model_registry", registry)
+    await add_ticker_row(TICKER, current_model="ARIMA")
+
+    app = FastAPI()
+    app.include_router(forecast_api.router, prefix="/api")
+
+    async def get_live():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(f"/api/forecast/{TICKER}/live", params={"days": 5})
+
+    async def live():
+        response = await get_live()
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    try:
+        first = await live()
+        assert first["model"] == "ARIMA"
+        assert (await live())["points"] == first["points"]
+        assert registry.hits == 1
+
+        await deploy_model(db, TICKER, "LSTM")
+        deployed = await live()
+        assert deployed["model"] == "LSTM"
+        assert deployed["points"] != first["points"]
+        point = deployed["points"][0]
+        assert point["upper"] - point["predicted"] == pytest.approx(INTERVAL_Z * 3.0)  # the LSTM's own band
+
+        await deploy_model(db, TICKER, "ARIMA")
+        assert (await live())["points"] == first["points"]
+        assert registry.loads == 3 and registry.reloads == 2
+
+        # a deployed model without an artifact is not answered with another model's forecast
+        await deploy_model(db, TICKER, "Prophet")
+        response = await get_live()
+        assert response.status_code == 404
+        assert "Prophet" in response.json()["detail"]
+    finally:
+        registry.shutdown()
@@ -0,0 +1,70 @@
+"""Keyset log pages: every row exactly once, in (timestamp, id) order, whatever the filters."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+pytestmark = pytest.mark.anyio
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+async def logs(db, add_ticker_row):
+    from log_writer import log_row
+    from models import Log
+
+    for ticker in ("AAA", "BBB"):
+        await add_ticker_row(ticker)
+    rows = [
+        log_row({
+            "id": f"log_{i:02d}",
+            # pairs of rows share a timestamp: the id breaks the tie
+            "timestamp": T0 + timedelta(minutes=i // 2),
+            "ticker": "AAA" if i % 3 else "BBB",
+            "event": "pipeline_started" if i % 2 else "model_deployed",
+            "status": "success",
+            "message": f"row {i}",
+        })
+        for i in range(11)
+    ]
+    await db.execute(insert(Log).values(rows))
+    await db.commit()
+    return sorted(rows, key=lambda r: (r["timestamp"], r["id"]), reverse=True)
+
+
+async def all_pages(db, limit, **filters):
+    from database import query_logs
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = await query_logs(db, limit=limit, cursor=cursor, **filters)
+        pages.append([log.id for log in page])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 11, 50])
+async def test_pages_cover_every_row_once(db, logs, limit):
+    pages = await all_pages(db, limit)
+
+    assert [log_id for page in pages for log_id in page] == [r["id"] for r in logs]
+    assert all(len(page) == limit for page in pages[:-1]) and 0 < len(pages[-1]) <= limit
+
+
+async def test_filters_apply_on_every_page(db, logs):
+    since, until = T0 + timedelta(minutes=1), T0 + timedelta(minutes=4)
+    pages = await all_pages(db, 2, ticker="AAA", event="pipeline_started", since=since, until=until)
+
+    expected = [
+        r["id"] for r in logs
+        if r["ticker"] == "AAA" and r["event"] == "pipeline_started" and since <= r["timestamp"] < until
+    ]
+    assert expected and [log_id for page in pages for log_id in page] == expected
+
+
+async def test_invalid_cursor(db, logs):
+    from database import InvalidCursorError, query_logs
+
+    with pytest.raises(InvalidCursorError):
+        await query_logs(db, cursor="not-a-cursor")
@@ -0,0 +1,67 @@
+"""LogWriter keeps rows through connection failures and drops only the rows the database rejects."""
+import pytest
+from sqlalchemy import func, select, text
+
+pytestmark = pytest.mark.anyio
+
+
+def entry(i: int, **fields) -> dict:
+    return {"ticker": "LOGS", "event": "test", "status": "success", "message": f"row {i}", **fields}
+
+
+async def count_logs(db) -> int:
+    from models import Log
+
+    return (await db.execute(select(func.count()).select_from(Log))).scalar_one()
+
+
+async def test_rejected_rows_are_isolated(db, add_ticker_row):
+    from log_writer import LogWriter
+
+    await add_ticker_row("LOGS")
+    writer = LogWriter(batch_size=8)
+    for i in range(8):
+        writer.log(entry(i, message=None) if i in (2, 5) else entry(i))  # NOT NULL violations
+
+    assert await writer.flush() == 6
+    assert await count_logs(db) == 6
+    assert writer.stats() == {"buffered": 0, "written": 6, "dropped": 0, "rejected": 2, "failed_flushes": 0}
+
+
+async def test_missing_table_is_not_retried(db):
+    from log_writer import LogWriter
+
+    await db.execute(text("DROP TABLE logs"))
+    await db.commit()
+    writer = LogWriter(batch_size=4)
+    for i in range(4):
+        writer.log(entry(i))
+
+    # SQLite reports it as an OperationalError: it must not keep the rows queued forever
+    assert await writer.flush() == 0
+    assert writer.stats()["buffered"] == 0
+    assert writer.rejected == 4 and writer.failed_flushes == 0
+
+
+async def test_connection_failure_keeps_rows(db, add_ticker_row, monkeypatch):
+    import log_writer
+    from log_writer import LogWriter
+
+    await add_ticker_row("LOGS")
+    writer = LogWriter(batch_size=2)
+    for i in range(5):
+        writer.log(entry(i))
+
+    session_factory = log_writer.AsyncSessionLocal
+
+    def refused():
+        raise ConnectionRefusedError("database is down")
+
+    monkeypatch.setattr(log_writer, "AsyncSessionLocal", refused)
+    assert await writer.flush() == 0
+    assert writer.stats()["buffered"] == 5 and writer.failed_flushes == 1 and writer.rejected == 0
+
+    monkeypatch.setattr(log_writer, "AsyncSessionLocal", session_factory)
+    assert await writer.flush() == 5
+    messages = (await db.execute(text("SELECT message FROM logs ORDER BY message"))).scalars().all()
+    assert messages == [f"row {i}" for i in range(5)]
@@ -0,0 +1,68 @@
+"""Multivariate LSTM inputs: windows over `feature_matrix`, training and the deployed rollout."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecasting.windows import feature_matrix, sliding_windows
+
+FEATURES = ["roll_vol_5", "volume"]
+
+
+def processed(n: int = 160) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    returns = np.r_[0.0, np.diff(close) / close[:-1]]
+    df = pd.DataFrame({
+        "date": pd.bdate_range("2025-01-01", periods=n),
+        "adj_close": close,
+        "roll_vol_5": pd.Series(returns).rolling(5, min_periods=1).std().fillna(0.0).to_numpy(),
+        "volume": rng.integers(1_000, 5_000, n).astype("float64"),
+    })
+    df["split"] = np.where(np.arange(n) < int(n * 0.8), "train", "val")
+    return df
+
+
+def test_windows_over_the_feature_matrix():
+    df = processed(50)
+    values = feature_matrix(df, "adj_close", FEATURES + ["roll_mean_99"])  # a missing column is skipped
+    X, Y = sliding_windows(values, window=10, horizon=3)
+
+    assert values.dtype == np.float32 and values.shape == (50, 3)
+    assert X.shape == (38, 10, 3) and Y.shape == (38, 3)
+    assert np.shares_memory(X, values)
+    i = 17
+    np.testing.assert_array_equal(X[i], values[i:i + 10])
+    np.testing.assert_array_equal(Y[i], values[i + 10:i + 13, 0])
+
+
+@pytest.mark.parametrize("features", [[], FEATURES], ids=["close-only", "features"])
+def test_lstm_trains_and_serves_on_features(features):
+    pytest.importorskip("tensorflow")
+    import tensorflow as tf
+
+    from forecasting import experiments as exp
+    from forecasting.inference import DeployedModel, predict
+
+    df = processed()
+    train_df, val_df = df[df["split"] == "train"], df[df["split"] == "val"]
+    data = exp.ExperimentData(
+        ticker="MULTI", df=df, train_df=train_df, val_df=val_df, close_col="adj_close",
+        y_train=train_df["adj_close"].to_numpy(), y_val=val_df["adj_close"].to_numpy(),
+        date_min="2025-01-01", date_max=df["date"].max().date().isoformat(),
+    )
+    # the target itself is not a feature
+    result, artifact = exp.train_lstm(data, features=features + ["adj_close"], forecast_steps=7)
+
+    assert result["status"] == "ok", result
+    assert result["features"] == artifact["features"] == features
+    assert len(artifact["feature_mu"]) == len(artifact["feature_sigma"]) == len(features)
+    assert len(artifact["val_pred"]) == len(val_df) and len(artifact["future_pred"]) == 7
+
+    # the serving side rebuilds the model and continues the same (train + val) history
+    model = tf.keras.models.model_from_json(artifact["model_json"])
+    model.set_weights(artifact["weights"])
+    assert model.input_shape == (None, exp.LSTM_WINDOW, 1 + len(features))
+    deployed = DeployedModel("MULTI", "LSTM", {}, {**artifact, "keras_model": model}, nbytes=0)
+    history = feature_matrix(df, "adj_close", features) if features else df["adj_close"].to_numpy()
+    served = predict(deployed, df["date"], history, 7)
+    np.testing.assert_allclose(served, artifact["future_pred"], rtol=1e-4)
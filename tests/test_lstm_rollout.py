@@ -0,0 +1,47 @@
+"""The compiled LSTM rollout matches the one-`predict`-per-step loop it replaced."""
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from forecasting.lstm import build_model, direct_forecast, predict_loop, recursive_forecast  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def seed():
+    return np.sin(np.linspace(0, 6, 40)).astype(np.float32)
+
+
+def test_recursive_forecast_matches_predict_loop(seed):
+    tf.keras.utils.set_random_seed(0)
+    model = build_model(10)
+
+    expected = predict_loop(model, seed, 12)
+    np.testing.assert_allclose(recursive_forecast(model, seed, 12), expected, rtol=1e-5, atol=1e-6)
+    # a different length reuses the same compiled rollout
+    np.testing.assert_allclose(recursive_forecast(model, seed, 5), expected[:5], rtol=1e-5, atol=1e-6)
+    assert recursive_forecast(model, seed, 0).shape == (0,)
+
+
+def test_direct_forecast_chains_blocks(seed):
+    tf.keras.utils.set_random_seed(0)
+    model = build_model(10, horizon=4)
+
+    out = direct_forecast(model, seed, 10)
+    first = model(seed[-10:].reshape(1, 10, 1), training=False).numpy()[0]
+    second = model(np.r_[seed[-6:], first].reshape(1, 10, 1).astype(np.float32), training=False).numpy()[0]
+    assert out.shape == (10,)
+    np.testing.assert_allclose(out[:8], np.r_[first, second], rtol=1e-5, atol=1e-6)
+
+
+def test_compiled_rollout_does_not_keep_the_model_alive(seed):
+    model = build_model(10)
+    recursive_forecast(model, seed, 3)
+    ref = weakref.ref(model)
+
+    del model
+    gc.collect()
+    assert ref() is None
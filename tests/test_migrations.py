@@ -0,0 +1,86 @@
+"""Alembic 0002 moves rows written before forecast versions into one "legacy" version per ticker."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+pytest.importorskip("alembic")
+
+BACKEND = Path(__file__).resolve().parents[1] / "backend"
+
+
+def alembic(db_path: Path, *args: str) -> None:
+    env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}"}
+    subprocess.run([sys.executable, "-m", "alembic", *args], cwd=BACKEND, env=env, check=True,
+                   capture_output=True)
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """A database at revision 0001 (no versions yet) holding forecasts and candidate models."""
+    from db_config import Base
+    import models  # noqa: F401
+
+    db_path = tmp_path / "legacy.db"
+    engine = sa.create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    alembic(db_path, "stamp", "head")
+    alembic(db_path, "downgrade", "0001")
+
+    engine = sa.create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        for ticker, model in (("AAA", "ARIMA"), ("BBB", "LSTM"), ("CCC", None)):
+            conn.execute(sa.text(
+                "INSERT INTO tickers (ticker, name, exchange, status, current_model) VALUES (:t, :t, 'NYSE', 'healthy', :m)"
+            ), {"t": ticker, "m": model})
+        for day in range(1, 4):
+            conn.execute(sa.text(
+                "INSERT INTO forecast_points (ticker, date, predicted) VALUES ('AAA', :d, 1.0)"
+            ), {"d": f"2026-01-0{day}"})
+        # BBB only has candidate models, CCC nothing at all
+        for ticker, model in (("AAA", "ARIMA"), ("AAA", "LSTM"), ("BBB", "LSTM")):
+            conn.execute(sa.text(
+                "INSERT INTO models (ticker, model, mae, rmse, mape, r2) VALUES (:t, :m, 1, 1, 1, 0)"
+            ), {"t": ticker, "m": model})
+    yield db_path, engine
+    engine.dispose()
+
+
+def test_upgrade_backfills_legacy_versions(legacy_db):
+    db_path, engine = legacy_db
+    with engine.connect() as conn:
+        assert "forecast_versions" not in sa.inspect(conn).get_table_names()
+
+    alembic(db_path, "upgrade", "0002")
+
+    with engine.connect() as conn:
+        versions = {
+            row.ticker: row for row in conn.execute(sa.text("SELECT * FROM forecast_versions"))
+        }
+        current = dict(conn.execute(sa.text("SELECT ticker, current_forecast_version_id FROM tickers")).all())
+        points = conn.execute(sa.text("SELECT DISTINCT version_id FROM forecast_points")).scalars().all()
+        model_versions = dict(conn.execute(sa.text("SELECT DISTINCT ticker, version_id FROM models")).all())
+
+    assert set(versions) == {"AAA", "BBB"}
+    assert (versions["AAA"].source, versions["AAA"].model, versions["AAA"].n_points) == ("legacy", "ARIMA", 3)
+    assert versions["BBB"].n_points == 0
+    # the legacy version becomes current and owns every old row
+    assert current == {"AAA": versions["AAA"].id, "BBB": versions["BBB"].id, "CCC": None}
+    assert points == [versions["AAA"].id]
+    assert model_versions == {"AAA": versions["AAA"].id, "BBB": versions["BBB"].id}
+
+
+def test_upgrade_is_idempotent_after_downgrade(legacy_db):
+    db_path, engine = legacy_db
+    alembic(db_path, "upgrade", "head")
+    alembic(db_path, "downgrade", "0001")
+    alembic(db_path, "upgrade", "head")
+
+    with engine.connect() as conn:
+        assert conn.execute(sa.text("SELECT count(*) FROM forecast_versions")).scalar_one() == 2
+        assert conn.execute(sa.text("SELECT count(*) FROM forecast_points WHERE version_id IS NULL")).scalar_one() == 0
+        assert conn.execute(sa.text("SELECT count(*) FROM forecast_points")).scalar_one() == 3
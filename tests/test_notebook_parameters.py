@@ -0,0 +1,82 @@
+"""Concurrent notebook runs each see only their own injected parameters."""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+nbformat = pytest.importorskip("nbformat")
+pytest.importorskip("nbclient")
+pytest.importorskip("ipykernel")
+
+from pipeline_runner import KernelPool, _exec_notebook  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+TICKERS = ["AAPL", "MSFT", "KO", "TSLA"]
+
+
+def write_notebook(path: Path) -> Path:
+    # same parameters convention as notebooks/01 and 02
+    params = nbformat.v4.new_code_cell('import os\n\nTICKER = os.environ.get("TICKER", "")')
+    params.metadata["tags"] = ["parameters"]
+    body = nbformat.v4.new_code_cell(
+        "import json, time\n"
+        "from pathlib import Path\n"
+        "assert 'SEEN' not in globals(), 'state leaked from a previous run'\n"
+        "SEEN = TICKER\n"
+        "time.sleep(0.5)  # keep the runs overlapping\n"
+        "rows = [f'{TICKER}-{i}' for i in range(3)]\n"
+        "Path('out').mkdir(exist_ok=True)\n"
+        "Path('out', f'{TICKER}.json').write_text(json.dumps({'ticker': TICKER, 'rows': rows}))\n"
+    )
+    nbformat.write(nbformat.v4.new_notebook(cells=[params, body]), str(path))
+    return path
+
+
+def run_concurrently(notebook: Path, cwd: Path, pool=None) -> None:
+    def run(ticker: str) -> None:
+        if pool is None:
+            _exec_notebook(notebook, cwd=cwd, parameters={"TICKER": ticker}, timeout_s=120)
+            return
+        with pool.acquire(timeout=120) as kernel:
+            _exec_notebook(notebook, cwd=cwd, parameters={"TICKER": ticker}, timeout_s=120, kernel=kernel)
+
+    with ThreadPoolExecutor(len(TICKERS)) as executor:
+        list(executor.map(run, TICKERS))
+
+
+def assert_own_data(cwd: Path) -> None:
+    for ticker in TICKERS:
+        out = json.loads((cwd / "out" / f"{ticker}.json").read_text())
+        assert out == {"ticker": ticker, "rows": [f"{ticker}-{i}" for i in range(3)]}
+    assert sorted(p.stem for p in (cwd / "out").iterdir()) == sorted(TICKERS)
+
+
+@pytest.fixture(autouse=True)
+def decoy_env(monkeypatch):
+    # parameters must come from the injected cell, never from the process env
+    monkeypatch.setenv("TICKER", "DECOY")
+
+
+def test_fresh_kernels(tmp_path):
+    notebook = write_notebook(tmp_path / "nb.ipynb")
+    run_concurrently(notebook, tmp_path)
+    assert_own_data(tmp_path)
+
+
+def test_pooled_kernels(tmp_path):
+    notebook = write_notebook(tmp_path / "nb.ipynb")
+    # fewer kernels than tickers: kernels are reused (and reset) between runs
+    pool = KernelPool(2, cwd=tmp_path)
+    try:
+        run_concurrently(notebook, tmp_path, pool)
+    finally:
+        pool.shutdown()
+    assert_own_data(tmp_path)
+
+
+@pytest.mark.parametrize("name", ["01_EDA_Preprocessing.ipynb", "02_Model_Experiments.ipynb"])
+def test_pipeline_notebooks_have_a_parameters_cell(name):
+    nb = nbformat.read(str(ROOT / "notebooks" / name), as_version=4)
+    tagged = [c for c in nb.cells if "parameters" in c.get("metadata", {}).get("tags", [])]
+    assert len(tagged) == 1 and "TICKER" in tagged[0].source
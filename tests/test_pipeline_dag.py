@@ -0,0 +1,68 @@
+"""The pipeline DAG reruns only the stages whose inputs changed."""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("statsmodels")
+
+from forecasting.dag import latest_model_dir, run_pipeline  # noqa: E402
+from forecasting.ingest import LocalFileSource  # noqa: E402
+
+TICKER = "DAG"
+
+
+def write_prices(directory, days: int) -> None:
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))[:days]
+    pd.DataFrame({
+        "date": pd.bdate_range("2024-01-01", periods=days),
+        "open": close, "high": close + 1, "low": close - 1, "close": close, "adj_close": close,
+        "volume": np.full(days, 1_000),
+    }).to_csv(directory / f"{TICKER}.csv", index=False)
+
+
+@pytest.fixture
+def source(tmp_path):
+    directory = tmp_path / "source"
+    directory.mkdir()
+    write_prices(directory, 250)
+    return LocalFileSource(directory)
+
+
+def run(root, source, **kwargs):
+    # ingest_refresh_s=0: the source is polled every run, so only changed data invalidates the rest
+    return run_pipeline(TICKER, root, source=source, candidates=("ARIMA",), arima_time_budget_s=5,
+                        parallel=False, ingest_refresh_s=0, **kwargs)
+
+
+def test_unchanged_inputs_skip_every_stage_after_ingest(tmp_path, source):
+    root = tmp_path / "root"
+    seen = []
+
+    first = run(root, source)
+    assert set(first.cache.values()) == {"ran"}
+    assert first.stages["select"].result["best"] == "ARIMA"
+    assert (latest_model_dir(root, TICKER) / "metadata.json").exists()
+
+    again = run(root, source, on_stage=lambda stage, status: seen.append((stage, status)))
+    assert again.cache == {"ingest": "ran", "validate": "hit", "features": "hit", "train_ARIMA": "hit", "select": "hit"}
+    assert ("train_ARIMA", "running") not in seen
+
+    forced = run(root, source, use_cache=False)
+    assert set(forced.cache.values()) == {"ran"}
+
+
+def test_new_rows_rerun_downstream(tmp_path, source):
+    root = tmp_path / "root"
+    run(root, source)
+    write_prices(source.directory, 260)
+
+    rerun = run(root, source)
+    assert set(rerun.cache.values()) == {"ran"}
+    assert rerun.stages["features"].result["status"] == "partial"
+
+
+def test_unknown_candidate_is_refused(tmp_path, source):
+    with pytest.raises(ValueError, match="non-empty subset"):
+        run_pipeline(TICKER, tmp_path, source=source, candidates=("GARCH",))
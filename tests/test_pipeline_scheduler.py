@@ -0,0 +1,56 @@
+"""A job whose worker never records an outcome ends with its runs marked as failed."""
+import asyncio
+import os
+
+import pytest
+
+from database import create_pipeline_run, get_pipeline_run
+from db_config import AsyncSessionLocal
+from pipeline_runner import PipelineScheduler
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for_status(run_id: int, timeout_s: float = 60.0):
+    deadline = asyncio.get_running_loop().time() + timeout_s
+    while True:
+        async with AsyncSessionLocal() as s:
+            run = await get_pipeline_run(s, run_id)
+        if run.status != "running" or asyncio.get_running_loop().time() > deadline:
+            return run
+        await asyncio.sleep(0.2)
+
+
+async def test_crashed_worker_fails_its_run(db, add_ticker_row):
+    await add_ticker_row("CRSH")
+    run = await create_pipeline_run(db, "CRSH")
+    scheduler = PipelineScheduler(1, 5)
+    # the worker process dies without running the pipeline (like an OOM kill)
+    scheduler._submit_job = lambda job: scheduler._get_executor().submit(os._exit, 1)
+    try:
+        scheduler.submit("CRSH", run.id)
+        run = await wait_for_status(run.id)
+        assert (run.status, run.stage, run.message) == ("error", "error", "Worker crashed")
+        assert "BrokenProcessPool" in run.error
+        assert scheduler.status("CRSH")["state"] is None
+        assert scheduler.status()["running"] == 0
+    finally:
+        scheduler.shutdown()
+
+
+async def test_job_that_cannot_start_fails_instead_of_staying_queued(db, add_ticker_row):
+    await add_ticker_row("STCK")
+    run = await create_pipeline_run(db, "STCK")
+    scheduler = PipelineScheduler(1, 5)
+
+    def refuse(job):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+    scheduler._submit_job = refuse
+    try:
+        scheduler.submit("STCK", run.id)
+        assert scheduler.status("STCK")["state"] is None  # not stranded in the queue
+        run = await wait_for_status(run.id)
+        assert (run.status, run.stage, run.message) == ("error", "error", "Could not start")
+    finally:
+        scheduler.shutdown()
@@ -0,0 +1,75 @@
+"""Write-through invalidation of the response cache."""
+import fnmatch
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeRedis:
+    """The redis-py calls RedisCache makes, on a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    import cache as cache_module
+
+    if request.param == "memory":
+        backend = cache_module.MemoryCache(ttl_s=60, max_entries=100)
+    else:
+        backend = cache_module.RedisCache(FakeRedis(), ttl_s=60)
+    previous = cache_module.get_cache()
+    cache_module.set_cache(backend)
+    yield backend
+    cache_module.set_cache(previous)
+
+
+def test_invalidate_ticker_drops_only_that_ticker(cache):
+    from cache import SETTINGS_KEY, TICKERS_KEY, forecast_key, invalidate_ticker, models_key
+
+    keys = [TICKERS_KEY, SETTINGS_KEY, forecast_key("AAA", 30), forecast_key("AAA", 90), models_key("AAA"),
+            forecast_key("AAAB", 30), models_key("AAAB"), forecast_key("BBB", 30)]
+    for key in keys:
+        cache.set(key, {"key": key})
+
+    invalidate_ticker("AAA")
+
+    # the ticker list shows AAA too; AAAB only shares a prefix with it
+    kept = {key for key in keys if cache.get(key) is not None}
+    assert kept == {SETTINGS_KEY, forecast_key("AAAB", 30), models_key("AAAB"), forecast_key("BBB", 30)}
+
+
+async def test_writes_invalidate_cached_reads(cache, db, add_ticker_row):
+    from cache import cached, models_key
+    from database import deploy_model, get_ticker
+
+    await add_ticker_row("AAA", current_model="ARIMA")
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return {"current_model": (await get_ticker(db, "AAA")).current_model}
+
+    assert await cached(models_key("AAA"), load) == {"current_model": "ARIMA"}
+    assert await cached(models_key("AAA"), load) == {"current_model": "ARIMA"}
+    assert len(loads) == 1
+
+    await deploy_model(db, "AAA", "LSTM")
+    assert await cached(models_key("AAA"), load) == {"current_model": "LSTM"}
+    assert len(loads) == 2
@@ -0,0 +1,88 @@
+"""Retention never prunes what the API is serving."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, select, text, update
+
+pytestmark = pytest.mark.anyio
+
+
+async def publish(db, ticker: str, n: int) -> int:
+    from database import publish_forecast_version
+
+    return await publish_forecast_version(
+        db, ticker,
+        points=[{"date": f"2026-03-0{i + 1}", "predicted": float(n)} for i in range(3)],
+        models=[{"model": "ARIMA", "mae": 1.0, "rmse": float(n), "mape": 1.0, "r2": 0.0}],
+        model_name="ARIMA", trained_at=datetime(2026, 3, n),
+    )
+
+
+async def test_version_pruning_keeps_the_current_version(db, add_ticker_row):
+    from database import get_forecast
+    from models import Ticker
+    from retention import prune_forecast_versions
+
+    await add_ticker_row("AAA")
+    await add_ticker_row("BBB")
+    versions = [await publish(db, "AAA", n) for n in range(1, 6)]
+    only = await publish(db, "BBB", 1)
+    # rolled back to the oldest version: it is current, so it outlives newer ones
+    await db.execute(update(Ticker).where(Ticker.ticker == "AAA").values(current_forecast_version_id=versions[0]))
+    await db.commit()
+
+    touched = set()
+    assert await prune_forecast_versions(3, batch_size=2, touched=touched) == 2
+    assert touched == {"AAA"}
+
+    remaining = (await db.execute(text("SELECT id FROM forecast_versions ORDER BY id"))).scalars().all()
+    assert remaining == [versions[0], versions[3], versions[4], only]
+    orphans = (await db.execute(text(
+        "SELECT count(*) FROM forecast_points WHERE version_id NOT IN (SELECT id FROM forecast_versions)"
+    ))).scalar_one() + (await db.execute(text(
+        "SELECT count(*) FROM models WHERE version_id NOT IN (SELECT id FROM forecast_versions)"
+    ))).scalar_one()
+    assert orphans == 0
+    assert {p["predicted"] for p in (await get_forecast(db, "AAA"))["points"]} == {1.0}
+
+
+async def test_downsampling_keeps_one_point_per_week_and_version(db, add_ticker_row):
+    from models import ForecastPoint
+    from retention import downsample_forecast_points
+
+    await add_ticker_row("AAA")
+    version = await publish(db, "AAA", 1)
+    monday = date(2025, 1, 6)
+    await db.execute(insert(ForecastPoint).values([
+        {"ticker": "AAA", "version_id": version, "date": monday + timedelta(days=d), "predicted": float(d)}
+        for d in range(14)
+    ]))
+    await db.commit()
+
+    touched = set()
+    assert await downsample_forecast_points(date(2025, 2, 1), batch_size=5, touched=touched) == 12
+    kept = (await db.execute(
+        select(ForecastPoint.date).where(ForecastPoint.date < date(2025, 2, 1)).order_by(ForecastPoint.date)
+    )).scalars().all()
+    # the last point of each ISO week
+    assert kept == [date(2025, 1, 12), date(2025, 1, 19)]
+    assert touched == {"AAA"}
+
+
+async def test_error_logs_outlive_the_rest(db, add_ticker_row):
+    from log_writer import log_row
+    from models import Log
+    from retention import prune_logs
+
+    await add_ticker_row("AAA")
+    now = datetime(2026, 6, 1)
+    await db.execute(insert(Log).values([
+        log_row({"ticker": "AAA", "event": "e", "status": status, "message": f"{status} {age}",
+                 "timestamp": now - timedelta(days=age)})
+        for status in ("success", "error") for age in (10, 100, 400)
+    ]))
+    await db.commit()
+
+    assert await prune_logs(now - timedelta(days=90), now - timedelta(days=365), batch_size=2) == 3
+    messages = (await db.execute(text("SELECT message FROM logs ORDER BY message"))).scalars().all()
+    assert messages == ["error 10", "error 100", "success 10"]
@@ -0,0 +1,59 @@
+"""Retrain policy: when to refit from scratch, and drift measured independently of the window."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from forecasting.metrics import naive_rmse
+from forecasting.retrain import drift_score, full_refit_state, plan_retrain, relative_rmse
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def results(*rmses):
+    return [{"model": f"M{i}", "status": "ok", "rmse": r} for i, r in enumerate(rmses)] + [
+        {"model": "Broken", "status": "error", "error": "boom"},
+    ]
+
+
+def state(days_ago: float, reference_rel_rmse=0.8) -> dict:
+    return {
+        "last_full_refit_utc": (NOW - timedelta(days=days_ago)).isoformat() + "Z",
+        "reference_rel_rmse": reference_rel_rmse,
+    }
+
+
+@pytest.mark.parametrize("current, has_fit, expected", [
+    (state(1), True, ("incremental", "warm start")),
+    (state(7), True, ("full", "scheduled")),
+    (state(1), False, ("full", "no previous fit")),
+    ({}, True, ("full", "no previous fit")),
+    # recorded before the relative reference existed
+    (state(1, reference_rel_rmse=None), True, ("full", "no previous fit")),
+])
+def test_plan_retrain(current, has_fit, expected):
+    plan = plan_retrain(current, has_fit, full_refit_days=7, now=NOW)
+    assert (plan.mode, plan.reason) == expected
+
+
+def test_full_refit_state_records_the_drift_reference():
+    recorded = full_refit_state(results(3.0, 2.0), naive_rmse=4.0, now=NOW)
+
+    assert recorded == {"last_full_refit_utc": NOW.isoformat() + "Z", "reference_rmse": 2.0, "reference_rel_rmse": 0.5}
+    assert plan_retrain(recorded, True, now=NOW + timedelta(days=1)).mode == "incremental"
+
+
+def test_drift_score_is_relative_to_the_naive_forecast():
+    reference = full_refit_state(results(2.0), naive_rmse=4.0, now=NOW)
+
+    # a calmer window: lower RMSE, but worse than no-change by the same yardstick
+    assert drift_score(reference, results(1.5), naive_rmse=2.0) == pytest.approx(0.5)
+    # a more volatile window: higher RMSE, same skill
+    assert drift_score(reference, results(4.0), naive_rmse=8.0) == 0.0
+    assert drift_score(reference, [{"status": "error"}], naive_rmse=2.0) is None
+    assert drift_score({}, results(1.0), naive_rmse=2.0) is None
+    assert relative_rmse(results(1.0), naive_rmse=0.0) is None
+
+
+def test_naive_rmse_holds_the_last_value():
+    assert naive_rmse([1.0, 5.0], [6.0, 3.0]) == pytest.approx(np.sqrt((1 + 4) / 2))
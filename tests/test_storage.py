@@ -0,0 +1,48 @@
+"""Parquet storage keeps types, and legacy CSV datasets are still readable."""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from forecasting.storage import dataset_path, frame_exists, migrate_csv, read_frame, write_frame  # noqa: E402
+
+
+def frame(n: int = 10) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": pd.bdate_range("2026-01-01", periods=n),
+        "adj_close": np.linspace(100, 110, n, dtype="float32"),
+        "volume": np.arange(n) * 1_000,
+        "split": ["train"] * (n - 2) + ["val"] * 2,
+    })
+
+
+def test_round_trip_keeps_types(tmp_path):
+    path = write_frame(frame(), dataset_path(tmp_path, "AAA"))
+    back = read_frame(path)
+
+    assert path.name == "AAA.parquet" and not path.with_suffix(".parquet.tmp").exists()
+    assert back["date"].dtype.kind == "M"
+    assert back["adj_close"].dtype == "float64" and back["volume"].dtype == "int64"
+    assert isinstance(back["split"].dtype, pd.CategoricalDtype)
+    np.testing.assert_allclose(back["adj_close"], frame()["adj_close"].astype("float64"))
+    assert list(read_frame(path, columns=["date", "volume"]).columns) == ["date", "volume"]
+
+
+def test_legacy_csv_is_read_and_migrated(tmp_path):
+    csv = tmp_path / "AAA.csv"
+    frame().to_csv(csv, index=False)
+    path = dataset_path(tmp_path, "AAA")
+
+    assert frame_exists(path) and not path.exists()
+    from_csv = read_frame(path)
+    assert from_csv["date"].dtype.kind == "M" and len(from_csv) == 10
+
+    migrate_csv(csv, delete_csv=True)
+    assert path.exists() and not csv.exists()
+    pd.testing.assert_frame_equal(read_frame(path).astype({"split": object}), from_csv.astype({"split": object}))
+
+
+def test_missing_dataset(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_frame(dataset_path(tmp_path, "NONE"))